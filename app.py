@@ -1,6 +1,5 @@
 # app.py
 import streamlit as st
-import utilities.sumy_punkt  # Import the sumy_punkt script
 
 st.set_page_config(page_title="Fundr App", layout="wide")
 st.title("Welcome to Fundr - Grants.Gov Dashboard")
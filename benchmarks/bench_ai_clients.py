@@ -0,0 +1,109 @@
+# benchmarks/bench_ai_clients.py
+"""
+Cost of utilities.ai_podcast before anyone clicks FundrAI, and connections
+per podcast script once they do.
+
+Import: median seconds to import the module in a fresh interpreter, versus
+importing it together with the Google client libraries it used to load at
+import time (google.genai, google.cloud.texttospeech, service-account
+credentials).
+
+Connections: Gemini calls against a local stand-in server, counting the TCP
+connections it accepts (each one a TLS handshake against the real API) with
+a new genai.Client per script versus the shared client. Finally a shared
+client whose connection is dead is replaced and the call still succeeds.
+
+    python benchmarks/bench_ai_clients.py --runs 5 --scripts 20
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+EAGER_IMPORTS = "import google.genai, google.cloud.texttospeech, google.oauth2.service_account"
+
+
+class GeminiStandIn(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    connections = 0
+    lock = threading.Lock()
+
+    def setup(self):
+        super().setup()
+        with GeminiStandIn.lock:
+            GeminiStandIn.connections += 1
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        body = json.dumps({"candidates": [{"content": {"role": "model", "parts": [
+            {"text": "Welcome to FundrAI. Today: a grant worth a listen."}]}}]}).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+def import_seconds(statement, runs):
+    times = []
+    for _ in range(runs):
+        code = f"import time; t = time.perf_counter(); {statement}; print(time.perf_counter() - t)"
+        out = subprocess.run([sys.executable, "-c", code], cwd=ROOT, capture_output=True, text=True, check=True)
+        times.append(float(out.stdout.split()[-1]))
+    return statistics.median(times)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--scripts", type=int, default=20)
+    args = parser.parse_args()
+
+    lazy_s = import_seconds("import utilities.ai_podcast", args.runs)
+    eager_s = import_seconds(f"{EAGER_IMPORTS}; import utilities.ai_podcast", args.runs)
+    print(f"import utilities.ai_podcast: {lazy_s:.2f} s (with the Google clients loaded eagerly: {eager_s:.2f} s)")
+
+    from google import genai
+    from utilities import ai_podcast
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), GeminiStandIn)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    url = f"http://127.0.0.1:{server.server_port}"
+
+    def new_client(base_url=url):
+        return genai.Client(api_key="bench", http_options={"base_url": base_url})
+
+    def run(label, make_script):
+        before = GeminiStandIn.connections
+        start = time.perf_counter()
+        for i in range(args.scripts):
+            assert make_script(f"Grant {i}").startswith("Welcome")
+        seconds = time.perf_counter() - start
+        print(f"{label:<22} {GeminiStandIn.connections - before:3} connections, "
+              f"{seconds * 1000 / args.scripts:6.1f} ms per script")
+
+    run("client per script", lambda content: ai_podcast.generate_script(content, new_client()))
+    ai_podcast.CLIENT_FACTORIES["gemini"] = new_client
+    run("shared client", ai_podcast.generate_script)
+
+    # A shared client whose connection can no longer be made is replaced on the next call
+    ai_podcast._clients["gemini"] = new_client("http://127.0.0.1:9")
+    assert ai_podcast.generate_script("Grant after outage").startswith("Welcome")
+    assert ai_podcast.get_client("gemini")._api_client._http_options.base_url.rstrip("/") == url
+    print("dead shared client: replaced, call succeeded")
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+# benchmarks/bench_cards.py
+"""
+Card rendering time for 50/500/5,000 cards: the per-row path (iterrows +
+render_card_* + one st.markdown per card) against the column-wise
+render_cards_* renderers emitting the whole grid in one st.markdown.
+
+    python benchmarks/bench_cards.py --sizes 50,500,5000
+"""
+import argparse
+import logging
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+
+def per_row(df, render_card, render_cards_grid, emit):
+    cards = [render_card(row) for _, row in df.iterrows()]
+    for row_cards in render_cards_grid(cards, cards_per_row=3):
+        for card_html in row_cards:
+            emit(card_html, unsafe_allow_html=True)
+
+
+def batch(df, render_cards, render_cards_grid_html, emit):
+    emit(render_cards_grid_html(render_cards(df), cards_per_row=3), unsafe_allow_html=True)
+
+
+def timed(fn, repeat):
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples)
+
+
+def load_frames(rows):
+    from benchmarks.bench_rerun import write_nih_csv
+    from benchmarks.synthetic_extract import write_extract
+    from utilities.grants_data import load_data_into_duckdb_from_memory
+    from utilities.nih_data import load_nih_data
+
+    with tempfile.TemporaryDirectory() as tmp:
+        xml_path = write_extract(os.path.join(tmp, "extract.xml"), rows)
+        with open(xml_path, "rb") as f:
+            grants = load_data_into_duckdb_from_memory(f.read()).execute(f"SELECT * FROM grants LIMIT {rows}").fetchdf()
+        csv_path = os.path.join(tmp, "nih.csv")
+        write_nih_csv(csv_path, rows)
+        nih = load_nih_data(csv_path).execute(f"SELECT * FROM nih LIMIT {rows}").fetchdf()
+    return grants, nih
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", default="50,500,5000")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    import streamlit as st
+    from ui.ui_format import render_cards_grid_html
+    from ui.ui_fp import render_card_nih, render_cards_grid, render_cards_nih
+    from ui.ui_gov import render_card_grants, render_cards_grants
+
+    # st.markdown outside `streamlit run` only warns about the missing session
+    logging.getLogger("streamlit").setLevel(logging.ERROR)
+    sizes = [int(size) for size in args.sizes.split(",")]
+    grants, nih = load_frames(max(sizes))
+
+    print(f"{'cards':>6} {'kind':<7} {'per-row ms':>11} {'batch ms':>9} {'speedup':>8}")
+    for size in sizes:
+        for kind, df, render_card, render_cards in (
+            ("grants", grants.head(size), render_card_grants, render_cards_grants),
+            ("nih", nih.head(size), render_card_nih, render_cards_nih),
+        ):
+            old_ms = timed(lambda: per_row(df, render_card, render_cards_grid, st.markdown), args.repeat)
+            new_ms = timed(lambda: batch(df, render_cards, render_cards_grid_html, st.markdown), args.repeat)
+            print(f"{size:6} {kind:<7} {old_ms:11.1f} {new_ms:9.1f} {old_ms / new_ms:7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,182 @@
+# benchmarks/bench_extract_download.py
+"""
+Download + parse of the GrantsDBExtract zip against a local stand-in for
+the extracts bucket: a threaded HTTP server that serves zips from disk in
+chunks, honours Range requests, answers 404 for days not published, and
+can drop the connection part-way through a response.
+
+For each size, the Python peak memory (tracemalloc) of fetching and
+parsing every record the old way (fetch_extract_xml: the whole zip and the
+whole XML as bytes) against download_extract + open_extract_xml, which
+should stay flat as the extract grows. Then checks resume after a dropped
+connection, fallback to the previous day and reuse of a verified zip.
+
+    python benchmarks/bench_extract_download.py --sizes 5000,20000
+"""
+import argparse
+import io
+import os
+import sys
+import tempfile
+import threading
+import time
+import tracemalloc
+import zipfile
+from datetime import datetime, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+CHUNK = 64 * 1024
+
+
+class Bucket(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, root):
+        super().__init__(("127.0.0.1", 0), Handler)
+        self.root = root
+        self.drop_after = None
+        self.requests = []
+
+    def base_url(self):
+        return f"http://127.0.0.1:{self.server_address[1]}/GrantsDBExtractYYYYMMDDv2.zip"
+
+
+class Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, *args):
+        pass
+
+    def do_GET(self):
+        path = os.path.join(self.server.root, os.path.basename(self.path))
+        self.server.requests.append((self.path, self.headers.get("Range")))
+        if not os.path.exists(path):
+            self.send_response(404)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+        size = os.path.getsize(path)
+        start = 0
+        if self.headers.get("Range"):
+            start = int(self.headers["Range"].split("=")[1].split("-")[0])
+            if start >= size:
+                self.send_response(416)
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+                return
+            self.send_response(206)
+            self.send_header("Content-Range", f"bytes {start}-{size - 1}/{size}")
+        else:
+            self.send_response(200)
+        self.send_header("Content-Length", str(size - start))
+        self.end_headers()
+
+        drop_after, self.server.drop_after = self.server.drop_after, None
+        sent = 0
+        with open(path, "rb") as f:
+            f.seek(start)
+            for chunk in iter(lambda: f.read(CHUNK), b""):
+                if drop_after is not None and sent + len(chunk) > drop_after:
+                    self.wfile.write(chunk[:drop_after - sent])
+                    self.close_connection = True
+                    return
+                self.wfile.write(chunk)
+                sent += len(chunk)
+
+
+def publish(root, day, rows):
+    from benchmarks.synthetic_extract import write_extract
+
+    xml_path = write_extract(os.path.join(root, "extract.xml"), rows)
+    zip_path = os.path.join(root, f"GrantsDBExtract{day}v2.zip")
+    with zipfile.ZipFile(zip_path, "w", zipfile.ZIP_DEFLATED) as zip_file:
+        zip_file.write(xml_path, f"GrantsDBExtract{day}v2.xml")
+    xml_size = os.path.getsize(xml_path)
+    os.remove(xml_path)
+    return os.path.getsize(zip_path), xml_size
+
+
+def count_records(xml_source):
+    from utilities.grants_data import iter_opportunity_records
+
+    return sum(1 for _ in iter_opportunity_records(xml_source))
+
+
+def old_path(url, extract_dir, day):
+    from utilities.grants_data import fetch_extract_xml
+
+    xml_data = fetch_extract_xml(url.replace("YYYYMMDD", day))
+    with io.BytesIO(xml_data) as buffer:
+        return count_records(buffer)
+
+
+def new_path(url, extract_dir, day):
+    from utilities.extract_download import download_extract, open_extract_xml
+
+    path, _ = download_extract(day, extract_dir=extract_dir, base_zip_url=url)
+    with open_extract_xml(path) as xml_file:
+        return count_records(xml_file)
+
+
+def peak(fn, *args):
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = fn(*args)
+    seconds = time.perf_counter() - start
+    peak_mb = tracemalloc.get_traced_memory()[1] / 1e6
+    tracemalloc.stop()
+    return result, peak_mb, seconds
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", default="5000,20000")
+    args = parser.parse_args()
+
+    from utilities.extract_download import download_extract, is_complete
+
+    with tempfile.TemporaryDirectory() as root:
+        bucket_dir = os.path.join(root, "bucket")
+        os.makedirs(bucket_dir)
+        server = Bucket(bucket_dir)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        url = server.base_url()
+
+        print(f"{'rows':>7} {'zip MB':>7} {'xml MB':>7} {'old peak MB':>12} {'new peak MB':>12} {'old s':>6} {'new s':>6}")
+        for i, rows in enumerate(int(size) for size in args.sizes.split(",")):
+            day = f"2025010{i + 1}"
+            zip_size, xml_size = publish(bucket_dir, day, rows)
+            extract_dir = os.path.join(root, f"extracts{i}")
+            old_count, old_mb, old_s = peak(old_path, url, extract_dir, day)
+            new_count, new_mb, new_s = peak(new_path, url, extract_dir, day)
+            assert old_count == new_count == rows, (old_count, new_count)
+            print(f"{rows:7} {zip_size / 1e6:7.1f} {xml_size / 1e6:7.1f} {old_mb:12.1f} {new_mb:12.1f} "
+                  f"{old_s:6.1f} {new_s:6.1f}")
+
+        # Resume: the first response is cut at a third of the zip
+        extract_dir = os.path.join(root, "resume")
+        server.requests.clear()
+        server.drop_after = zip_size // 3
+        path, _ = download_extract(day, extract_dir=extract_dir, base_zip_url=url)
+        ranges = [r for _, r in server.requests]
+        assert ranges[0] is None and ranges[1] and is_complete(path), ranges
+        print(f"resume: {len(ranges)} requests, second with Range {ranges[1]}, checksum ok")
+
+        # Fallback: the next day is not published, the latest one is used
+        server.requests.clear()
+        next_day = (datetime.strptime(day, "%Y%m%d") + timedelta(days=1)).strftime("%Y%m%d")
+        _, used = download_extract(next_day, extract_dir=extract_dir, base_zip_url=url)
+        assert used == day, used
+        print(f"fallback: {next_day} not published, used {used} with {len(server.requests)} request(s)")
+
+        server.requests.clear()
+        download_extract(day, extract_dir=extract_dir, base_zip_url=url)
+        assert not server.requests
+        print("reuse: verified zip on disk, 0 requests")
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
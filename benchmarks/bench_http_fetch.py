@@ -0,0 +1,143 @@
+# benchmarks/bench_http_fetch.py
+"""
+utilities.http_fetch against a local stand-in for grants.nih.gov: a
+threaded HTTP/1.1 server with ETag/Last-Modified support and a fixed delay
+per response, serving one page per NIH_data.csv URL path.
+
+Compares fetching every page with a fresh requests.get each (the old
+per-click path) against prefetch() cold, warm (fresh cache), revalidating
+(every page answers 304), after one page changed, and with the server
+failing (stale copies). Also checks the cached bodies.
+
+    python benchmarks/bench_http_fetch.py --pages 200 --latency 0.05
+"""
+import argparse
+import hashlib
+import os
+import sys
+import tempfile
+import threading
+import time
+from email.utils import formatdate
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlsplit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+class StandIn(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, pages, latency):
+        super().__init__(("127.0.0.1", 0), Handler)
+        self.pages = pages
+        self.latency = latency
+        self.lock = threading.Lock()
+        self.counts = {"requests": 0, "connections": 0, "not_modified": 0}
+        self.failing = False
+        self.modified = formatdate(usegmt=True)
+
+    def count(self, name):
+        with self.lock:
+            self.counts[name] += 1
+
+    def url(self, path):
+        return f"http://127.0.0.1:{self.server_address[1]}{path}"
+
+
+class Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def setup(self):
+        super().setup()
+        self.server.count("connections")
+
+    def log_message(self, *args):
+        pass
+
+    def do_GET(self):
+        self.server.count("requests")
+        time.sleep(self.server.latency)
+        body = self.server.pages.get(self.path)
+        if body is None or self.server.failing:
+            self.send_response(503 if self.server.failing else 404)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+        etag = '"' + hashlib.md5(body).hexdigest() + '"'
+        if self.headers.get("If-None-Match") == etag:
+            self.server.count("not_modified")
+            self.send_response(304)
+            self.send_header("ETag", etag)
+            self.end_headers()
+            return
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("ETag", etag)
+        self.send_header("Last-Modified", self.server.modified)
+        self.end_headers()
+        self.wfile.write(body)
+
+
+def nih_pages(count):
+    from benchmarks.synthetic_extract import WORDS
+    from utilities.http_fetch import nih_urls
+
+    pages = {}
+    for i, url in enumerate(nih_urls()[:count]):
+        words = " ".join(WORDS[(i + j) % len(WORDS)] for j in range(2000))
+        pages[urlsplit(url).path] = f"<html><body><h1>Notice {i}</h1><p>{words}.</p></body></html>".encode()
+    return pages
+
+
+def run(name, server, fn):
+    before = dict(server.counts)
+    start = time.perf_counter()
+    result = fn()
+    seconds = time.perf_counter() - start
+    delta = {key: server.counts[key] - before[key] for key in before}
+    print(f"{name:<14} {seconds:8.2f} {delta['requests']:9} {delta['connections']:12} {delta['not_modified']:5}")
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--pages", type=int, default=200)
+    parser.add_argument("--latency", type=float, default=0.05, help="Server delay per response, seconds")
+    parser.add_argument("--workers", type=int, default=8)
+    args = parser.parse_args()
+
+    import requests
+    from utilities.http_fetch import fetch, prefetch
+
+    server = StandIn(nih_pages(args.pages), args.latency)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    urls = [server.url(path) for path in server.pages]
+
+    with tempfile.TemporaryDirectory() as cache_dir:
+        print(f"{len(urls)} pages, {args.latency * 1000:.0f} ms per response, {args.workers} workers")
+        print(f"{'mode':<14} {'seconds':>8} {'requests':>9} {'connections':>12} {'304s':>5}")
+        run("per-click get", server, lambda: [requests.get(url, timeout=10).content for url in urls])
+        cold = run("prefetch cold", server, lambda: prefetch(urls, args.workers, cache_dir=cache_dir))
+        warm = run("prefetch warm", server, lambda: prefetch(urls, args.workers, cache_dir=cache_dir))
+        revalidated = run("revalidate", server, lambda: prefetch(urls, args.workers, max_age=0, cache_dir=cache_dir))
+        path = next(iter(server.pages))
+        server.pages[path] += b"<p>Amended.</p>"
+        changed = run("one changed", server, lambda: prefetch(urls, args.workers, max_age=0, cache_dir=cache_dir))
+        assert fetch(server.url(path), cache_dir=cache_dir)["content"] == server.pages[path]
+        server.failing = True
+        stale = run("server failing", server, lambda: prefetch(urls, args.workers, max_age=0, cache_dir=cache_dir))
+        server.shutdown()
+
+        assert cold["network"] == len(urls) and warm["cache"] == len(urls)
+        assert revalidated["revalidated"] == len(urls)
+        assert changed["network"] == 1 and stale["stale"] == len(urls), (changed, stale)
+        raw = sum(len(body) for body in server.pages.values())
+        stored = sum(os.path.getsize(os.path.join(root, name))
+                     for root, _, names in os.walk(cache_dir) for name in names if name.endswith(".gz"))
+        print(f"cache: {raw / 1e6:.1f} MB of pages stored in {stored / 1e6:.2f} MB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+# benchmarks/bench_ingest.py
+"""
+Compares the streaming XML ingester against the previous DOM-based
+parse_xml -> DataFrame -> DuckDB path on a synthetic extract. Each mode runs
+in its own subprocess so that peak RSS is measured independently.
+
+    python benchmarks/bench_ingest.py --rows 20000
+"""
+import argparse
+import os
+import re
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+import xml.etree.ElementTree as ET
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def legacy_parse_xml(xml_source):
+    """The DOM-based parser that iter_opportunity_records replaced."""
+    tree = ET.parse(xml_source)
+    root = tree.getroot()
+    for elem in root.iter():
+        elem.tag = re.sub(r'{.*}', '', elem.tag)
+
+    records = []
+    for parent in root.iter():
+        if parent.find('.//OpportunityID') is not None:
+            record = {}
+            for child in parent:
+                value = child.text.strip() if child.text else None
+                if child.tag in record:
+                    if isinstance(record[child.tag], list):
+                        record[child.tag].append(value)
+                    else:
+                        record[child.tag] = [record[child.tag], value]
+                else:
+                    record[child.tag] = value
+            records.append(record)
+    return records
+
+
+def run_mode(mode, path):
+    import duckdb
+    import pandas as pd
+    from utilities.grants_data import load_xml_into_duckdb
+
+    start = time.perf_counter()
+    if mode == "legacy":
+        df = pd.DataFrame(legacy_parse_xml(path))
+        df.dropna(how="all", inplace=True)
+        conn = duckdb.connect(database=':memory:')
+        conn.execute("CREATE TABLE grants AS SELECT * FROM df")
+    else:
+        conn = load_xml_into_duckdb(path)
+    elapsed = time.perf_counter() - start
+    rows = conn.execute("SELECT count(*) FROM grants").fetchone()[0]
+    peak_mb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    print(f"{mode:<10} {rows:>8} rows  {elapsed:8.2f} s  peak RSS {peak_mb:8.1f} MB")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rows", type=int, default=20000)
+    parser.add_argument("--mode", choices=["legacy", "streaming"])
+    parser.add_argument("--xml")
+    args = parser.parse_args()
+
+    if args.mode:
+        run_mode(args.mode, args.xml)
+        return
+
+    from benchmarks.synthetic_extract import write_extract
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = write_extract(os.path.join(tmp, "extract.xml"), args.rows)
+        size_mb = os.path.getsize(path) / 2**20
+        print(f"Synthetic extract: {args.rows} opportunities, {size_mb:.1f} MB")
+        for mode in ("legacy", "streaming"):
+            subprocess.run([sys.executable, __file__, "--mode", mode, "--xml", path], check=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+# benchmarks/bench_job_queue.py
+"""
+JobQueue with a fake upstream client (fixed latency, first attempt of every
+few jobs failing): how long a click blocks the page (submit vs. calling
+upstream inline), how fast a page-sized batch drains under the worker and
+rate limits, the observed start rate, retries, deduplication of repeated
+clicks, and the queue metrics.
+
+    python benchmarks/bench_job_queue.py --jobs 20 --workers 2 --rate 4
+"""
+import argparse
+import os
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+class FakeUpstream:
+    def __init__(self, latency, fail_every):
+        self.latency = latency
+        self.fail_every = fail_every
+        self.lock = threading.Lock()
+        self.starts = []
+        self.failed_once = set()
+
+    def generate(self, job_number):
+        with self.lock:
+            self.starts.append(time.monotonic())
+            fail = self.fail_every and job_number % self.fail_every == 0 and job_number not in self.failed_once
+            if fail:
+                self.failed_once.add(job_number)
+        time.sleep(self.latency)
+        if fail:
+            raise RuntimeError("503 from upstream")
+        return b"RIFF"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--jobs", type=int, default=20)
+    parser.add_argument("--workers", type=int, default=2)
+    parser.add_argument("--rate", type=float, default=4.0, help="Job starts per second")
+    parser.add_argument("--latency", type=float, default=0.3, help="Upstream seconds per call")
+    parser.add_argument("--fail-every", type=int, default=5)
+    args = parser.parse_args()
+
+    from utilities.job_queue import JobQueue
+
+    upstream = FakeUpstream(args.latency, args.fail_every)
+    jobs = JobQueue(workers=args.workers, rate=args.rate, burst=1, backoff=0.2)
+
+    start = time.perf_counter()
+    upstream.generate(-1)
+    inline_ms = (time.perf_counter() - start) * 1000
+    upstream.starts.clear()
+
+    start = time.perf_counter()
+    ids = jobs.submit_many([(f"grant-{i}", upstream.generate, (i,)) for i in range(args.jobs)])
+    submit_ms = (time.perf_counter() - start) * 1000 / args.jobs
+    duplicate_ids = [jobs.submit(f"grant-{i}", upstream.generate, i) for i in range(args.jobs)]
+    assert duplicate_ids == ids
+
+    while any(jobs.status(job_id)["status"] not in ("done", "failed") for job_id in ids):
+        time.sleep(0.05)
+    drain_s = time.perf_counter() - start
+
+    starts = sorted(upstream.starts)
+    observed_rate = (len(starts) - 1) / (starts[-1] - starts[0]) if len(starts) > 1 else 0.0
+    metrics = jobs.metrics()
+    assert metrics["done"] == args.jobs and metrics["failed"] == 0
+    print(f"click blocks the page: inline {inline_ms:.0f} ms, submit {submit_ms:.3f} ms")
+    print(f"{args.jobs} jobs, {args.workers} workers, rate {args.rate}/s: drained in {drain_s:.2f} s, "
+          f"{len(starts)} upstream attempts at {observed_rate:.2f}/s")
+    print(f"retries {metrics['retries']}, deduplicated clicks {metrics['deduplicated']}, "
+          f"wait p50/p95 {metrics['wait_p50']:.2f}/{metrics['wait_p95']:.2f} s, "
+          f"run p50/p95 {metrics['run_p50']:.2f}/{metrics['run_p95']:.2f} s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,114 @@
+# benchmarks/bench_lsa.py
+"""
+Parity and latency of utilities.fast_lsa against Sumy's LsaSummarizer.
+
+Parity: both summarizers pick 10 sentences from every document of the NIH
+corpus (the titles of funddb/NIH_data.csv grouped by organization, plus any
+saved announcement pages in --html-dir) and of synthetic Grants.gov
+descriptions; reports how many picks are identical, how many are identical
+up to ties (sentences with equal ratings, which Sumy orders by SVD rounding
+noise and fast_lsa by position) and the mean overlap.
+Latency: median summarizer time (parsing excluded) by document length.
+
+    python benchmarks/bench_lsa.py --html-dir /tmp/nih_pages
+"""
+import argparse
+import csv
+import os
+import random
+import statistics
+import sys
+import time
+from collections import defaultdict
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+LENGTHS = (10, 50, 200, 1000)
+
+
+def nih_documents():
+    by_org = defaultdict(list)
+    with open(os.path.join(ROOT, "funddb", "NIH_data.csv"), newline="", encoding="utf-8") as f:
+        for row in csv.DictReader(f):
+            by_org[row["Organization"]].append(row["Title"].rstrip(".") + ".")
+    return [" ".join(titles) for titles in by_org.values() if len(titles) > 1]
+
+
+def parse_all(texts, html_dir, tokenizer):
+    from sumy.parsers.html import HtmlParser
+    from sumy.parsers.plaintext import PlaintextParser
+
+    documents = [PlaintextParser.from_string(text, tokenizer).document for text in texts]
+    if html_dir:
+        for name in sorted(os.listdir(html_dir)):
+            with open(os.path.join(html_dir, name), encoding="utf-8", errors="replace") as f:
+                documents.append(HtmlParser.from_string(f.read(), None, tokenizer).document)
+    return documents
+
+
+def parity(documents, reference, fast, sentence_count):
+    identical = tied = 0
+    overlaps = []
+    for document in documents:
+        expected = reference(document, sentence_count)
+        actual = fast(document, sentence_count)
+        ratings = dict(zip(document.sentences, fast.rate_sentences(document) or []))
+        identical += expected == actual
+        tied += all(abs(ratings[e] - ratings[a]) < 1e-9 for e, a in zip(
+            sorted(expected, key=ratings.get), sorted(actual, key=ratings.get)))
+        overlaps.append(len(set(expected) & set(actual)) / max(len(expected), 1))
+    return identical, tied, statistics.mean(overlaps)
+
+
+def timed_ms(summarizer, document, sentence_count, repeat):
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        summarizer(document, sentence_count)
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--html-dir", help="Directory of saved NIH announcement pages")
+    parser.add_argument("--sentences", type=int, default=10)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    import warnings
+
+    from sumy.summarizers.lsa import LsaSummarizer
+    from sumy.parsers.plaintext import PlaintextParser
+
+    from benchmarks.synthetic_extract import _description, _sentence
+    from utilities.fast_lsa import FastLsaSummarizer
+    from utilities.grant_sumy import DEFAULT_LANGUAGE, get_summarizer, get_tokenizer
+
+    # Sumy warns when a document has fewer words than sentences
+    warnings.simplefilter("ignore")
+    tokenizer, fast = get_tokenizer(DEFAULT_LANGUAGE), get_summarizer(DEFAULT_LANGUAGE, "lsa")
+    assert isinstance(fast, FastLsaSummarizer)
+    reference = LsaSummarizer(fast._stemmer)
+    reference.stop_words = fast.stop_words
+
+    nih = parse_all(nih_documents(), args.html_dir, tokenizer)
+    grants = parse_all([_description(random.Random(i)) for i in range(200)], None, tokenizer)
+    print(f"{'corpus':<8} {'docs':>5} {'identical':>10} {'up to ties':>11} {'overlap':>8}")
+    for name, documents in (("nih", nih), ("grants", grants)):
+        identical, tied, overlap = parity(documents, reference, fast, args.sentences)
+        print(f"{name:<8} {len(documents):5} {identical:10} {tied:11} {overlap:8.3f}")
+
+    print(f"\n{'sentences':>9} {'sumy ms':>8} {'fast ms':>8} {'speedup':>8}")
+    rng = random.Random(0)
+    for length in LENGTHS:
+        text = " ".join(_sentence(rng) for _ in range(length))
+        document = PlaintextParser.from_string(text, tokenizer).document
+        sumy_ms = timed_ms(reference, document, args.sentences, args.repeat)
+        fast_ms = timed_ms(fast, document, args.sentences, args.repeat)
+        print(f"{length:9} {sumy_ms:8.1f} {fast_ms:8.1f} {sumy_ms / fast_ms:7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
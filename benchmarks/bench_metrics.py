@@ -0,0 +1,109 @@
+# benchmarks/bench_metrics.py
+"""
+Cost of utilities.metrics, and what it reports under concurrent sessions.
+
+Overhead: nanoseconds per call of an empty function wrapped with timed(),
+with metrics on and with FUNDR_METRICS=0 (each in its own interpreter),
+against the bare function.
+
+Capacity: N threads (sessions) each run --queries Grants.gov and NIH page
+queries against the shared pool, on a synthetic store of --rows rows. For
+each N the recorded histograms give the queries per second and the mean
+and p95 (bucket upper bound) query latency, which is what the sidebar
+panel and /metrics show in production.
+
+    python benchmarks/bench_metrics.py --rows 10000 --sessions 1,2,4,8 --queries 20
+"""
+import argparse
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import timeit
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+NIH_FILE_PATH = os.path.join(ROOT, "funddb", "NIH_data.csv")
+SEARCHES = ("", "research", "health", "education", "cancer", "energy")
+CALLS = 200000
+
+
+def overhead_child():
+    from utilities import metrics
+
+    def noop():
+        return None
+
+    wrapped = metrics.timed("noop")(noop)
+    bare = min(timeit.repeat(noop, number=CALLS, repeat=5)) / CALLS
+    timed = min(timeit.repeat(wrapped, number=CALLS, repeat=5)) / CALLS
+    print(f"{(timed - bare) * 1e9:.0f}")
+
+
+def session(store_dir, queries, seed):
+    from utilities.db_pool import get_pool
+    from utilities.grants_data import query_grants_page
+    from utilities.nih_data import query_nih_page
+
+    pool = get_pool()
+    pool.ensure_nih(NIH_FILE_PATH)
+    pool.ensure_grants(store_dir)
+    rng = random.Random(seed)
+    for _ in range(queries):
+        with pool.cursor() as conn:
+            query_grants_page(conn, description_search=rng.choice(SEARCHES), search_index=pool.get("grants"))
+            query_nih_page(conn, title_search=rng.choice(SEARCHES), search_index=pool.get("nih"))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rows", type=int, default=10000)
+    parser.add_argument("--sessions", default="1,2,4,8")
+    parser.add_argument("--queries", type=int, default=20)
+    parser.add_argument("--overhead-child", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.overhead_child:
+        overhead_child()
+        return
+
+    for label, value in (("on", "1"), ("off", "0")):
+        out = subprocess.run([sys.executable, __file__, "--overhead-child"], cwd=ROOT, check=True,
+                             capture_output=True, text=True, env=dict(os.environ, FUNDR_METRICS=value))
+        print(f"timed() overhead, metrics {label}: {out.stdout.strip()} ns per call")
+
+    from benchmarks.synthetic_extract import write_extract
+    from utilities import metrics
+    from utilities.grants_store import build_store
+
+    with tempfile.TemporaryDirectory() as tmp:
+        xml_path = write_extract(os.path.join(tmp, "extract.xml"), args.rows)
+        store_dir = os.path.join(tmp, "store")
+        build_store(xml_path, "20250101", store_dir=store_dir, summarize=False)
+        session(store_dir, 1, 0)  # load both datasets before timing
+
+        print(f"{'sessions':>8} {'queries/s':>10} {'query':<12} {'mean ms':>8} {'p95 ms':>7}")
+        for sessions in (int(n) for n in args.sessions.split(",")):
+            metrics.reset()
+            threads = [threading.Thread(target=session, args=(store_dir, args.queries, seed))
+                       for seed in range(sessions)]
+            start = time.perf_counter()
+            for t in threads:
+                t.start()
+            for t in threads:
+                t.join()
+            elapsed = time.perf_counter() - start
+            for row in metrics.summary():
+                if row["metric"] == "query ms":
+                    print(f"{sessions:8} {row['count'] / elapsed:10.1f} {row['labels'][len('query='):]:<12} "
+                          f"{row['mean']:8.1f} {row['p95']:7.0f}")
+        text = metrics.render_prometheus()
+        print(f"/metrics: {len(text.splitlines())} lines, {len(text)} bytes")
+
+
+if __name__ == "__main__":
+    main()
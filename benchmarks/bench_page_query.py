@@ -0,0 +1,102 @@
+# benchmarks/bench_page_query.py
+"""
+Per-rerun cost of the Grants.gov page data: fetching every matching row and
+computing status, top 10 lists, banner totals and the page slice in pandas,
+against query_grants_page, which gets all of them from one DuckDB query.
+
+    python benchmarks/bench_page_query.py --rows 80000
+"""
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+PAGE_SIZE = 50
+SCENARIOS = [
+    ("all", dict(status="All")),
+    ("active", dict(status="Active")),
+    ("search", dict(description_search="research", status="All")),
+    ("page 20", dict(status="All", page=20)),
+]
+
+
+def pandas_rerun(conn, index, status="All", page=0, **searches):
+    """What the page computed per rerun before query_grants_page."""
+    from utilities.grants_data import query_grants, top_10_agencies_by_budget, top_10_agencies_by_count
+
+    df_all = query_grants(conn, status=status, search_index=index, **searches)
+    top_10_agencies_by_budget(df_all)
+    top_10_agencies_by_count(df_all)
+    sum_funding = df_all["EstimatedTotalProgramFunding"].astype(float).fillna(0).sum()
+    unique_agencies = df_all["AgencyName"].nunique(dropna=True)
+    return len(df_all), unique_agencies, sum_funding, df_all.iloc[page * PAGE_SIZE:(page + 1) * PAGE_SIZE]
+
+
+def duckdb_rerun(conn, index, status="All", page=0, after=None, **searches):
+    from utilities.grants_data import query_grants_page
+
+    result = query_grants_page(conn, status=status, after=after, page_size=PAGE_SIZE, search_index=index, **searches)
+    return result["total"], result["unique_agencies"], result["total_funding"], result["page"]
+
+
+def page_cursor(conn, index, status="All", page=0, **searches):
+    """Walks to `page` with keyset pagination and returns its cursor (None for the first page)."""
+    from utilities.grants_data import query_grants_page
+
+    after = None
+    for _ in range(page):
+        after = query_grants_page(conn, status=status, after=after, page_size=PAGE_SIZE,
+                                  search_index=index, **searches)["next_cursor"]
+    return after
+
+
+def measure(rerun, conn, index, kwargs, repeat):
+    rerun(conn, index, **kwargs)
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        rerun(conn, index, **kwargs)
+        samples.append((time.perf_counter() - start) * 1000)
+    tracemalloc.start()
+    result = rerun(conn, index, **kwargs)
+    peak = tracemalloc.get_traced_memory()[1] / 1e6
+    tracemalloc.stop()
+    return statistics.median(samples), peak, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rows", type=int, default=80000)
+    parser.add_argument("--repeat", type=int, default=10)
+    args = parser.parse_args()
+
+    from benchmarks.synthetic_extract import write_extract
+    from utilities.db_pool import ConnectionPool
+    from utilities.grants_store import build_store
+
+    with tempfile.TemporaryDirectory() as tmp:
+        xml_path = write_extract(os.path.join(tmp, "extract.xml"), args.rows)
+        store_dir = os.path.join(tmp, "store")
+        build_store(xml_path, "20250101", store_dir=store_dir, summarize=False)
+        pool = ConnectionPool()
+        pool.ensure_grants(store_dir)
+        index = pool.get("grants")
+
+        print(f"{args.rows} rows, median of {args.repeat} reruns; memory is the Python peak of one rerun")
+        print(f"{'scenario':<10} {'pandas ms':>10} {'duckdb ms':>10} {'pandas MB':>10} {'duckdb MB':>10} {'rows':>8}")
+        with pool.cursor() as conn:
+            for name, kwargs in SCENARIOS:
+                pandas_ms, pandas_mb, expected = measure(pandas_rerun, conn, index, kwargs, args.repeat)
+                keyset_kwargs = dict(kwargs, after=page_cursor(conn, index, **kwargs))
+                duckdb_ms, duckdb_mb, actual = measure(duckdb_rerun, conn, index, keyset_kwargs, args.repeat)
+                assert expected[:2] == actual[:2], (expected[:2], actual[:2])
+                print(f"{name:<10} {pandas_ms:10.1f} {duckdb_ms:10.1f} {pandas_mb:10.1f} {duckdb_mb:10.1f} {expected[0]:8}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,124 @@
+# benchmarks/bench_podcast_audio.py
+"""
+Podcast audio size per TTS encoding, and chunked synthesis of long scripts,
+against a stand-in TTS client that encodes synthetic speech-band audio with
+soundfile at the requested encoding (150 words per minute, 16 kHz mono;
+MP3 at a constant 32 kbit/s and LINEAR16 with a WAV header, as from
+Google TTS).
+
+For each encoding: bytes of a one-minute podcast (what each listener
+downloads, and what the old pages kept in st.session_state per clip), the
+ratio to LINEAR16, and a script several times over the TTS input limit
+synthesized in chunks and joined, with its decoded duration. Also plays
+the audio by path from a PodcastCache, as the pages do.
+
+    python benchmarks/bench_podcast_audio.py --minutes 1 --long-minutes 12
+"""
+import argparse
+import io
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+import soundfile as sf
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+WORDS_PER_MINUTE = 150
+SOUNDFILE_FORMATS = {
+    "LINEAR16": {"format": "WAV", "subtype": "PCM_16"},
+    "MP3": {"format": "MP3", "subtype": "MPEG_LAYER_III", "bitrate_mode": "CONSTANT", "compression_level": 0.85},
+    "OGG_OPUS": {"format": "OGG", "subtype": "OPUS"},
+}
+
+
+class StandInResponse:
+    def __init__(self, audio_content):
+        self.audio_content = audio_content
+
+
+class StandInTTS:
+    def __init__(self, sample_rate):
+        self.sample_rate = sample_rate
+        self.requests = 0
+        self.rng = np.random.default_rng(0)
+
+    def synthesize_speech(self, request):
+        self.requests += 1
+        text = request["input"].text
+        seconds = len(text.split()) * 60 / WORDS_PER_MINUTE
+        t = np.arange(int(seconds * self.sample_rate)) / self.sample_rate
+        # Voiced tones under a syllable-rate envelope, plus breath noise
+        envelope = 0.5 + 0.5 * np.sin(2 * np.pi * 4 * t)
+        signal = envelope * (0.3 * np.sin(2 * np.pi * 180 * t) + 0.15 * np.sin(2 * np.pi * 720 * t))
+        signal += 0.02 * self.rng.standard_normal(len(t))
+        buffer = io.BytesIO()
+        sf.write(buffer, signal.astype("float32"), self.sample_rate,
+                 **SOUNDFILE_FORMATS[request["audio_config"].audio_encoding.name])
+        return StandInResponse(buffer.getvalue())
+
+
+def decoded_seconds(audio, encoding):
+    if encoding == "OGG_OPUS":
+        # Chained Ogg: decode each logical stream (libsndfile reads one at a time)
+        streams = [b"OggS" + part for part in audio.split(b"OggS")[1:]]
+        total, current = 0.0, b""
+        for page in streams:
+            if page[5] & 0x02 and current:  # beginning-of-stream page starts the next clip
+                total += sf.info(io.BytesIO(current)).duration
+                current = b""
+            current += page
+        return total + sf.info(io.BytesIO(current)).duration
+    return sf.info(io.BytesIO(audio)).duration
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--minutes", type=float, default=1.0)
+    parser.add_argument("--long-minutes", type=float, default=12.0)
+    args = parser.parse_args()
+
+    from utilities import ai_podcast
+    from utilities.podcast_cache import PodcastCache
+
+    rate = ai_podcast.VOICE_SETTINGS["sample_rate_hertz"]
+    script = " ".join(["grant"] * int(args.minutes * WORDS_PER_MINUTE))
+    long_script = ". ".join(["This program funds research on rare diseases"] * int(
+        args.long_minutes * WORDS_PER_MINUTE / 7)) + "."
+    default_encoding = ai_podcast.VOICE_SETTINGS["encoding"]
+
+    print(f"{'encoding':<10} {'bytes/clip':>11} {'vs LINEAR16':>12} {'long: chunks':>13} "
+          f"{'seconds':>8} {'bytes':>10} {'synth ms':>9}")
+    sizes = {}
+    for encoding in ("LINEAR16", "MP3", "OGG_OPUS"):
+        ai_podcast.VOICE_SETTINGS["encoding"] = encoding
+        client = StandInTTS(rate)
+        audio = ai_podcast.synthesize_audio(script, client)
+        sizes[encoding] = len(audio)
+
+        client.requests = 0
+        start = time.perf_counter()
+        long_audio = ai_podcast.synthesize_audio(long_script, client)
+        synth_ms = (time.perf_counter() - start) * 1000
+        seconds = decoded_seconds(long_audio, encoding)
+        assert client.requests == len(ai_podcast.split_script(long_script)) > 1
+        assert abs(seconds - args.long_minutes * 60) < 0.05 * args.long_minutes * 60, seconds
+        print(f"{encoding:<10} {len(audio):11} {sizes['LINEAR16'] / len(audio):11.1f}x "
+              f"{client.requests:13} {seconds:8.1f} {len(long_audio):10} {synth_ms:9.0f}")
+    ai_podcast.VOICE_SETTINGS["encoding"] = default_encoding
+
+    with tempfile.TemporaryDirectory() as cache_dir:
+        cache = PodcastCache(cache_dir)
+        podcast = ("Grant content", {"model": "stub"}, ai_podcast.VOICE_SETTINGS,
+                 lambda content: script, lambda s: ai_podcast.synthesize_audio(s, StandInTTS(rate)))
+        path = cache.podcast_path(*podcast)
+        assert cache.podcast_path(*podcast) == path
+        print(f"default {default_encoding} ({ai_podcast.podcast_audio_format()}): pages play "
+              f"{os.path.getsize(path)} bytes from {os.path.relpath(path, cache_dir)}; "
+              f"session_state keeps only the job id")
+
+
+if __name__ == "__main__":
+    main()
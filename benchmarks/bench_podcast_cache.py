@@ -0,0 +1,110 @@
+# benchmarks/bench_podcast_cache.py
+"""
+PodcastCache with stubbed Gemini and TTS clients (fixed delays, call
+counters): upstream calls and wall time for a burst of concurrent FundrAI
+clicks on a few grants, then the same clicks again on a warm cache, then
+a fresh cache object on the same directory (another process). Also checks
+that a failing upstream call reaches every waiter and is not cached.
+
+    python benchmarks/bench_podcast_cache.py --clicks 40 --grants 4
+"""
+import argparse
+import os
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+SCRIPT_SETTINGS = {"model": "stub-gemini", "temperature": 0.3}
+AUDIO_SETTINGS = {"name": "stub-voice", "speaking_rate": 1.0}
+
+
+class StubClients:
+    def __init__(self, script_delay, audio_delay):
+        self.script_delay = script_delay
+        self.audio_delay = audio_delay
+        self.lock = threading.Lock()
+        self.calls = {"script": 0, "audio": 0}
+        self.fail = False
+
+    def _call(self, kind, delay):
+        with self.lock:
+            self.calls[kind] += 1
+        time.sleep(delay)
+        if self.fail:
+            raise RuntimeError("upstream unavailable")
+
+    def generate_script(self, content):
+        self._call("script", self.script_delay)
+        return f"Podcast about: {content}"
+
+    def synthesize(self, script):
+        self._call("audio", self.audio_delay)
+        return b"RIFF" + script.encode("utf-8")
+
+
+def burst(cache, clients, contents, workers):
+    def click(content):
+        return cache.get_or_create_podcast(content, SCRIPT_SETTINGS, AUDIO_SETTINGS,
+                                           clients.generate_script, clients.synthesize)
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        results = list(executor.map(click, contents))
+    return results, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--clicks", type=int, default=40)
+    parser.add_argument("--grants", type=int, default=4)
+    parser.add_argument("--script-delay", type=float, default=0.5)
+    parser.add_argument("--audio-delay", type=float, default=0.3)
+    args = parser.parse_args()
+
+    from utilities.podcast_cache import PodcastCache, content_key
+
+    contents = [f"Grant {i % args.grants}" for i in range(args.clicks)]
+    with tempfile.TemporaryDirectory() as cache_dir:
+        clients = StubClients(args.script_delay, args.audio_delay)
+        cache = PodcastCache(cache_dir)
+        uncached_s = args.clicks * (args.script_delay + args.audio_delay)
+
+        print(f"{args.clicks} concurrent clicks on {args.grants} grants; uncached that is "
+              f"{args.clicks} script + {args.clicks} audio calls, {uncached_s:.1f} s of upstream time")
+        print(f"{'run':<14} {'seconds':>8} {'script calls':>13} {'audio calls':>12}")
+        for name, target in (("cold", cache), ("warm", cache), ("new process", PodcastCache(cache_dir))):
+            before = dict(clients.calls)
+            results, seconds = burst(target, clients, contents, args.clicks)
+            assert results == [b"RIFFPodcast about: " + c.encode() for c in contents]
+            print(f"{name:<14} {seconds:8.2f} {clients.calls['script'] - before['script']:13} "
+                  f"{clients.calls['audio'] - before['audio']:12}")
+        assert clients.calls == {"script": args.grants, "audio": args.grants}, clients.calls
+
+        stats = cache.stats()
+        print(f"script hit rate {stats['script_hit_rate']:.2f}, {stats['script_calls_saved']} calls saved "
+              f"({stats['script_deduplicated']} deduplicated); audio hit rate {stats['audio_hit_rate']:.2f}")
+
+        clients.fail = True
+        errors = []
+
+        def failing_click(_):
+            try:
+                cache.get_or_create_podcast("Unlucky grant", SCRIPT_SETTINGS, AUDIO_SETTINGS,
+                                            clients.generate_script, clients.synthesize)
+            except RuntimeError as e:
+                errors.append(e)
+
+        before = clients.calls["script"]
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            list(executor.map(failing_click, range(8)))
+        assert len(errors) == 8 and clients.calls["script"] - before == 1
+        assert cache.get("script", content_key("Unlucky grant", SCRIPT_SETTINGS)) is None
+        print(f"failure: 8 concurrent clicks, 1 upstream call, {len(errors)} errors, nothing cached")
+
+
+if __name__ == "__main__":
+    main()
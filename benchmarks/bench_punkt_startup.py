@@ -0,0 +1,97 @@
+# benchmarks/bench_punkt_startup.py
+"""
+Cold start of sentence/word tokenization: the compact Punkt store
+(utilities.punkt_store) versus NLTK's data path (what app.py and
+grant_sumy did before: point nltk.data at a data directory, check that
+the punkt resource is there, then sumy's Tokenizer, whose word tokenizer
+loads the English model a second time through nltk.word_tokenize).
+
+Each loader runs in a fresh interpreter: seconds for the imports, seconds
+from there to the first tokenized document, resident memory added by the
+models, and the bytes the loader's data takes on disk. Pass the old data
+directory (e.g. from `git archive <rev> src/nltk_data`) to compare.
+
+    python benchmarks/bench_punkt_startup.py --nltk-data /tmp/old/src/nltk_data --runs 5
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+TEXT = ("The National Institutes of Health (NIH) invites applications, e.g. from U.S. institutions. "
+        "Awards are up to $500,000 per year! Dr. Smith et al. will review them. Are you eligible? ") * 20
+
+
+def rss_bytes():
+    with open("/proc/self/statm") as f:
+        return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+
+
+def run_child(loader, nltk_data):
+    start = time.perf_counter()
+    import nltk
+    from sumy.nlp.tokenizers import Tokenizer
+    imports_s = time.perf_counter() - start
+    rss_before = rss_bytes()
+
+    start = time.perf_counter()
+    if loader == "store":
+        from utilities.punkt_store import StoreTokenizer
+        tokenizer = StoreTokenizer("english")
+    else:
+        nltk.data.path.append(nltk_data)
+        nltk.data.find("tokenizers/punkt")
+        tokenizer = Tokenizer("english")
+    sentences = tokenizer.to_sentences(TEXT)
+    words = [tokenizer.to_words(sentence) for sentence in sentences]
+    load_s = time.perf_counter() - start
+    print(json.dumps({"imports_s": imports_s, "load_s": load_s, "rss": rss_bytes() - rss_before,
+                      "tokens": [list(sentences), [list(w) for w in words]]}))
+
+
+def dir_bytes(path):
+    return sum(os.path.getsize(os.path.join(d, name)) for d, _, names in os.walk(path) for name in names)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--nltk-data", help="Old NLTK data directory to compare against")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--child", choices=("store", "nltk"), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        run_child(args.child, args.nltk_data)
+        return
+
+    from utilities.punkt_store import STORE_DIR
+
+    loaders = {"store": STORE_DIR}
+    if args.nltk_data:
+        loaders["nltk"] = args.nltk_data
+    print(f"{'loader':<7} {'imports s':>10} {'first doc s':>12} {'models RSS MB':>14} {'on disk MB':>11}")
+    tokens = {}
+    for loader, data_dir in loaders.items():
+        results = []
+        for _ in range(args.runs):
+            out = subprocess.run([sys.executable, __file__, "--child", loader, "--nltk-data", data_dir],
+                                 cwd=ROOT, capture_output=True, text=True, check=True)
+            results.append(json.loads(out.stdout.splitlines()[-1]))
+        tokens[loader] = results[0]["tokens"]
+        print(f"{loader:<7} {statistics.median(r['imports_s'] for r in results):10.2f} "
+              f"{statistics.median(r['load_s'] for r in results):12.3f} "
+              f"{statistics.median(r['rss'] for r in results) / 2 ** 20:14.1f} "
+              f"{dir_bytes(data_dir) / 2 ** 20:11.1f}")
+    if "nltk" in tokens:
+        assert tokens["store"] == tokens["nltk"], "tokenization differs"
+        print("same sentences and words from both loaders")
+
+
+if __name__ == "__main__":
+    main()
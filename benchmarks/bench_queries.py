@@ -0,0 +1,64 @@
+# benchmarks/bench_queries.py
+"""
+Micro-benchmark of page reruns per second for the NIH filters: the previous
+f-string SQL against the cached, parameterized statements of
+utilities.query_builder, both on one pooled cursor.
+
+    python benchmarks/bench_queries.py --seconds 3
+"""
+import argparse
+import os
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+NIH_FILE_PATH = os.path.join(ROOT, "funddb", "NIH_data.csv")
+SEARCHES = ["R01", "R21", "U01", "K99", "P30"]
+
+
+def legacy_rerun(conn, activity_code):
+    """The queries the NIH page ran per rerun before query_builder."""
+    for column in ("Parent_Organization", "Organization", "Document_Type"):
+        conn.execute(f"SELECT DISTINCT {column} FROM nih WHERE {column} IS NOT NULL ORDER BY {column}").fetchdf()
+    sql = "SELECT * FROM nih WHERE 1=1"
+    sql += f" AND Activity_Code ILIKE '%{activity_code}%'"
+    sql += " AND Parent_Organization = 'NIH'"
+    return conn.execute(sql).fetchdf()
+
+
+def parameterized_rerun(conn, activity_code):
+    from utilities.nih_data import get_unique_values, query_nih_data
+
+    for column in ("Parent_Organization", "Organization", "Document_Type"):
+        get_unique_values(conn, column)
+    return query_nih_data(conn, activity_code_search=activity_code, parent_org_filter="NIH")
+
+
+def reruns_per_second(rerun, conn, seconds):
+    count = 0
+    deadline = time.perf_counter() + seconds
+    while time.perf_counter() < deadline:
+        rerun(conn, SEARCHES[count % len(SEARCHES)])
+        count += 1
+    return count / seconds
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--seconds", type=float, default=3.0)
+    args = parser.parse_args()
+
+    from utilities.db_pool import ConnectionPool
+
+    pool = ConnectionPool()
+    pool.ensure_nih(NIH_FILE_PATH)
+    with pool.cursor() as conn:
+        for name, rerun in (("f-string", legacy_rerun), ("cached", parameterized_rerun)):
+            rate = reruns_per_second(rerun, conn, args.seconds)
+            print(f"{name:<10} {rate:8.1f} reruns/s")
+
+
+if __name__ == "__main__":
+    main()
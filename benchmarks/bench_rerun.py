@@ -0,0 +1,106 @@
+# benchmarks/bench_rerun.py
+"""
+Script rerun time of the NIH and Grants.gov pages against result size.
+
+Each size gets its own working directory with a synthetic Grants.gov store
+and an NIH CSV made by repeating the real one, and the pages are run there
+with Streamlit's AppTest. With keyset pagination a rerun only fetches and
+renders one page, so its time should stay flat as the result grows.
+
+    python benchmarks/bench_rerun.py --sizes 1000,10000,50000
+"""
+import argparse
+import csv
+import os
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+PAGES = {
+    "nih": os.path.join(ROOT, "pages", "00_fundr_nih.py"),
+    "grants": os.path.join(ROOT, "pages", "01_fundr_gov.py"),
+}
+
+
+def write_nih_csv(path, rows):
+    """Repeats the rows of the real NIH CSV up to `rows`, keeping Document_Number unique."""
+    with open(os.path.join(ROOT, "funddb", "NIH_data.csv"), newline="", encoding="utf-8") as f:
+        reader = csv.DictReader(f)
+        fieldnames = reader.fieldnames
+        source = list(reader)
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.DictWriter(f, fieldnames=fieldnames, quoting=csv.QUOTE_ALL)
+        writer.writeheader()
+        for i in range(rows):
+            row = dict(source[i % len(source)])
+            if i >= len(source):
+                row["Document_Number"] = f"{row['Document_Number']}-{i // len(source)}"
+            writer.writerow(row)
+
+
+def prepare_workdir(workdir, rows):
+    from benchmarks.synthetic_extract import write_extract
+    from utilities.grants_store import STORE_DIR, build_store
+
+    os.makedirs(os.path.join(workdir, "funddb"), exist_ok=True)
+    shutil.copy(os.path.join(ROOT, "style.css"), workdir)
+    write_nih_csv(os.path.join(workdir, "funddb", "NIH_data.csv"), rows)
+    xml_path = write_extract(os.path.join(workdir, "extract.xml"), rows)
+    build_store(xml_path, "20250101", store_dir=os.path.join(workdir, STORE_DIR), summarize=False)
+    os.remove(xml_path)
+
+
+def time_page(page, repeat):
+    from streamlit.testing.v1 import AppTest
+
+    at = AppTest.from_file(PAGES[page], default_timeout=600)
+    start = time.perf_counter()
+    at.run()
+    cold = time.perf_counter() - start
+    if at.exception:
+        raise RuntimeError(at.exception[0].value)
+
+    reruns, next_pages = [], []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        at.run()
+        reruns.append((time.perf_counter() - start) * 1000)
+        start = time.perf_counter()
+        next(b for b in at.button if b.label == "Next Page").click().run()
+        next_pages.append((time.perf_counter() - start) * 1000)
+        next(b for b in at.button if b.label == "Previous Page").click().run()
+    return cold, statistics.median(reruns), statistics.median(next_pages)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", default="1000,10000,50000")
+    parser.add_argument("--pages", default="nih,grants")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    import utilities.db_pool as db_pool
+
+    cwd = os.getcwd()
+    print(f"{'page':<8} {'rows':>8} {'first run s':>12} {'rerun ms':>10} {'next page ms':>13}")
+    try:
+        for rows in (int(size) for size in args.sizes.split(",")):
+            with tempfile.TemporaryDirectory() as workdir:
+                prepare_workdir(workdir, rows)
+                os.chdir(workdir)
+                for page in args.pages.split(","):
+                    db_pool._pool = None
+                    cold, rerun_ms, next_ms = time_page(page, args.repeat)
+                    print(f"{page:<8} {rows:8} {cold:12.2f} {rerun_ms:10.1f} {next_ms:13.1f}")
+                os.chdir(cwd)
+    finally:
+        os.chdir(cwd)
+
+
+if __name__ == "__main__":
+    main()
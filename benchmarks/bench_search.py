@@ -0,0 +1,64 @@
+# benchmarks/bench_search.py
+"""
+Compares ranked full-text search (utilities.search_index) with the ILIKE
+path of query_grants on a synthetic Grants.gov store.
+
+    python benchmarks/bench_search.py --rows 80000
+"""
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+QUERIES = ["research", "clinical trial", "rural health services", "climate energy infrastructure"]
+
+
+def timed(fn, repeat):
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples), result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rows", type=int, default=80000)
+    parser.add_argument("--repeat", type=int, default=10)
+    args = parser.parse_args()
+
+    from benchmarks.synthetic_extract import write_extract
+    from utilities.db_pool import ConnectionPool
+    from utilities.grants_data import SEARCH_FIELDS, query_grants
+    from utilities.grants_store import build_store
+
+    with tempfile.TemporaryDirectory() as tmp:
+        xml_path = write_extract(os.path.join(tmp, "extract.xml"), args.rows)
+        store_dir = os.path.join(tmp, "store")
+        start = time.perf_counter()
+        build_store(xml_path, "20250101", store_dir=store_dir, summarize=False)
+        print(f"Built store with index for {args.rows} rows in {time.perf_counter() - start:.1f} s")
+
+        pool = ConnectionPool()
+        start = time.perf_counter()
+        pool.ensure_grants(store_dir)
+        print(f"Loaded search index in {time.perf_counter() - start:.2f} s")
+        index = pool.get("grants")
+
+        print(f"{'query':<32} {'index ms':>9} {'indexed query ms':>17} {'ILIKE query ms':>15} {'hits':>7} {'ILIKE rows':>10}")
+        with pool.cursor() as conn:
+            for query in QUERIES:
+                index_ms, hits = timed(lambda: index.search(query, SEARCH_FIELDS), args.repeat)
+                ranked_ms, ranked = timed(
+                    lambda: query_grants(conn, description_search=query, search_index=index), args.repeat)
+                ilike_ms, scanned = timed(lambda: query_grants(conn, description_search=query), args.repeat)
+                print(f"{query:<32} {index_ms:9.2f} {ranked_ms:17.1f} {ilike_ms:15.1f} {len(hits):7} {len(scanned):10}")
+
+
+if __name__ == "__main__":
+    main()
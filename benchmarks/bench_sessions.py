@@ -0,0 +1,93 @@
+# benchmarks/bench_sessions.py
+"""
+Load test for the shared data layer: simulates N concurrent Streamlit
+sessions, each loading the NIH and Grants.gov datasets and running a query,
+and reports peak RSS. "per-session" is the old layout (one in-memory copy of
+each dataset per session), "pooled" uses utilities.db_pool. Each mode runs in
+its own subprocess.
+
+    python benchmarks/bench_sessions.py --sessions 50 --rows 5000
+"""
+import argparse
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+NIH_FILE_PATH = os.path.join(ROOT, "funddb", "NIH_data.csv")
+
+
+def per_session(xml_path, results):
+    from utilities.grants_data import load_data_into_duckdb_from_memory, query_grants
+    from utilities.nih_data import load_nih_data, query_nih_data
+
+    with open(xml_path, "rb") as f:
+        xml_data = f.read()
+    nih_conn = load_nih_data(NIH_FILE_PATH)
+    grants_conn = load_data_into_duckdb_from_memory(xml_data)
+    results.append((xml_data, nih_conn, grants_conn))
+    query_nih_data(nih_conn, title_search="cancer")
+    query_grants(grants_conn, description_search="research")
+
+
+def pooled(store_dir, results):
+    from utilities.db_pool import get_pool
+    from utilities.grants_data import query_grants
+    from utilities.nih_data import query_nih_data
+
+    pool = get_pool()
+    pool.ensure_nih(NIH_FILE_PATH)
+    pool.ensure_grants(store_dir)
+    with pool.cursor() as conn:
+        query_nih_data(conn, title_search="cancer")
+        query_grants(conn, description_search="research")
+
+
+def run_mode(mode, sessions, xml_path, store_dir):
+    results = []
+    target = per_session if mode == "per-session" else pooled
+    arg = xml_path if mode == "per-session" else store_dir
+    start = time.perf_counter()
+    threads = [threading.Thread(target=target, args=(arg, results)) for _ in range(sessions)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    elapsed = time.perf_counter() - start
+    peak_mb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    print(f"{mode:<12} {sessions:>3} sessions  {elapsed:7.2f} s  peak RSS {peak_mb:8.1f} MB")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sessions", type=int, default=50)
+    parser.add_argument("--rows", type=int, default=5000)
+    parser.add_argument("--mode", choices=["per-session", "pooled"])
+    parser.add_argument("--xml")
+    parser.add_argument("--store-dir")
+    args = parser.parse_args()
+
+    if args.mode:
+        run_mode(args.mode, args.sessions, args.xml, args.store_dir)
+        return
+
+    from benchmarks.synthetic_extract import write_extract
+    from utilities.grants_store import build_store
+
+    with tempfile.TemporaryDirectory() as tmp:
+        xml_path = write_extract(os.path.join(tmp, "extract.xml"), args.rows)
+        store_dir = os.path.join(tmp, "store")
+        build_store(xml_path, "20250101", store_dir=store_dir, summarize=False)
+        for mode in ("per-session", "pooled"):
+            subprocess.run([sys.executable, __file__, "--mode", mode, "--sessions", str(args.sessions),
+                            "--xml", xml_path, "--store-dir", store_dir], check=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,170 @@
+# benchmarks/bench_snapshots.py
+"""
+Opening the datasets in a fresh process: from their sources versus from
+Parquet snapshots (utilities.snapshots), on synthetic data of --rows rows.
+
+NIH:     csv            read_csv into a table, then build the search index (the old db_pool path)
+         parquet        snapshot read into tables, search index loaded from it (the page's path)
+         parquet-view   snapshot scanned in place
+Grants:  xml            parse the extract into DuckDB, then build the search index
+         store          attach the DuckDB store file read-only (the page's path)
+         parquet-view   snapshot scanned in place
+         parquet        snapshot read into tables
+
+Each variant runs in its own interpreter (median of --runs): seconds to
+open the dataset including its search index, then ms for the first page
+query with a search, for a page filtered on the sort column (closing
+within 30 days), and resident memory added. Also the bytes on disk.
+
+    python benchmarks/bench_snapshots.py --rows 20000 --runs 3
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+VARIANTS = {
+    "nih": ("csv", "parquet", "parquet-view"),
+    "grants": ("xml", "store", "parquet-view", "parquet"),
+}
+SEARCH = "research"
+
+
+def rss_bytes():
+    with open("/proc/self/statm") as f:
+        return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+
+
+def open_dataset(conn, dataset, variant, paths):
+    from utilities import snapshots
+
+    if dataset == "nih":
+        from utilities.nih_data import SEARCH_INDEX_NAME, build_search_index, load_nih_data
+        from utilities.search_index import SearchIndex
+        if variant == "csv":
+            load_nih_data(paths["csv"], conn)
+            return build_search_index(conn)
+        snapshots.load_snapshot(conn, paths["nih_snapshot"], materialize=variant == "parquet")
+        return SearchIndex.load(conn, SEARCH_INDEX_NAME)
+
+    from utilities.grants_data import (SEARCH_FIELDS, SEARCH_INDEX_NAME, create_grants_view,
+                                       load_search_index, load_xml_into_duckdb, typed_select_sql)
+    if variant == "xml":
+        from utilities.search_index import build_postings
+        load_xml_into_duckdb(paths["xml"], conn, table="grants_raw")
+        columns = [row[0] for row in conn.execute("DESCRIBE grants_raw").fetchall()]
+        conn.execute(f"CREATE TABLE grants_typed AS SELECT {typed_select_sql(columns)} FROM grants_raw")
+        create_grants_view(conn, "grants_typed")
+        build_postings(conn, SEARCH_INDEX_NAME, "grants", "OpportunityID", SEARCH_FIELDS)
+        return load_search_index(conn)
+    if variant == "store":
+        from utilities.db_pool import _attach_grants_store
+        return _attach_grants_store(conn, paths["store"])
+    snapshots.load_grants_snapshot(conn, paths["grants_snapshot"], materialize=variant == "parquet")
+    return load_search_index(conn)
+
+
+def run_child(dataset, variant, paths):
+    import duckdb
+    from utilities.grants_data import query_grants_page
+    from utilities.nih_data import query_nih_page
+
+    # Searching needs sumy's stemmer whichever way the index was made; import it
+    # up front so that neither the open nor the first search is charged for it
+    from utilities.search_index import _analyzer
+    _analyzer("english")
+
+    conn = duckdb.connect(database=":memory:")
+    rss_before = rss_bytes()
+    start = time.perf_counter()
+    index = open_dataset(conn, dataset, variant, paths)
+    open_s = time.perf_counter() - start
+
+    if dataset == "nih":
+        search = lambda: query_nih_page(conn, title_search=SEARCH, search_index=index)
+        sorted_filter = "SELECT count(*) FROM nih WHERE Expired_Date BETWEEN current_date AND current_date + 30"
+    else:
+        search = lambda: query_grants_page(conn, description_search=SEARCH, search_index=index)
+        sorted_filter = "SELECT count(*) FROM grants WHERE CloseDate BETWEEN current_date AND current_date + 30"
+    start = time.perf_counter()
+    search()
+    search_ms = (time.perf_counter() - start) * 1000
+    start = time.perf_counter()
+    conn.execute(sorted_filter).fetchone()
+    filter_ms = (time.perf_counter() - start) * 1000
+    print(json.dumps({"open_s": open_s, "search_ms": search_ms, "filter_ms": filter_ms,
+                      "rss": rss_bytes() - rss_before}))
+
+
+def prepare(workdir, rows):
+    from benchmarks.synthetic_extract import write_extract
+    from benchmarks.synthetic_nih import write_nih_csv
+    from utilities import snapshots
+    from utilities.grants_store import build_store
+
+    paths = {
+        "csv": write_nih_csv(os.path.join(workdir, "NIH_data.csv"), rows),
+        "xml": write_extract(os.path.join(workdir, "extract.xml"), rows),
+        "nih_snapshot": os.path.join(workdir, "snapshots", "nih"),
+        "grants_snapshot": os.path.join(workdir, "snapshots", "grants"),
+    }
+    paths["store"], _ = build_store(paths["xml"], "20250101", store_dir=os.path.join(workdir, "store"),
+                                    summarize=False)
+    start = time.perf_counter()
+    snapshots.write_nih_snapshot(paths["csv"], paths["nih_snapshot"])
+    nih_s = time.perf_counter() - start
+    start = time.perf_counter()
+    snapshots.write_grants_snapshot(paths["store"], paths["grants_snapshot"])
+    grants_s = time.perf_counter() - start
+    print(f"snapshots written in {nih_s:.2f} s (NIH) and {grants_s:.2f} s (Grants.gov)")
+    return paths
+
+
+def disk_bytes(dataset, variant, paths):
+    def dir_bytes(path):
+        return sum(os.path.getsize(os.path.join(path, name)) for name in os.listdir(path))
+    if dataset == "nih":
+        return os.path.getsize(paths["csv"]) if variant == "csv" else dir_bytes(paths["nih_snapshot"])
+    if variant in ("xml", "store"):
+        return os.path.getsize(paths[variant])
+    return dir_bytes(paths["grants_snapshot"])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rows", type=int, default=20000)
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--child", nargs=3, metavar=("DATASET", "VARIANT", "PATHS"), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        dataset, variant, paths = args.child
+        run_child(dataset, variant, json.loads(paths))
+        return
+
+    with tempfile.TemporaryDirectory() as workdir:
+        paths = prepare(workdir, args.rows)
+        print(f"{'dataset':<8} {'variant':<13} {'open s':>7} {'search ms':>10} {'filter ms':>10} "
+              f"{'RSS MB':>7} {'disk MB':>8}")
+        for dataset, variants in VARIANTS.items():
+            for variant in variants:
+                results = []
+                for _ in range(args.runs):
+                    out = subprocess.run([sys.executable, __file__, "--child", dataset, variant, json.dumps(paths)],
+                                         cwd=ROOT, capture_output=True, text=True, check=True)
+                    results.append(json.loads(out.stdout.splitlines()[-1]))
+                median = {key: statistics.median(r[key] for r in results) for key in results[0]}
+                print(f"{dataset:<8} {variant:<13} {median['open_s']:7.2f} {median['search_ms']:10.1f} "
+                      f"{median['filter_ms']:10.1f} {median['rss'] / 2 ** 20:7.1f} "
+                      f"{disk_bytes(dataset, variant, paths) / 2 ** 20:8.1f}")
+
+
+if __name__ == "__main__":
+    main()
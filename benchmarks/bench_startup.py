@@ -0,0 +1,133 @@
+# benchmarks/bench_startup.py
+"""
+Startup regression check for the NIH and Grants.gov pages, from the
+profiles utilities.profiler writes with FUNDR_PROFILE set.
+
+Each page runs in a fresh interpreter with Streamlit's AppTest in a working
+directory with a synthetic Grants.gov store and NIH CSV (as bench_rerun):
+one cold run, then --reruns reruns. From the page's profile records:
+
+    cold_ms    total time of the first run
+    import_ms  time of the first run spent importing
+    rerun_ms   median total time of the reruns
+
+are compared with benchmarks/startup_budget.json; the script exits 1 if any
+is over its budget times --tolerance, or if a module the pages only need
+on demand (summarizer, HTTP, audio and AI client libraries) was imported
+by the first run. --update writes the measured values as the new budget.
+
+    python benchmarks/bench_startup.py --rows 1000 --reruns 5
+    python benchmarks/bench_startup.py --update
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+BUDGET_PATH = os.path.join(ROOT, "benchmarks", "startup_budget.json")
+METRICS = ("cold_ms", "import_ms", "rerun_ms")
+# Imported when someone summarizes a grant, fetches a page or plays audio, never on page load
+# (the NIH page stems its titles into the search index as it loads, so it needs sumy's Stemmer
+# and stop words, and sumy.utils imports requests)
+ON_DEMAND = ("streamlit_advanced_audio", "google.genai", "google.cloud.texttospeech")
+DEFERRED_MODULES = {
+    "nih": ON_DEMAND,
+    "grants": ("nltk", "sumy", "requests") + ON_DEMAND,
+}
+
+
+def run_child(page, reruns):
+    from streamlit.testing.v1 import AppTest
+    from benchmarks.bench_rerun import PAGES
+
+    at = AppTest.from_file(PAGES[page], default_timeout=600)
+    at.run()
+    if at.exception:
+        raise RuntimeError(at.exception[0].value)
+    loaded = [name for name in DEFERRED_MODULES[page] if name in sys.modules]
+    for _ in range(reruns):
+        at.run()
+    print(json.dumps({"deferred_loaded": loaded}))
+
+
+def measure(page, workdir, reruns):
+    with tempfile.TemporaryDirectory() as profile_dir:
+        env = dict(os.environ, FUNDR_PROFILE=profile_dir, PYTHONPATH=ROOT)
+        out = subprocess.run([sys.executable, os.path.abspath(__file__), "--child", page, "--reruns", str(reruns)],
+                             cwd=workdir, env=env, capture_output=True, text=True)
+        if out.returncode:
+            raise RuntimeError(f"{page} failed:\n{out.stderr}")
+        child = json.loads(out.stdout.splitlines()[-1])
+        with open(os.path.join(profile_dir, f"{page}.jsonl"), encoding="utf-8") as f:
+            records = [json.loads(line) for line in f]
+    cold, rest = records[0], records[1:]
+    return {
+        "cold_ms": cold["total_ms"],
+        "import_ms": cold["import_ms"],
+        "rerun_ms": statistics.median(r["total_ms"] for r in rest),
+        "sections": cold["sections"],
+        "top_imports": dict(list(cold["imports"].items())[:5]),
+        "deferred_loaded": child["deferred_loaded"],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--pages", default="nih,grants")
+    parser.add_argument("--rows", type=int, default=1000)
+    parser.add_argument("--reruns", type=int, default=5)
+    parser.add_argument("--budget", default=BUDGET_PATH)
+    parser.add_argument("--tolerance", type=float, default=1.5)
+    parser.add_argument("--update", action="store_true", help="Write the measured values as the budget")
+    parser.add_argument("--child", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        run_child(args.child, args.reruns)
+        return
+
+    from benchmarks.bench_rerun import prepare_workdir
+
+    budget = {}
+    if os.path.exists(args.budget):
+        with open(args.budget, encoding="utf-8") as f:
+            budget = json.load(f)
+
+    failures, measured = [], {}
+    print(f"{'page':<8} {'cold ms':>9} {'import ms':>10} {'rerun ms':>9}   budget (cold/import/rerun)")
+    with tempfile.TemporaryDirectory() as workdir:
+        prepare_workdir(workdir, args.rows)
+        for page in args.pages.split(","):
+            result = measure(page, workdir, args.reruns)
+            measured[page] = {metric: round(result[metric], 1) for metric in METRICS}
+            limits = budget.get(page, {})
+            print(f"{page:<8} {result['cold_ms']:9.1f} {result['import_ms']:10.1f} {result['rerun_ms']:9.1f}   "
+                  + "/".join(str(limits.get(metric, "-")) for metric in METRICS))
+            print(f"         sections: " + ", ".join(f"{k} {v:.1f}" for k, v in result["sections"].items()))
+            print(f"         slowest imports: " + ", ".join(f"{k} {v:.0f}" for k, v in result["top_imports"].items()))
+            for metric in METRICS:
+                if metric in limits and result[metric] > limits[metric] * args.tolerance:
+                    failures.append(f"{page} {metric} {result[metric]:.1f} ms > {limits[metric]} ms x {args.tolerance}")
+            if result["deferred_loaded"]:
+                failures.append(f"{page} imported {', '.join(result['deferred_loaded'])} on its first run")
+
+    if args.update:
+        with open(args.budget, "w", encoding="utf-8") as f:
+            json.dump(measured, f, indent=2)
+            f.write("\n")
+        print(f"budget written to {os.path.relpath(args.budget, ROOT)}")
+    elif failures:
+        print("over budget:\n  " + "\n  ".join(failures))
+        sys.exit(1)
+    else:
+        print("within budget")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+# benchmarks/bench_summarizer.py
+"""
+Per-call summary latency with the Sumy objects built on every call (as
+before) against the shared per-language objects of grant_sumy: the first
+(cold) call of a fresh process, then warm calls. The summary cache is
+disabled so every call really summarizes.
+
+    python benchmarks/bench_summarizer.py --calls 20
+"""
+import argparse
+import os
+import random
+import statistics
+import subprocess
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def per_call(text, language, sentence_count):
+    """What summarize_text did per call before the shared objects."""
+    from sumy.nlp.stemmers import Stemmer
+    from sumy.parsers.plaintext import PlaintextParser
+    from sumy.summarizers.lsa import LsaSummarizer
+    from sumy.utils import get_stop_words
+
+    from utilities.punkt_store import StoreTokenizer
+
+    parser = PlaintextParser.from_string(text, StoreTokenizer(language))
+    summarizer = LsaSummarizer(Stemmer(language))
+    summarizer.stop_words = get_stop_words(language)
+    return " ".join(str(s) for s in summarizer(parser.document, sentence_count))
+
+
+def shared(text, language, sentence_count):
+    from utilities import grant_sumy
+
+    return grant_sumy.summarize_text(text, language, sentence_count)
+
+
+PATHS = {"per-call": per_call, "shared": shared}
+
+
+def timed_ms(fn, *args):
+    start = time.perf_counter()
+    fn(*args)
+    return (time.perf_counter() - start) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--calls", type=int, default=20)
+    parser.add_argument("--sentences", type=int, default=10)
+    parser.add_argument("--path", choices=sorted(PATHS), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.path is None:
+        # Each path in its own process, so neither gets the other's imports or Punkt load
+        print(f"median of {args.calls} warm calls, one description each")
+        print(f"{'path':<10} {'cold ms':>8} {'warm ms':>8}")
+        for name in PATHS:
+            subprocess.run([sys.executable, __file__, "--path", name, "--calls", str(args.calls),
+                            "--sentences", str(args.sentences)], check=True)
+        return
+
+    from benchmarks.synthetic_extract import _description
+    from utilities import grant_sumy, summary_cache
+
+    summary_cache._cache = summary_cache.SummaryCache(path=None, max_memory=0)
+    texts = [_description(random.Random(i)) for i in range(args.calls + 1)]
+
+    fn = PATHS[args.path]
+    cold = timed_ms(fn, texts[0], "english", args.sentences)
+    warm = statistics.median(timed_ms(fn, text, "english", args.sentences) for text in texts[1:])
+    print(f"{args.path:<10} {cold:8.1f} {warm:8.1f}")
+    assert per_call(texts[1], "english", args.sentences) == shared(texts[1], "english", args.sentences)
+
+
+if __name__ == "__main__":
+    main()
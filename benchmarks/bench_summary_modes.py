@@ -0,0 +1,88 @@
+# benchmarks/bench_summary_modes.py
+"""
+Latency and overlap with LSA of every grant_sumy algorithm, on the bundled
+datasets: the NIH titles of funddb/NIH_data.csv grouped by organization and
+synthetic Grants.gov descriptions, plus documents of 50/200/1,000 sentences
+for per-sentence cost (what the COST_MS estimates "auto" uses come from).
+Parsing is excluded; the summary cache is not involved.
+
+    python benchmarks/bench_summary_modes.py --sentences 10
+"""
+import argparse
+import os
+import random
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+LENGTHS = (50, 200, 1000)
+
+
+def timed_ms(summarizer, document, sentence_count):
+    start = time.perf_counter()
+    result = summarizer(document, sentence_count)
+    return (time.perf_counter() - start) * 1000, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sentences", type=int, default=10)
+    args = parser.parse_args()
+
+    import warnings
+
+    from sumy.parsers.plaintext import PlaintextParser
+
+    from benchmarks.bench_lsa import nih_documents, parse_all
+    from benchmarks.synthetic_extract import _description, _sentence
+    from utilities.grant_sumy import (
+        AUTO, DEFAULT_BUDGET_MS, DEFAULT_LANGUAGE, SUMMARIZERS,
+        choose_algorithm, get_summarizer, get_tokenizer
+    )
+
+    # Sumy's Luhn warns on documents without significant words
+    warnings.simplefilter("ignore")
+    tokenizer = get_tokenizer(DEFAULT_LANGUAGE)
+    algorithms = list(SUMMARIZERS) + [AUTO]
+
+    def summarizer(algorithm):
+        if algorithm != AUTO:
+            return get_summarizer(DEFAULT_LANGUAGE, algorithm)
+        return lambda document, count: get_summarizer(
+            DEFAULT_LANGUAGE, choose_algorithm(len(document.sentences), DEFAULT_BUDGET_MS))(document, count)
+
+    corpora = {
+        "nih": parse_all(nih_documents(), None, tokenizer),
+        "grants": parse_all([_description(random.Random(i)) for i in range(200)], None, tokenizer),
+    }
+    print(f"median ms per document and mean overlap with LSA, {args.sentences} sentences; "
+          f"auto budget {DEFAULT_BUDGET_MS} ms")
+    print(f"{'corpus':<8} {'algorithm':<10} {'ms':>7} {'overlap':>8}")
+    for documents in corpora.values():
+        for document in documents:
+            document.words
+    for name, documents in corpora.items():
+        reference = [set(get_summarizer(DEFAULT_LANGUAGE, "lsa")(d, args.sentences)) for d in documents]
+        for algorithm in algorithms:
+            samples, overlaps = [], []
+            for document, expected in zip(documents, reference):
+                ms, result = timed_ms(summarizer(algorithm), document, args.sentences)
+                samples.append(ms)
+                overlaps.append(len(expected & set(result)) / max(len(expected), 1))
+            print(f"{name:<8} {algorithm:<10} {statistics.median(samples):7.2f} {statistics.mean(overlaps):8.3f}")
+
+    print(f"\n{'sentences':>9} " + " ".join(f"{a:>9}" for a in SUMMARIZERS) + "   ms per sentence; auto picks")
+    rng = random.Random(0)
+    for length in LENGTHS:
+        document = PlaintextParser.from_string(" ".join(_sentence(rng) for _ in range(length)), tokenizer).document
+        # Sumy tokenizes words on first access; keep that out of the first algorithm's time
+        document.words
+        per_sentence = [timed_ms(summarizer(a), document, args.sentences)[0] / length for a in SUMMARIZERS]
+        print(f"{length:9} " + " ".join(f"{ms:9.3f}" for ms in per_sentence)
+              + f"   {choose_algorithm(length, DEFAULT_BUDGET_MS)}")
+
+
+if __name__ == "__main__":
+    main()
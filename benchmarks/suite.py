@@ -0,0 +1,338 @@
+# benchmarks/suite.py
+"""
+Benchmark suite for the data and rendering paths, on synthetic data at
+several scales, with results saved as JSON to compare across commits.
+
+Each scale N builds N x --base-rows Grants.gov opportunities (a namespaced
+GrantsDBExtract, see synthetic_extract) and as many NIH opportunities (a
+CSV, see synthetic_nih). The cases are the time_* functions below, in the
+asv style: each gets the Dataset of one scale, whose inputs (connections,
+query results) are built once per scale and are not timed. Cases marked
+@fixed_size (a page of cards, a batch of summaries) do not depend on the
+dataset size and only run at the first scale.
+
+Every case is called often enough to take --min-time seconds, --repeat
+times, and the per-call seconds (min, median, mean, stdev) are written to
+benchmarks/results/<commit>.json (or --out) with the commit, machine and
+Python version. --compare prints the ratio of two result files per case
+and exits 1 if any median got slower than --threshold.
+
+    python benchmarks/suite.py --scales 1,10,100
+    python benchmarks/suite.py --scales 1 --cases query,cards --out /tmp/after.json
+    python benchmarks/suite.py --compare benchmarks/results/3f2a1c0.json /tmp/after.json
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import timeit
+from datetime import datetime, timezone
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+RESULTS_DIR = os.path.join(ROOT, "benchmarks", "results")
+SEARCH = "research"
+SUMMARY_SAMPLE = 20
+
+
+class Dataset:
+    """
+    Inputs of the cases at one scale, built on first use and kept for the scale.
+    """
+
+    def __init__(self, workdir, rows):
+        self.workdir = workdir
+        self.rows = rows
+        self._cache = {}
+
+    def _get(self, name, build):
+        if name not in self._cache:
+            self._cache[name] = build()
+        return self._cache[name]
+
+    @property
+    def xml_path(self):
+        from benchmarks.synthetic_extract import write_extract
+        return self._get("xml_path", lambda: write_extract(os.path.join(self.workdir, "extract.xml"), self.rows))
+
+    @property
+    def xml_bytes(self):
+        def read():
+            with open(self.xml_path, "rb") as f:
+                return f.read()
+        return self._get("xml_bytes", read)
+
+    @property
+    def nih_path(self):
+        from benchmarks.synthetic_nih import write_nih_csv
+        return self._get("nih_path", lambda: write_nih_csv(os.path.join(self.workdir, "NIH_data.csv"), self.rows))
+
+    @property
+    def grants_conn(self):
+        from utilities.grants_data import SEARCH_FIELDS, SEARCH_INDEX_NAME, load_data_into_duckdb_from_memory
+        from utilities.search_index import build_postings
+
+        def load():
+            conn = load_data_into_duckdb_from_memory(self.xml_bytes)
+            build_postings(conn, SEARCH_INDEX_NAME, "grants", "OpportunityID", SEARCH_FIELDS)
+            return conn
+        return self._get("grants_conn", load)
+
+    @property
+    def grants_index(self):
+        from utilities.grants_data import load_search_index
+        return self._get("grants_index", lambda: load_search_index(self.grants_conn))
+
+    @property
+    def grants_df(self):
+        from utilities.grants_data import query_grants
+        return self._get("grants_df", lambda: query_grants(self.grants_conn))
+
+    @property
+    def nih_conn(self):
+        from utilities.nih_data import load_nih_data
+        return self._get("nih_conn", lambda: load_nih_data(self.nih_path))
+
+    @property
+    def nih_index(self):
+        from utilities.nih_data import build_search_index
+        return self._get("nih_index", lambda: build_search_index(self.nih_conn))
+
+    @property
+    def nih_df(self):
+        from utilities.nih_data import query_nih_data
+        return self._get("nih_df", lambda: query_nih_data(self.nih_conn))
+
+    def close(self):
+        for name in ("grants_conn", "nih_conn"):
+            if name in self._cache:
+                self._cache[name].close()
+        self._cache.clear()
+
+
+def fixed_size(case):
+    case.fixed_size = True
+    return case
+
+
+# --- Grants.gov ---
+
+def time_parse_xml(data):
+    from utilities.grants_data import parse_xml
+    parse_xml(data.xml_path)
+
+
+def time_load_data_into_duckdb_from_memory(data):
+    from utilities.grants_data import load_data_into_duckdb_from_memory
+    load_data_into_duckdb_from_memory(data.xml_bytes).close()
+
+
+def time_query_grants(data):
+    from utilities.grants_data import query_grants
+    query_grants(data.grants_conn, description_search=SEARCH)
+
+
+def time_query_grants_ranked(data):
+    from utilities.grants_data import query_grants
+    query_grants(data.grants_conn, description_search=SEARCH, search_index=data.grants_index)
+
+
+def time_query_grants_page(data):
+    from utilities.grants_data import query_grants_page
+    query_grants_page(data.grants_conn, description_search=SEARCH, search_index=data.grants_index)
+
+
+def time_get_grant_status(data):
+    from utilities.grants_data import get_grant_status
+    for close_date in data.grants_df["CloseDate"]:
+        get_grant_status(close_date)
+
+
+def time_top_10_agencies_by_budget(data):
+    from utilities.grants_data import top_10_agencies_by_budget
+    top_10_agencies_by_budget(data.grants_df)
+
+
+def time_top_10_agencies_by_count(data):
+    from utilities.grants_data import top_10_agencies_by_count
+    top_10_agencies_by_count(data.grants_df)
+
+
+@fixed_size
+def time_render_cards_grants(data):
+    from ui.ui_gov import render_cards_grants
+    from utilities.pagination import DEFAULT_PAGE_SIZE
+    render_cards_grants(data.grants_df.head(DEFAULT_PAGE_SIZE))
+
+
+@fixed_size
+def time_summarize_text(data):
+    from utilities.grant_sumy import summarize_text
+    for description in data.grants_df["Description"].head(SUMMARY_SAMPLE):
+        summarize_text(description)
+
+
+# --- NIH ---
+
+def time_load_nih_data(data):
+    from utilities.nih_data import load_nih_data
+    load_nih_data(data.nih_path).close()
+
+
+def time_query_nih_data(data):
+    from utilities.nih_data import query_nih_data
+    query_nih_data(data.nih_conn, title_search=SEARCH, search_index=data.nih_index)
+
+
+def time_query_nih_page(data):
+    from utilities.nih_data import query_nih_page
+    query_nih_page(data.nih_conn, title_search=SEARCH, search_index=data.nih_index)
+
+
+@fixed_size
+def time_render_cards_nih(data):
+    from ui.ui_fp import render_cards_nih
+    from utilities.pagination import DEFAULT_PAGE_SIZE
+    render_cards_nih(data.nih_df.head(DEFAULT_PAGE_SIZE))
+
+
+CASES = {name[len("time_"):]: case for name, case in globals().items() if name.startswith("time_")}
+
+
+def measure(case, data, repeat, min_time):
+    """
+    Returns the per-call seconds of case(data): `repeat` samples, each the
+    mean of enough calls to take min_time.
+    """
+    timer = timeit.Timer(lambda: case(data))
+    number = 1
+    while True:
+        seconds = timer.timeit(number)
+        if seconds >= min_time:
+            break
+        number = max(number * 2, int(number * min_time / max(seconds, 1e-9) * 1.1))
+    samples = [seconds / number] + [timer.timeit(number) / number for _ in range(repeat - 1)]
+    return {
+        "number": number,
+        "repeat": repeat,
+        "min": min(samples),
+        "median": statistics.median(samples),
+        "mean": statistics.mean(samples),
+        "stdev": statistics.stdev(samples) if len(samples) > 1 else 0.0,
+    }
+
+
+def git_commit():
+    def git(*args):
+        return subprocess.run(["git", *args], cwd=ROOT, capture_output=True, text=True).stdout.strip()
+    return git("rev-parse", "--short", "HEAD") or "unknown", bool(git("status", "--porcelain", "--untracked-files=no"))
+
+
+def run(scales, base_rows, names, repeat, min_time):
+    from utilities import summary_cache
+
+    # Every summary is computed: no memory tier, no disk tier
+    summary_cache._cache = summary_cache.SummaryCache(path=None, max_memory=0)
+    results = []
+    print(f"{'case':<36} {'scale':>6} {'rows':>8} {'median':>11} {'min':>11} {'calls':>6}")
+    for i, scale in enumerate(scales):
+        rows = base_rows * scale
+        with tempfile.TemporaryDirectory() as workdir:
+            data = Dataset(workdir, rows)
+            for name in names:
+                case = CASES[name]
+                if getattr(case, "fixed_size", False) and i > 0:
+                    continue
+                case(data)  # builds the inputs the case needs, untimed
+                result = dict(case=name, scale=scale, rows=rows, **measure(case, data, repeat, min_time))
+                results.append(result)
+                print(f"{name:<36} {scale:>5}x {rows:8} {format_seconds(result['median']):>11} "
+                      f"{format_seconds(result['min']):>11} {result['number']:6}")
+            data.close()
+    return results
+
+
+def format_seconds(seconds):
+    for unit, factor in (("s", 1), ("ms", 1e3), ("us", 1e6)):
+        if seconds >= 1 / factor:
+            return f"{seconds * factor:.2f} {unit}"
+    return f"{seconds * 1e9:.0f} ns"
+
+
+def compare(old_path, new_path, threshold):
+    with open(old_path, encoding="utf-8") as f:
+        old = json.load(f)
+    with open(new_path, encoding="utf-8") as f:
+        new = json.load(f)
+    before = {(r["case"], r["scale"]): r for r in old["results"]}
+    print(f"{old['commit']} -> {new['commit']}")
+    print(f"{'case':<36} {'scale':>6} {'before':>11} {'after':>11} {'ratio':>7}")
+    regressions = []
+    for result in new["results"]:
+        key = (result["case"], result["scale"])
+        if key not in before:
+            continue
+        ratio = result["median"] / before[key]["median"]
+        flag = ""
+        if ratio > threshold:
+            flag = "  slower"
+            regressions.append(key)
+        elif ratio < 1 / threshold:
+            flag = "  faster"
+        print(f"{key[0]:<36} {key[1]:>5}x {format_seconds(before[key]['median']):>11} "
+              f"{format_seconds(result['median']):>11} {ratio:6.2f}x{flag}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--scales", default="1,10,100", help="Multiples of --base-rows")
+    parser.add_argument("--base-rows", type=int, default=1000)
+    parser.add_argument("--cases", help="Comma-separated substrings of the case names to run")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--min-time", type=float, default=0.2, help="Seconds per sample")
+    parser.add_argument("--out", help="Result file (default benchmarks/results/<commit>.json)")
+    parser.add_argument("--compare", nargs=2, metavar=("OLD", "NEW"), help="Compare two result files")
+    parser.add_argument("--threshold", type=float, default=1.2, help="Slowdown ratio reported as a regression")
+    args = parser.parse_args()
+
+    if args.compare:
+        regressions = compare(*args.compare, args.threshold)
+        if regressions:
+            print(f"{len(regressions)} cases slower than {args.threshold}x")
+            sys.exit(1)
+        return
+
+    names = list(CASES)
+    if args.cases:
+        names = [name for name in names if any(part in name for part in args.cases.split(","))]
+    scales = [int(scale) for scale in args.scales.split(",")]
+    commit, dirty = git_commit()
+    started = time.perf_counter()
+    results = run(scales, args.base_rows, names, args.repeat, args.min_time)
+    report = {
+        "commit": commit + ("-dirty" if dirty else ""),
+        "created": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpus": os.cpu_count(),
+        "base_rows": args.base_rows,
+        "seconds": round(time.perf_counter() - started, 1),
+        "results": results,
+    }
+    out = args.out or os.path.join(RESULTS_DIR, f"{report['commit']}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(out)), exist_ok=True)
+    with open(out, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+        f.write("\n")
+    print(f"{len(results)} results in {report['seconds']} s, saved to {os.path.relpath(out)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,108 @@
+# benchmarks/synthetic_extract.py
+"""
+Writes a synthetic, namespaced GrantsDBExtract XML file that looks like the
+real Grants.gov extract, for benchmarking the ingest path offline.
+
+    python benchmarks/synthetic_extract.py --rows 80000 --out /tmp/GrantsDBExtract.xml
+"""
+import argparse
+import random
+from datetime import date, timedelta
+from xml.sax.saxutils import escape
+
+NAMESPACE = "http://apply.grants.gov/system/OpportunityDetail-V1.0"
+
+AGENCIES = [
+    ("HHS-NIH11", "National Institutes of Health"),
+    ("NSF", "U.S. National Science Foundation"),
+    ("DOE", "Department of Energy"),
+    ("DOD", "Department of Defense"),
+    ("NASA", "National Aeronautics and Space Administration"),
+    ("USDA", "Department of Agriculture"),
+    ("DOC", "Department of Commerce"),
+    ("ED", "Department of Education"),
+    ("EPA", "Environmental Protection Agency"),
+    ("DOI", "Department of the Interior"),
+    ("DOS", "Department of State"),
+    ("HHS-CDC", "Centers for Disease Control and Prevention"),
+]
+
+WORDS = (
+    "research program funding applicants award project community health science "
+    "education training support development data innovation energy climate "
+    "infrastructure evaluation outcomes partnership capacity technical assistance "
+    "eligible organizations proposals budget period review criteria national "
+    "regional rural tribal institutions students clinical trial prevention services"
+).split()
+
+
+def _sentence(rng):
+    words = rng.sample(WORDS, rng.randint(8, 18))
+    return " ".join(words).capitalize() + "."
+
+
+def _description(rng):
+    return " ".join(_sentence(rng) for _ in range(rng.randint(4, 30)))
+
+
+def _date(rng, base, spread_days):
+    return (base + timedelta(days=rng.randint(-spread_days, spread_days))).strftime("%m%d%Y")
+
+
+def _opportunity(rng, opp_id, today):
+    code, agency = rng.choice(AGENCIES)
+    kind = "OpportunitySynopsisDetail_1_0" if rng.random() < 0.8 else "OpportunityForecastDetail_1_0"
+    fields = [
+        ("OpportunityID", str(opp_id)),
+        ("OpportunityTitle", " ".join(rng.sample(WORDS, rng.randint(4, 10))).title()),
+        ("OpportunityNumber", f"{code}-{today.year % 100}-{opp_id % 1000:03d}"),
+        ("OpportunityCategory", rng.choice("DCEO")),
+        ("FundingInstrumentType", rng.choice(["G", "CA", "PC"])),
+        ("CategoryOfFundingActivity", rng.choice(["ST", "HL", "ED", "EN", "ENV"])),
+    ]
+    fields += [("CFDANumbers", f"{rng.randint(10, 99)}.{rng.randint(100, 999)}") for _ in range(rng.randint(1, 3))]
+    fields += [("EligibleApplicants", f"{rng.randint(0, 25):02d}") for _ in range(rng.randint(1, 4))]
+    fields += [
+        ("AgencyCode", code),
+        ("AgencyName", agency),
+        ("PostDate", _date(rng, today, 365)),
+        ("LastUpdatedDate", _date(rng, today, 30)),
+        ("AwardCeiling", str(rng.choice([0, 50000, 250000, 1000000, 5000000]))),
+        ("AwardFloor", str(rng.choice([0, 10000, 50000]))),
+        ("EstimatedTotalProgramFunding", str(rng.randint(0, 500) * 100000)),
+        ("ExpectedNumberOfAwards", str(rng.randint(1, 40))),
+        ("Description", _description(rng)),
+        ("Version", f"Synopsis {rng.randint(1, 5)}"),
+        ("CostSharingOrMatchingRequirement", rng.choice(["Yes", "No"])),
+        ("AdditionalInformationURL", f"https://www.grants.gov/search-results-detail/{opp_id}"),
+        ("GrantorContactEmail", f"grants{opp_id % 97}@example.gov"),
+    ]
+    if rng.random() < 0.9:
+        fields.append(("CloseDate", _date(rng, today, 180)))
+    body = "".join(f"<{tag}>{escape(value)}</{tag}>" for tag, value in fields)
+    return f"<{kind}>{body}</{kind}>\n"
+
+
+def write_extract(path, rows, seed=0, today=None):
+    """
+    Writes a synthetic extract with `rows` opportunities to `path`.
+    """
+    rng = random.Random(seed)
+    today = today or date.today()
+    with open(path, "w", encoding="utf-8") as out:
+        out.write('<?xml version="1.0" encoding="UTF-8"?>\n')
+        out.write(f'<Grants xmlns="{NAMESPACE}">\n')
+        for i in range(rows):
+            out.write(_opportunity(rng, 300000 + i, today))
+        out.write("</Grants>\n")
+    return path
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rows", type=int, default=10000)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--out", default="GrantsDBExtract_synthetic.xml")
+    args = parser.parse_args()
+    write_extract(args.out, args.rows, seed=args.seed)
+    print(f"Wrote {args.rows} opportunities to {args.out}")
@@ -0,0 +1,94 @@
+# benchmarks/synthetic_nih.py
+"""
+Writes a synthetic NIH funding-opportunity CSV with the columns, quoting
+and value mix of funddb/NIH_data.csv, at any size, for benchmarking the
+NIH page offline.
+
+    python benchmarks/synthetic_nih.py --rows 100000 --out /tmp/NIH_data.csv
+"""
+import argparse
+import csv
+import random
+from datetime import date, timedelta
+
+FIELDNAMES = ["Title", "Release_Date", "Expired_Date", "Activity_Code", "Parent_Organization",
+              "Organization", "Participating_Orgs", "Document_Number", "Document_Type",
+              "Clinical_Trials", "URL"]
+
+# Weighted like the bundled CSV
+ACTIVITY_CODES = (["R01"] * 8 + ["R21"] * 3 + ["U01", "R03", "R61/R33", "UG3/UH3", "R21,R01",
+                                                "Admin Supp", "K99/R00", "P50", "R25", "T32"])
+PARENT_ORGS = ["NIH"] * 40 + ["AHRQ", "CDC", "FDA"]
+ORGANIZATIONS = ["NCI", "NIMH", "NIDA", "NIAID", "NINDS", "NHLBI", "NIH", "NIA", "NIDDK",
+                 "NICHD", "NIAAA", "NIEHS", "NIGMS", "NEI", "NIDCR", "OBSSR"]
+DOCUMENT_TYPES = ["PAR"] * 9 + ["NOSIS"] * 6 + ["RFA"] * 3 + ["PA"] * 2 + ["PAS"]
+CLINICAL_TRIALS = ["Optional"] * 9 + ["Not_Allowed"] * 7 + ["Required"] * 2 + ["Basic_Trial"]
+CLINICAL_TRIAL_TITLES = {
+    "Optional": "Clinical Trial Optional",
+    "Not_Allowed": "Clinical Trial Not Allowed",
+    "Required": "Clinical Trial Required",
+    "Basic_Trial": "Basic Experimental Studies with Humans Required",
+}
+URL_DIRS = {"RFA": "rfa-files", "PAR": "pa-files", "PA": "pa-files", "PAS": "pa-files", "NOSIS": "notice-files"}
+
+WORDS = (
+    "research cancer health disease clinical translational mechanisms prevention treatment "
+    "early stage investigators innovative approaches behavioral social sciences genomic "
+    "data infrastructure neuroscience aging substance use mental outcomes disparities "
+    "populations technology development collaborative network centers training career "
+    "pilot studies therapeutics diagnostics immunology infectious chronic pain"
+).split()
+
+
+def _date(value):
+    return f"{value.month}/{value.day}/{value.year}"
+
+
+def _row(rng, i, today):
+    activity = rng.choice(ACTIVITY_CODES)
+    trials = rng.choice(CLINICAL_TRIALS)
+    doc_type = rng.choice(DOCUMENT_TYPES)
+    org = rng.choice(ORGANIZATIONS)
+    title = " ".join(rng.sample(WORDS, rng.randint(5, 12))).title()
+    released = today - timedelta(days=rng.randint(0, 3 * 365))
+    expires = released + timedelta(days=rng.randint(30, 3 * 365))
+    prefix = "NOT" if doc_type == "NOSIS" else doc_type.rstrip("S")
+    number = f"{prefix}-{org[-2:]}-{released.year % 100}-{i:06d}"
+    participating = "None" if rng.random() < 0.65 else ", ".join(sorted(rng.sample(ORGANIZATIONS, rng.randint(1, 8))))
+    return {
+        "Title": f"{title} ({activity} {CLINICAL_TRIAL_TITLES[trials]})",
+        "Release_Date": _date(released),
+        "Expired_Date": _date(expires),
+        "Activity_Code": activity,
+        "Parent_Organization": rng.choice(PARENT_ORGS),
+        "Organization": org,
+        "Participating_Orgs": participating,
+        "Document_Number": number,
+        "Document_Type": doc_type,
+        "Clinical_Trials": trials,
+        "URL": f"https://grants.nih.gov/grants/guide/{URL_DIRS[doc_type]}/{number}.html",
+    }
+
+
+def write_nih_csv(path, rows, seed=0, today=None):
+    """
+    Writes a synthetic NIH CSV with `rows` opportunities (unique Document_Number) to `path`.
+    """
+    rng = random.Random(seed)
+    today = today or date.today()
+    with open(path, "w", newline="", encoding="utf-8") as out:
+        writer = csv.DictWriter(out, fieldnames=FIELDNAMES, quoting=csv.QUOTE_ALL)
+        writer.writeheader()
+        for i in range(rows):
+            writer.writerow(_row(rng, i, today))
+    return path
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rows", type=int, default=1000)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--out", default="NIH_data_synthetic.csv")
+    args = parser.parse_args()
+    write_nih_csv(args.out, args.rows, seed=args.seed)
+    print(f"Wrote {args.rows} opportunities to {args.out}")
@@ -1,20 +1,34 @@
 # pages/fundr.py
 
+# Started first, so FUNDR_PROFILE runs also record the imports below
+from utilities.profiler import start_run
+profile = start_run("nih")
+
 import streamlit as st
 import os
-import pandas as pd
-from utilities.nih_data import load_nih_data, query_nih_data, get_unique_values as get_unique_values_nih
-from ui.ui_fp import render_banner_nih, render_card_nih, render_cards_grid
+from utilities.db_pool import get_pool
+from utilities.nih_data import query_nih_page, get_unique_values as get_unique_values_nih
+from utilities.pagination import (
+    DEFAULT_PAGE_SIZE,
+    PAGE_SIZE_OPTIONS,
+    current_cursor,
+    first_page,
+    first_row,
+    next_page,
+    page_state,
+    previous_page
+)
+from ui.ui_format import render_cards_grid_html
+from ui.ui_fp import render_banner_nih, render_cards_nih
+from ui.ui_metrics import render_metrics_panel
+from ui.ui_podcast import render_podcast_job
 
 # --- Import our podcast generation function ---
-from utilities.ai_podcast import generate_podcast_audio
+from utilities.ai_podcast import submit_podcast
 
-# --- Imports for Sumy summarization ---
-from sumy.parsers.html import HtmlParser
-from sumy.nlp.tokenizers import Tokenizer
-from sumy.summarizers.lsa import LsaSummarizer as Summarizer
-from sumy.nlp.stemmers import Stemmer
-from sumy.utils import get_stop_words
+# --- Cached Sumy summarization of the funding opportunity pages ---
+from utilities import http_fetch
+from utilities.grant_sumy import SUMMARY_MODES, summarize_html, summarize_url
 
 st.set_page_config(page_title="Fundr - NIH Dashboard", layout="wide")
 
@@ -46,21 +60,21 @@ NIH_FILE_PATH = os.path.join("funddb", "NIH_data.csv")
 
 st.title("Fundr: NIH Dashboard")
 
-# Load NIH data (cached in session state)
-if "duck_conn_nih" not in st.session_state:
-    st.session_state["duck_conn_nih"] = load_nih_data(NIH_FILE_PATH)
-conn = st.session_state["duck_conn_nih"]
+# Load NIH data once per process; every session queries it through pooled cursors
+pool = get_pool()
+with profile.section("data load"):
+    pool.ensure_nih(NIH_FILE_PATH)
 
 # NIH search filters
 title_search = st.sidebar.text_input("Search Title")
 release_date_search = st.sidebar.text_input("Search Release Date")
 activity_code_search = st.sidebar.text_input("Search Activity Code")
-description_search = st.sidebar.text_input("Search Description")
 
 try:
-    parent_orgs = ['All'] + get_unique_values_nih(conn, "Parent_Organization")
-    organizations = ['All'] + get_unique_values_nih(conn, "Organization")
-    document_types = ['All'] + get_unique_values_nih(conn, "Document_Type")
+    with pool.cursor() as conn:
+        parent_orgs = ['All'] + get_unique_values_nih(conn, "Parent_Organization")
+        organizations = ['All'] + get_unique_values_nih(conn, "Organization")
+        document_types = ['All'] + get_unique_values_nih(conn, "Document_Type")
 except Exception as e:
     st.error(f"Error loading filter options: {e}")
     parent_orgs = ['All']
@@ -70,28 +84,42 @@ except Exception as e:
 parent_org_filter = st.sidebar.selectbox("Filter by Parent Organization", options=parent_orgs)
 organization_filter = st.sidebar.selectbox("Filter by Organization", options=organizations)
 document_type_filter = st.sidebar.selectbox("Filter by Document Type", options=document_types)
+page_size = st.sidebar.selectbox("Results per page", PAGE_SIZE_OPTIONS,
+                                 index=PAGE_SIZE_OPTIONS.index(DEFAULT_PAGE_SIZE))
 
-df = query_nih_data(
-    conn,
+# Only the current page is fetched and rendered; totals come from the same query
+search_args = dict(
     title_search=title_search,
     release_date_search=release_date_search,
     activity_code_search=activity_code_search,
     parent_org_filter=parent_org_filter,
     organization_filter=organization_filter,
-    document_type_filter=document_type_filter  # <-- Use the single selected value
+    document_type_filter=document_type_filter,  # <-- Use the single selected value
 )
-
-# Filter by description after the query, if provided
-if description_search and "Description" in df.columns:
-    df = df[df["Description"].str.contains(description_search, case=False, na=False)]
+pager = page_state(st.session_state, "nih_pages", repr(sorted(search_args.items())), page_size)
+with profile.section("query"), pool.cursor() as conn:
+    result = query_nih_page(conn, after=current_cursor(pager), page_size=page_size,
+                            search_index=pool.get("nih"), **search_args)
+    if result["page"].empty and current_cursor(pager) is not None:
+        first_page(pager)
+        result = query_nih_page(conn, page_size=page_size, search_index=pool.get("nih"), **search_args)
 
 # --- Build banner (scorecard) for NIH ---
-total_docs = len(df)
-unique_orgs = len(df['Organization'].dropna().unique())
-unique_activity = len(df['Activity_Code'].dropna().unique())
-banner_html = render_banner_nih(total_docs, unique_orgs, unique_activity)
+total_docs = result["total"]
+banner_html = render_banner_nih(total_docs, result["unique_orgs"], result["unique_activity"])
 st.markdown(banner_html, unsafe_allow_html=True)
 
+# --- Pagination ---
+col1, col2 = st.columns(2)
+col1.button("Previous Page", on_click=previous_page, args=(pager,), disabled=current_cursor(pager) is None)
+col2.button("Next Page", on_click=next_page, args=(pager, result["next_cursor"]),
+            disabled=result["next_cursor"] is None)
+
+start_idx = first_row(pager)
+df = result["page"]
+df.index = range(start_idx, start_idx + len(df))
+st.write(f"Showing results {start_idx+1} - {start_idx + len(df)} of {total_docs} total.")
+
 # --- Additional CSS for 100% width audio container ---
 st.markdown(
     """
@@ -107,86 +135,82 @@ st.markdown(
     unsafe_allow_html=True
 )
 
-# --- Generate and render cards for each NIH record with added functionality ---
-cards = [render_card_nih(row) for _, row in df.iterrows()]
-grid = render_cards_grid(cards, cards_per_row=3)
-
-for row_cards, idx in zip(grid, range(0, len(df), 3)):
-    cols = st.columns(len(row_cards))
-    for col, card_html, real_index in zip(cols, row_cards, df.index[idx: idx+len(row_cards)]):
-        with col:
-            st.markdown(card_html, unsafe_allow_html=True)
-            # Fetch the URL from the 'URL' column for summarization.
-            url = df.loc[real_index, "URL"] if "URL" in df.columns else ""
-            expand_key = f"desc_expanded_{real_index}"
-            if expand_key not in st.session_state:
-                st.session_state[expand_key] = False
-
-            bcol1, bcol2, bcol3 = st.columns(3)
-            with bcol1:
-                if st.button("Summarize", key=f"summarize_{real_index}"):
-                    LANGUAGE = "english"
-                    SENTENCES_COUNT = 10
-                    try:
-                        if not url:
-                            st.error("No URL provided for summarization.")
-                        else:
-                            parser = HtmlParser.from_url(url, Tokenizer(LANGUAGE))
-                            stemmer = Stemmer(LANGUAGE)
-                            summarizer = Summarizer(stemmer)
-                            summarizer.stop_words = get_stop_words(LANGUAGE)
-                            summary_sentences = []
-                            for sentence in summarizer(parser.document, SENTENCES_COUNT):
-                                summary_sentences.append(str(sentence))
-                            summary_text = " ".join(summary_sentences)
-                            st.write("**Summary:**", summary_text)
-                    except Exception as e:
-                        st.error(f"Error during summarization: {e}")
-            with bcol2:
-                if not st.session_state[expand_key]:
-                    if len(url) > 400:
-                        if st.button("Expand", key=f"expand_button_{real_index}"):
-                            st.session_state[expand_key] = True
+# --- One card grid for the page; the actions below work on the selected record ---
+with profile.section("render"):
+    st.markdown(render_cards_grid_html(render_cards_nih(df), cards_per_row=3), unsafe_allow_html=True)
+
+if not df.empty:
+    real_index = st.selectbox(
+        "Selected funding opportunity",
+        df.index,
+        format_func=lambda i: f"{i + 1}. {df.loc[i, 'Title']}",
+        index=None,
+        placeholder="Choose a funding opportunity to preview it",
+    )
+    if real_index is not None:
+        # Fetch the URL from the 'URL' column for summarization.
+        url = df.loc[real_index, "URL"] if "URL" in df.columns else ""
+        expand_key = f"desc_expanded_{real_index}"
+        if expand_key not in st.session_state:
+            st.session_state[expand_key] = False
+
+        # A fast preview of the selection if its announcement is cached (no fetch
+        # while browsing); Summarize fetches it and gives the quality summary
+        cached_page = http_fetch.cached(url) if url else None
+        if cached_page is not None:
+            with profile.section("summarize"):
+                preview = summarize_html(cached_page["content"], url, **SUMMARY_MODES["preview"])
+            st.write("**Preview:**", preview)
+
+        bcol1, bcol2, bcol3 = st.columns(3)
+        with bcol1:
+            if st.button("Summarize", key=f"summarize_{real_index}"):
+                try:
+                    if not url:
+                        st.error("No URL provided for summarization.")
+                    else:
+                        with profile.section("summarize"):
+                            summary_text = summarize_url(url, **SUMMARY_MODES["quality"])
+                        st.write("**Summary:**", summary_text)
+                except Exception as e:
+                    st.error(f"Error during summarization: {e}")
+        with bcol2:
+            if not st.session_state[expand_key]:
+                if len(url) > 400:
+                    if st.button("Expand", key=f"expand_button_{real_index}"):
+                        st.session_state[expand_key] = True
+            else:
+                st.write("**URL:**")
+                st.write(url)
+        with bcol3:
+            # The job summarizes the announcement and generates the podcast in the background
+            row_dict = df.loc[real_index].to_dict()
+            job_key = f"podcast_job_{row_dict['Document_Number']}"
+            submit = lambda: submit_podcast(row_dict, summary_url=url)
+            if st.button("FundrAI", key=f"fundrai_{real_index}"):
+                if not url:
+                    st.error("No URL provided for summarization.")
                 else:
-                    st.write("**URL:**")
-                    st.write(url)
-            with bcol3:
-                if st.button("FundrAI", key=f"fundrai_{real_index}"):
-                    try:
-                        LANGUAGE = "english"
-                        SENTENCES_COUNT = 10
-                        if not url:
-                            st.error("No URL provided for summarization.")
-                        else:
-                            # Generate summary text from the URL using Sumy.
-                            parser = HtmlParser.from_url(url, Tokenizer(LANGUAGE))
-                            stemmer = Stemmer(LANGUAGE)
-                            summarizer = Summarizer(stemmer)
-                            summarizer.stop_words = get_stop_words(LANGUAGE)
-                            summary_sentences = []
-                            for sentence in summarizer(parser.document, SENTENCES_COUNT):
-                                summary_sentences.append(str(sentence))
-                            summary_text = " ".join(summary_sentences)
-                            
-                            row_dict = df.loc[real_index].to_dict()
-                            # Pass the generated summary_text to the podcast generator.
-                            audio_content = generate_podcast_audio(row_dict, summary_text=summary_text)
-                            st.session_state[f'audio_{real_index}'] = audio_content
-                            st.success("Podcast generated successfully!")
-                    except Exception as e:
-                        st.error(f"Error generating audio: {e}")
-                if f'audio_{real_index}' in st.session_state:
-                    audio_content = st.session_state[f'audio_{real_index}']
-                    st.audio(audio_content, format='audio/wav')
+                    st.session_state[job_key] = submit()
+            if job_key in st.session_state:
+                render_podcast_job(job_key, submit)
+
+    if st.button("FundrAI for this page", key="fundrai_page"):
+        queued = 0
+        for _, page_row in df.iterrows():
+            if page_row.get("URL"):
+                page_row = page_row.to_dict()
+                st.session_state[f"podcast_job_{page_row['Document_Number']}"] = submit_podcast(
+                    page_row, summary_url=page_row["URL"])
+                queued += 1
+        st.success(f"Queued {queued} podcasts; select a funding opportunity to follow its progress.")
+
+render_metrics_panel()
 
 # --- Reset Database button ---
 if st.sidebar.button("Reset Database"):
-    if "duck_conn_nih" in st.session_state:
-        del st.session_state["duck_conn_nih"]
-    try:
-        st.experimental_rerun()
-    except Exception:
-        st.write("Reset complete. Please refresh the page.")
+    pool.reset("nih")
+    first_page(pager)
+    st.rerun()
 
-if 'audio_{real_index}' in st.session_state:
-    st.balloons()
+profile.finish(rows=len(df), total=int(total_docs))
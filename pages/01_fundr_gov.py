@@ -1,26 +1,30 @@
+# Started first, so FUNDR_PROFILE runs also record the imports below
+from utilities.profiler import start_run
+profile = start_run("grants")
+
 import streamlit as st
 import os
-import pandas as pd
-from datetime import datetime, date
-import tempfile  # For persistent temporary audio file storage
 
 # Import summarize_text from grant_sumy, not from grants_data
-from utilities.grant_sumy import summarize_text
-from utilities.grants_data import (
-    download_and_extract_xml,
-    load_data_into_duckdb_from_memory,  # note new function
-    query_grants,
-    get_grant_status,
-    top_10_agencies_by_budget,
-    top_10_agencies_by_count
+from utilities.grant_sumy import SUMMARY_MODES, summarize_text
+from utilities.grants_data import query_grants_page
+from utilities.db_pool import get_pool
+from utilities.summary_pipeline import get_precomputed_summary
+from utilities.pagination import (
+    DEFAULT_PAGE_SIZE,
+    PAGE_SIZE_OPTIONS,
+    current_cursor,
+    first_page,
+    first_row,
+    next_page,
+    page_state,
+    previous_page
 )
-from utilities.ai_podcast import generate_podcast_audio
-from ui.ui_gov import render_banner_grants, render_card_grants, render_cards_grid
-
-from streamlit_advanced_audio import audix, WaveSurferOptions
-import requests
-import zipfile
-import io
+from utilities.ai_podcast import cached_podcast_path, submit_podcast
+from ui.ui_format import render_cards_grid_html
+from ui.ui_gov import render_banner_grants, render_cards_grants
+from ui.ui_metrics import render_metrics_panel
+from ui.ui_podcast import render_podcast_job
 
 st.set_page_config(page_title="Fundr - Grants.Gov Dashboard", layout="wide")
 
@@ -37,46 +41,28 @@ local_css("style.css")
 
 st.title("Fundr: Grants.Gov Dashboard")
 
-# 1) Download XML data in memory if not in session_state
-if "grants_xml_data" not in st.session_state:
-    st.session_state["grants_xml_data"] = download_and_extract_xml(st)
-
-if not st.session_state["grants_xml_data"]:
-    st.error("No XML data found from the URL.")
+# 1) Attach the latest on-disk store to the process-wide database (built on first use)
+pool = get_pool()
+try:
+    with profile.section("data load"):
+        pool.ensure_grants()
+except Exception as e:
+    st.error(f"Could not load the Grants.gov database: {e}")
     st.stop()
 
-# 2) Load or reuse the database connection
-if "grants_conn" not in st.session_state:
-    st.session_state["grants_conn"] = load_data_into_duckdb_from_memory(st.session_state["grants_xml_data"])
-
-conn = st.session_state["grants_conn"]
-
 # --- SIDEBAR FILTERS ---
-title_search = st.sidebar.text_input("Search Title (contains)", "")
+title_search = st.sidebar.text_input("Search Title", "")
 id_search = st.sidebar.text_input("Search ID (contains)", "")
 number_search = st.sidebar.text_input("Search Number (contains)", "")
 agency_search = st.sidebar.text_input("Search Agency (contains)", "")
-description_search = st.sidebar.text_input("Search Description (contains)", "")
+description_search = st.sidebar.text_input("Search Title, Description and Agency", "")
 
 status_options = ["Active", "Retired", "No close date", "All"]
 status_choice = st.sidebar.selectbox("Status", status_options, index=0)
 
-# 3) Query data
-df_all = query_grants(
-    conn,
-    title_search=title_search,
-    id_search=id_search,
-    number_search=number_search,
-    agency_search=agency_search,
-    description_search=description_search
-)
-
-# 4) Filter by Active/Retired
-df_all["GrantStatus"] = df_all["CloseDate"].apply(get_grant_status)
-if status_choice != "All":
-    df_all = df_all[df_all["GrantStatus"] == status_choice].copy()
-
-# 5) Top 10 logic
+# 2) Top 10 and pagination state
+page_size = st.sidebar.selectbox("Results per page", PAGE_SIZE_OPTIONS,
+                                 index=PAGE_SIZE_OPTIONS.index(DEFAULT_PAGE_SIZE))
 if "top_10_mode" not in st.session_state:
     st.session_state["top_10_mode"] = None
 if "selected_top_10_agencies" not in st.session_state:
@@ -90,73 +76,60 @@ if colB.button("Number: Top 10"):
     st.session_state["top_10_mode"] = "number"
     st.session_state["selected_top_10_agencies"] = []
 
+# 3) Query the page, banner totals and top 10 lists in one pass through a pooled cursor
+search_args = dict(
+    title_search=title_search,
+    id_search=id_search,
+    number_search=number_search,
+    agency_search=agency_search,
+    description_search=description_search,
+    status=status_choice,
+    agencies=list(st.session_state["selected_top_10_agencies"]),
+)
+pager = page_state(st.session_state, "grants_pages", repr(sorted(search_args.items())), page_size)
+with profile.section("query"), pool.cursor() as conn:
+    result = query_grants_page(conn, after=current_cursor(pager), page_size=page_size,
+                               search_index=pool.get("grants"), **search_args)
+    if result["page"].empty and current_cursor(pager) is not None:
+        first_page(pager)
+        result = query_grants_page(conn, page_size=page_size, search_index=pool.get("grants"), **search_args)
+total_opps = result["total"]
+
+# 5) Top 10 logic
 top_10_agencies = []
 if st.session_state["top_10_mode"] == "budget":
-    top_df = top_10_agencies_by_budget(df_all)
-    top_10_agencies = top_df["AgencyName"].tolist()
+    top_10_agencies = result["top_by_budget"]
 elif st.session_state["top_10_mode"] == "number":
-    freq_df = top_10_agencies_by_count(df_all)
-    top_10_agencies = freq_df["AgencyName"].tolist()
+    top_10_agencies = result["top_by_count"]
 
 if top_10_agencies:
-    chosen = st.multiselect(
+    st.session_state["selected_top_10_agencies"] = [
+        agency for agency in st.session_state["selected_top_10_agencies"] if agency in top_10_agencies
+    ]
+    st.multiselect(
         "Select any agencies to filter by:",
         top_10_agencies,
-        default=st.session_state["selected_top_10_agencies"]
+        key="selected_top_10_agencies"
     )
-    st.session_state["selected_top_10_agencies"] = chosen
-
-if st.session_state["selected_top_10_agencies"]:
-    df_all = df_all[df_all["AgencyName"].isin(st.session_state["selected_top_10_agencies"])].copy()
 
 # 6) Banner
-total_opps = len(df_all)
-df_all["EstimatedTotalProgramFunding"] = pd.to_numeric(df_all["EstimatedTotalProgramFunding"], errors='coerce')
-sum_funding = df_all["EstimatedTotalProgramFunding"].fillna(0).sum()
+sum_funding = result["total_funding"]
 total_budget_str = f"${sum_funding:,.0f}" if sum_funding else ""
-unique_agencies = df_all["AgencyName"].nunique(dropna=True) if "AgencyName" in df_all.columns else 0
-banner_html = render_banner_grants(total_opps, unique_agencies, total_budget_str)
+banner_html = render_banner_grants(total_opps, result["unique_agencies"], total_budget_str)
 st.markdown(banner_html, unsafe_allow_html=True)
 
 # 7) Pagination
-PAGE_SIZE = 50
-if "page_number" not in st.session_state:
-    st.session_state.page_number = 0
-
 col1, col2 = st.columns(2)
-if col1.button("Previous Page"):
-    st.session_state.page_number = max(0, st.session_state.page_number - 1)
-if col2.button("Next Page"):
-    if (st.session_state.page_number + 1) * PAGE_SIZE < len(df_all):
-        st.session_state.page_number += 1
-
-start_idx = st.session_state.page_number * PAGE_SIZE
-end_idx = start_idx + PAGE_SIZE
+col1.button("Previous Page", on_click=previous_page, args=(pager,), disabled=current_cursor(pager) is None)
+col2.button("Next Page", on_click=next_page, args=(pager, result["next_cursor"]),
+            disabled=result["next_cursor"] is None)
 
-if start_idx >= len(df_all):
-    st.session_state.page_number = 0
-    start_idx = 0
-    end_idx = PAGE_SIZE
-
-df_page = df_all.iloc[start_idx:end_idx]
-st.write(f"Showing results {start_idx+1} - {min(end_idx, len(df_all))} of {len(df_all)} total.")
+start_idx = first_row(pager)
+df_page = result["page"]
+df_page.index = range(start_idx, start_idx + len(df_page))
+st.write(f"Showing results {start_idx+1} - {start_idx + len(df_page)} of {total_opps} total.")
 
 # 8) Render cards & Summaries
-cards = []
-for i, row in df_page.iterrows():
-    card_html = render_card_grants(row)
-    cards.append(card_html)
-
-grid = render_cards_grid(cards, cards_per_row=3)
-
-wave_options = WaveSurferOptions(
-    wave_color="#2B88D9",
-    progress_color="#b91d47",
-    height=120,
-    bar_width=2,
-    bar_gap=1
-)
-
 st.markdown(
     """
     <style>
@@ -171,53 +144,75 @@ st.markdown(
     unsafe_allow_html=True
 )
 
-for row_cards, idxs in zip(grid, range(0, len(df_page), 3)):
-    cols = st.columns(len(row_cards))
-    for col, card_html, real_index in zip(cols, row_cards, df_page.index[idxs:idxs+len(row_cards)]):
-        with col:
-            st.markdown(card_html, unsafe_allow_html=True)
-            full_description = df_page.loc[real_index, "Description"] or ""
-            expand_key = f"desc_expanded_{real_index}"
-            if expand_key not in st.session_state:
-                st.session_state[expand_key] = False
-
-            # Summarize, Expand, FundrAI
-            bcol1, bcol2, bcol3 = st.columns(3)
-
-            with bcol1:
-                if st.button("Summarize", key=f"summarize_{real_index}"):
-                    summary = summarize_text(full_description, sentence_count=10)
-                    st.write("**Summary:**", summary)
-
-            with bcol2:
-                if not st.session_state[expand_key]:
-                    if len(full_description) > 400:
-                        if st.button("Expand", key=f"expand_button_{real_index}"):
-                            st.session_state[expand_key] = True
-                else:
-                    st.write("**Full Description:**")
-                    st.write(full_description)
-
-            with bcol3:
-                if st.button("FundrAI", key=f"fundrai_{real_index}"):
-                    try:
-                        row_dict = df_page.loc[real_index].to_dict()
-                        audio_content = generate_podcast_audio(row_dict)
-                        st.session_state[f'audio_{real_index}'] = audio_content
-                        st.success("Podcast generated successfully!")
-                    except Exception as e:
-                        st.error(f"Error generating audio: {e}")
-
-                if f'audio_{real_index}' in st.session_state:
-                    audio_content = st.session_state[f'audio_{real_index}']
-                    st.audio(audio_content, format='audio/wav')
-
-# 9) Reset Database
+# One card grid for the whole page; the actions work on the selected opportunity
+with profile.section("render"):
+    st.markdown(render_cards_grid_html(render_cards_grants(df_page), cards_per_row=3), unsafe_allow_html=True)
+
+if not df_page.empty:
+    real_index = st.selectbox(
+        "Selected opportunity",
+        df_page.index,
+        format_func=lambda i: f"{i + 1}. {df_page.loc[i, 'OpportunityTitle']}",
+        index=None,
+        placeholder="Choose an opportunity to preview it",
+    )
+    if real_index is not None:
+        full_description = df_page.loc[real_index, "Description"] or ""
+        expand_key = f"desc_expanded_{real_index}"
+        if expand_key not in st.session_state:
+            st.session_state[expand_key] = False
+
+        # A fast preview of the selection; Summarize gives the quality summary
+        with profile.section("summarize"):
+            preview = summarize_text(full_description, **SUMMARY_MODES["preview"])
+        st.write("**Preview:**", preview)
+
+        # Summarize, Expand, FundrAI
+        bcol1, bcol2, bcol3 = st.columns(3)
+
+        with bcol1:
+            if st.button("Summarize", key=f"summarize_{real_index}"):
+                with profile.section("summarize"):
+                    # Precomputed when the store was built; summarize now if it is missing or stale
+                    opportunity_id = df_page.loc[real_index, "OpportunityID"]
+                    with pool.cursor() as conn:
+                        summary = get_precomputed_summary(conn, opportunity_id, full_description, sentence_count=10)
+                    if summary is None:
+                        summary = summarize_text(full_description, **SUMMARY_MODES["quality"])
+                st.write("**Summary:**", summary)
+
+        with bcol2:
+            if not st.session_state[expand_key]:
+                if len(full_description) > 400:
+                    if st.button("Expand", key=f"expand_button_{real_index}"):
+                        st.session_state[expand_key] = True
+            else:
+                st.write("**Full Description:**")
+                st.write(full_description)
+
+        with bcol3:
+            # Podcasts are generated in the background; the job id is kept per opportunity
+            row_dict = df_page.loc[real_index].to_dict()
+            job_key = f"podcast_job_{row_dict['OpportunityID']}"
+            if st.button("FundrAI", key=f"fundrai_{real_index}"):
+                st.session_state[job_key] = submit_podcast(row_dict)
+            if job_key in st.session_state:
+                render_podcast_job(job_key, lambda: submit_podcast(row_dict), lambda: cached_podcast_path(row_dict))
+
+    if st.button("FundrAI for this page", key="fundrai_page"):
+        for _, page_row in df_page.iterrows():
+            page_row = page_row.to_dict()
+            st.session_state[f"podcast_job_{page_row['OpportunityID']}"] = submit_podcast(page_row)
+        st.success(f"Queued {len(df_page)} podcasts; select an opportunity to follow its progress.")
+
+# 9) Metrics panel
+render_metrics_panel()
+
+# 10) Reset Database
 if st.sidebar.button("Reset Database"):
-    if "grants_conn" in st.session_state:
-        del st.session_state["grants_conn"]
-    if "grants_xml_data" in st.session_state:
-        del st.session_state["grants_xml_data"]
-    st.session_state.page_number = 0
-    st.experimental_rerun()
+    pool.reset("grants")
+    first_page(pager)
+    st.rerun()
+
+profile.finish(rows=len(df_page), total=int(total_opps))
 
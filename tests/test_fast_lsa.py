@@ -0,0 +1,72 @@
+# tests/test_fast_lsa.py
+"""
+FastLsaSummarizer must rate and pick sentences exactly like Sumy's
+LsaSummarizer, at full rank (its default) and at a reduced rank.
+"""
+import numpy
+import pytest
+from sumy.nlp.stemmers import Stemmer
+from sumy.parsers.plaintext import PlaintextParser
+from sumy.summarizers.lsa import LsaSummarizer
+from sumy.utils import get_stop_words
+
+from utilities.fast_lsa import FastLsaSummarizer
+from utilities.grant_sumy import get_tokenizer
+
+TEXT = """
+The National Institutes of Health invites applications for research projects on cancer prevention.
+Projects should study early detection of cancer in underserved populations.
+Applicants may propose clinical trials, but trials are optional for this announcement.
+The program supports collaborative networks of investigators across several institutes.
+Early stage investigators are especially encouraged to apply for this research funding.
+Budgets are limited to five hundred thousand dollars in direct costs per year.
+Each project may last up to five years, with annual progress reports required.
+Data sharing plans must describe how genomic and clinical data will be made available.
+Research on the mechanisms of cancer metastasis is outside the scope of this program.
+Letters of intent are due thirty days before the application due date.
+Questions about the scientific scope should go to the program officer listed below.
+The institute expects to fund eight to ten awards in the first year of the program.
+"""
+
+
+def summarizers(monkeypatch, reduction_ratio):
+    # Sumy reads LsaSummarizer.REDUCTION_RATIO off the class, not the instance
+    monkeypatch.setattr(LsaSummarizer, "REDUCTION_RATIO", reduction_ratio)
+    pair = []
+    for cls in (LsaSummarizer, FastLsaSummarizer):
+        summarizer = cls(Stemmer("english"))
+        summarizer.stop_words = get_stop_words("english")
+        pair.append(summarizer)
+    return pair
+
+
+def sumy_ratings(summarizer, document):
+    # The steps of LsaSummarizer.__call__ up to the ratings it picks sentences by
+    dictionary = summarizer._create_dictionary(document)
+    matrix = summarizer._compute_term_frequency(summarizer._create_matrix(document, dictionary))
+    _, sigma, v = numpy.linalg.svd(matrix, full_matrices=False)
+    return summarizer._compute_ranks(sigma, v)
+
+
+@pytest.fixture(scope="module")
+def document():
+    return PlaintextParser.from_string(TEXT, get_tokenizer("english")).document
+
+
+@pytest.mark.parametrize("reduction_ratio", [1.0, 0.5])
+def test_ratings_match_sumy(monkeypatch, document, reduction_ratio):
+    sumy, fast = summarizers(monkeypatch, reduction_ratio)
+    assert numpy.allclose(fast.rate_sentences(document), sumy_ratings(sumy, document))
+
+
+@pytest.mark.parametrize("reduction_ratio", [1.0, 0.5])
+def test_summary_matches_sumy(monkeypatch, document, reduction_ratio):
+    sumy, fast = summarizers(monkeypatch, reduction_ratio)
+    for count in (1, 3, 5):
+        assert [str(s) for s in fast(document, count)] == [str(s) for s in sumy(document, count)]
+
+
+def test_empty_document(monkeypatch):
+    _, fast = summarizers(monkeypatch, 1.0)
+    document = PlaintextParser.from_string("The and of.", get_tokenizer("english")).document
+    assert fast(document, 3) == ()
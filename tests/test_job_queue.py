@@ -0,0 +1,109 @@
+# tests/test_job_queue.py
+"""
+JobQueue: retries with backoff, deduplication by key and rate limiting,
+with a fake upstream call in place of Gemini and TTS.
+"""
+import threading
+import time
+
+from utilities.job_queue import JobQueue, TokenBucket
+
+# Fast enough that rate limiting never slows the tests that are not about it
+NO_LIMIT = {"rate": 1000.0, "burst": 1000}
+
+
+def wait_for(queue, job_id, timeout=5):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        status = queue.status(job_id)
+        if status["status"] in ("done", "failed"):
+            return status
+        time.sleep(0.005)
+    raise AssertionError(f"job {job_id} still {queue.status(job_id)['status']} after {timeout} s")
+
+
+class Flaky:
+    """
+    Fails its first `failures` calls, then returns its argument.
+    """
+
+    def __init__(self, failures):
+        self.failures = failures
+        self.calls = []
+
+    def __call__(self, value):
+        self.calls.append(time.monotonic())
+        if len(self.calls) <= self.failures:
+            raise ConnectionError(f"upstream unavailable (call {len(self.calls)})")
+        return value
+
+
+def test_failed_attempts_are_retried_with_backoff():
+    upstream = Flaky(failures=2)
+    queue = JobQueue(workers=1, max_attempts=3, backoff=0.05, **NO_LIMIT)
+    status = wait_for(queue, queue.submit("grant-1", upstream, "audio"))
+    assert status["status"] == "done"
+    assert status["result"] == "audio"
+    assert status["attempts"] == 3
+    # Backoff doubles: 0.05 s, then 0.1 s
+    first, second, third = upstream.calls
+    assert second - first >= 0.05
+    assert third - second >= 0.1
+    metrics = queue.metrics()
+    assert (metrics["retries"], metrics["done"], metrics["failed"]) == (2, 1, 0)
+    assert metrics["waiting_retry"] == 0
+
+
+def test_job_fails_after_max_attempts():
+    upstream = Flaky(failures=10)
+    queue = JobQueue(workers=1, max_attempts=2, backoff=0.01, **NO_LIMIT)
+    status = wait_for(queue, queue.submit("grant-1", upstream, "audio"))
+    assert status["status"] == "failed"
+    assert status["attempts"] == 2
+    assert "call 2" in status["error"]
+    assert len(upstream.calls) == 2
+    assert queue.metrics()["failed"] == 1
+
+
+def test_active_key_is_deduplicated():
+    release = threading.Event()
+    calls = []
+
+    def upstream(value):
+        calls.append(value)
+        release.wait(5)
+        return value
+
+    queue = JobQueue(workers=2, **NO_LIMIT)
+    job_id = queue.submit("grant-1", upstream, "first")
+    assert queue.submit("grant-1", upstream, "second") == job_id
+    release.set()
+    assert wait_for(queue, job_id)["result"] == "first"
+    assert calls == ["first"]
+    assert queue.metrics()["deduplicated"] == 1
+
+    # Once finished, the key can be submitted again
+    new_id = queue.submit("grant-1", upstream, "third")
+    assert new_id != job_id
+    assert wait_for(queue, new_id)["result"] == "third"
+
+
+def test_token_bucket_limits_rate_after_burst():
+    bucket = TokenBucket(rate=20.0, burst=2)
+    start = time.monotonic()
+    bucket.acquire()
+    bucket.acquire()
+    assert time.monotonic() - start < 0.05
+    for _ in range(4):
+        bucket.acquire()
+    # Four more tokens at 20 per second
+    assert time.monotonic() - start >= 0.18
+
+
+def test_rate_limit_is_shared_by_workers():
+    queue = JobQueue(workers=4, rate=20.0, burst=1)
+    start = time.monotonic()
+    job_ids = [queue.submit(f"grant-{i}", lambda i: i, i) for i in range(5)]
+    assert [wait_for(queue, job_id)["result"] for job_id in job_ids] == list(range(5))
+    # One at once, then four more at 20 per second, whatever the number of workers
+    assert time.monotonic() - start >= 0.18
@@ -0,0 +1,127 @@
+# tests/test_podcast_cache.py
+"""
+PodcastCache: one upstream call per key however many sessions ask at once,
+errors shared with the waiting callers, and the script/audio split.
+"""
+import threading
+import time
+
+import pytest
+
+from utilities.podcast_cache import PodcastCache
+
+CALLERS = 8
+
+
+class FakeUpstream:
+    """
+    Stands in for Gemini and TTS: counts its calls and can hold them until released.
+    """
+
+    def __init__(self, result=b"audio", error=None):
+        self.result = result
+        self.error = error
+        self.calls = 0
+        self.started = threading.Event()
+        self.release = threading.Event()
+        self.release.set()
+        self._lock = threading.Lock()
+
+    def __call__(self):
+        with self._lock:
+            self.calls += 1
+        self.started.set()
+        self.release.wait(5)
+        if self.error is not None:
+            raise self.error
+        return self.result
+
+
+def run_concurrently(cache, upstream, key="grant-1"):
+    """
+    Calls get_or_create from CALLERS threads while the first call is held
+    upstream; returns each thread's result or exception.
+    """
+    upstream.release.clear()
+    outcomes = [None] * CALLERS
+
+    def call(i):
+        try:
+            outcomes[i] = cache.get_or_create("audio", key, upstream)
+        except Exception as e:
+            outcomes[i] = e
+
+    threads = [threading.Thread(target=call, args=(i,)) for i in range(CALLERS)]
+    threads[0].start()
+    assert upstream.started.wait(5)
+    for thread in threads[1:]:
+        thread.start()
+    # Let the followers reach the in-flight computation before it returns
+    time.sleep(0.1)
+    upstream.release.set()
+    for thread in threads:
+        thread.join(5)
+    return outcomes
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return PodcastCache(cache_dir=str(tmp_path))
+
+
+def test_concurrent_callers_share_one_upstream_call(cache):
+    upstream = FakeUpstream()
+    assert run_concurrently(cache, upstream) == [b"audio"] * CALLERS
+    assert upstream.calls == 1
+    stats = cache.stats()
+    assert stats["audio_upstream_calls"] == 1
+    assert stats["audio_deduplicated"] == CALLERS - 1
+    assert cache.get("audio", "grant-1") == b"audio"
+
+
+def test_concurrent_callers_share_the_error(cache):
+    upstream = FakeUpstream(error=RuntimeError("quota exceeded"))
+    outcomes = run_concurrently(cache, upstream)
+    assert upstream.calls == 1
+    assert all(isinstance(outcome, RuntimeError) for outcome in outcomes)
+    assert cache.get("audio", "grant-1") is None
+
+    # Nothing was cached, so the next request calls upstream again
+    upstream.error = None
+    assert cache.get_or_create("audio", "grant-1", upstream) == b"audio"
+    assert upstream.calls == 2
+
+
+def test_different_keys_do_not_wait_for_each_other(cache):
+    first = FakeUpstream(result=b"first")
+    first.release.clear()
+    leader = threading.Thread(target=cache.get_or_create, args=("audio", "grant-1", first))
+    leader.start()
+    assert first.started.wait(5)
+    assert cache.get_or_create("audio", "grant-2", FakeUpstream(result=b"second")) == b"second"
+    first.release.set()
+    leader.join(5)
+
+
+def test_podcast_reuses_script_and_audio(cache):
+    scripts, voices = [], []
+
+    def generate_script(content):
+        scripts.append(content)
+        return f"Script about {content}"
+
+    def synthesize(script):
+        voices.append(script)
+        return script.encode("utf-8")
+
+    settings = ({"model": "fake"}, {"voice": "a"})
+    audio = cache.get_or_create_podcast("grant 1", *settings, generate_script, synthesize)
+    assert audio == b"Script about grant 1"
+    assert cache.get_or_create_podcast("grant 1", *settings, generate_script, synthesize) == audio
+    assert (len(scripts), len(voices)) == (1, 1)
+
+    # Another voice re-synthesizes the cached script
+    path = cache.podcast_path("grant 1", settings[0], {"voice": "b"}, generate_script, synthesize)
+    assert (len(scripts), len(voices)) == (1, 2)
+    assert cache.cached_podcast_path("grant 1", settings[0], {"voice": "b"}) == path
+    assert cache.cached_podcast_path("grant 2", *settings) is None
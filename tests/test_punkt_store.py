@@ -0,0 +1,19 @@
+# tests/test_punkt_store.py
+"""
+StoreTokenizer works for every language without NLTK's data directory.
+"""
+import pytest
+
+from utilities.punkt_store import StoreTokenizer, available_languages
+
+
+@pytest.mark.parametrize("language", available_languages())
+def test_every_stored_model_tokenizes(language):
+    assert StoreTokenizer(language).to_sentences("First sentence here. Second one there.") == (
+        "First sentence here.", "Second one there.")
+
+
+def test_greek_splits_on_question_marks():
+    text = "Τι ώρα είναι; Είναι αργά; Ναι. Το σπίτι είναι μεγάλο."
+    assert StoreTokenizer("greek").to_sentences(text) == (
+        "Τι ώρα είναι;", "Είναι αργά;", "Ναι.", "Το σπίτι είναι μεγάλο.")
@@ -0,0 +1,90 @@
+# ui/ui_format.py
+import html
+
+import pandas as pd
+
+
+def format_date(value, missing='N/A'):
+    """
+    Formats a DATE column value (date, Timestamp or NaT/None) as M/D/YYYY.
+    """
+    if value is None or pd.isna(value):
+        return missing
+    if isinstance(value, str):
+        return value
+    return f"{value.month}/{value.day}/{value.year}"
+
+
+def format_money(value, missing='N/A'):
+    """
+    Formats a money column value (number or NaN/None) as $1,234,567.
+    """
+    if value is None or pd.isna(value):
+        return missing
+    if isinstance(value, str):
+        return value
+    return f"${float(value):,.0f}"
+
+
+# Column-wise versions of the helpers above, for rendering a whole page of cards
+# at once. Each takes one column and returns a plain list of strings, which is
+# cheaper than pandas string methods at page sizes and never boxes rows.
+
+_CARDS_PER_ROW_WORDS = {1: "one", 2: "two", 3: "three", 4: "four", 5: "five", 6: "six"}
+
+
+def as_frame(rows):
+    """
+    Returns rows as a DataFrame (converting e.g. a pyarrow Table).
+    """
+    if isinstance(rows, pd.DataFrame):
+        return rows
+    return rows.to_pandas()
+
+
+def _values(df, column):
+    # None for missing values (NaN, NaT, NULL) and for a missing column
+    if column not in df.columns:
+        return [None] * len(df)
+    values = df[column]
+    return values.astype(object).where(values.notna(), None).tolist()
+
+
+def text_column(df, column, missing='N/A'):
+    """
+    Returns df[column] as a list of HTML-escaped strings, with missing values as `missing`.
+    """
+    return [missing if value is None else html.escape(str(value)) for value in _values(df, column)]
+
+
+def date_column(df, column, missing='N/A'):
+    """
+    Column-wise format_date.
+    """
+    return [missing if value is None else format_date(value, missing) for value in _values(df, column)]
+
+
+def money_column(df, column, missing='N/A'):
+    """
+    Column-wise format_money.
+    """
+    return [missing if value is None else format_money(value, missing) for value in _values(df, column)]
+
+
+def snippet_column(df, column, length=400):
+    """
+    Returns the first `length` characters of each value of df[column], HTML-escaped,
+    with "..." where text was cut.
+    """
+    return [
+        "" if value is None else html.escape(value[:length] + ("..." if len(value) > length else ""))
+        for value in (None if value is None else str(value) for value in _values(df, column))
+    ]
+
+
+def render_cards_grid_html(cards, cards_per_row=3):
+    """
+    Joins card HTML strings into a single Semantic UI card grid with `cards_per_row` cards per row.
+    """
+    width = _CARDS_PER_ROW_WORDS.get(cards_per_row, "three")
+    return f'<div class="ui {width} stackable cards">' + "".join(cards) + "</div>"
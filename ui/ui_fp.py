@@ -1,4 +1,5 @@
 # ui/ui_fp.py
+from ui.ui_format import as_frame, date_column, format_date, text_column
 
 
 def render_banner_grants(total_opps, unique_agencies, total_budget_str):
@@ -43,7 +44,7 @@ def render_card_grants(row):
     title = row.get('OpportunityTitle', 'N/A')
     opp_id = row.get('OpportunityID', 'N/A')
     agency = row.get('AgencyName', 'N/A')
-    post_date = row.get('PostDate', 'N/A')
+    post_date = format_date(row.get('PostDate'))
     budget = row.get('Budget', 'N/A')
     card_html = f"""
     <div class="card" style="margin: 10px;">
@@ -65,7 +66,7 @@ def render_card_nih(row):
     url = row.get('URL', '#')
     # Wrap title in hyperlink
     title_html = f'<a href="{url}" target="_blank">{title}</a>'
-    release_date = row.get('Release_Date', 'N/A')
+    release_date = format_date(row.get('Release_Date'))
     activity = row.get('Activity_Code', 'N/A')
     organization = row.get('Organization', 'N/A')
     doc_type = row.get('Document_Type', 'N/A')
@@ -84,6 +85,34 @@ def render_card_nih(row):
     """
     return card_html
 
+_NIH_CARD_TEMPLATE = (
+    '<div class="card"><div class="content">'
+    '<div class="header"><a href="{}" target="_blank">{}</a></div>'
+    '<div class="meta">{}</div>'
+    '<div class="description">'
+    '<p><strong>Release Date:</strong> {}</p>'
+    '<p><strong>Activity:</strong> {}</p>'
+    '<p><strong>Document Type:</strong> {}</p>'
+    '</div></div></div>'
+)
+
+def render_cards_nih(rows):
+    """
+    Renders the card HTML of every NIH record in rows (a DataFrame or Arrow
+    table) at once, column by column, with the same fields as render_card_nih.
+    All values are HTML-escaped. Returns a list of card HTML strings.
+    """
+    df = as_frame(rows)
+    columns = zip(
+        text_column(df, 'URL', '#'),
+        text_column(df, 'Title'),
+        text_column(df, 'Organization'),
+        date_column(df, 'Release_Date'),
+        text_column(df, 'Activity_Code'),
+        text_column(df, 'Document_Type'),
+    )
+    return [_NIH_CARD_TEMPLATE.format(*fields) for fields in columns]
+
 def render_cards_grid(cards, cards_per_row=3):
     """
     Split a list of card HTML strings into rows.
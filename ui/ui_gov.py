@@ -1,4 +1,13 @@
 # ui/ui_gov.py
+from ui.ui_format import (
+    as_frame,
+    date_column,
+    format_date,
+    format_money,
+    money_column,
+    snippet_column,
+    text_column,
+)
 
 def render_banner_grants(total_opps, unique_agencies, total_program_funding):
     """
@@ -66,8 +75,8 @@ def render_card_grants(row):
 
     agency = row.get('AgencyName', 'N/A')
     opp_id = row.get('OpportunityID', 'N/A')
-    close_date = row.get('CloseDate', 'N/A')
-    program_funding = row.get('EstimatedTotalProgramFunding', 'N/A')
+    close_date = format_date(row.get('CloseDate'))
+    program_funding = format_money(row.get('EstimatedTotalProgramFunding'))
 
     # Show only a 400-character snippet
     desc_full = row.get('Description', 'N/A') or ""
@@ -92,6 +101,38 @@ def render_card_grants(row):
     return card_html
 
 
+_GRANT_CARD_TEMPLATE = (
+    '<div class="card"><div class="content">'
+    '<div class="header"><a href="{}" target="_blank">{}</a></div>'
+    '<div class="meta">{}</div>'
+    '<div class="description">'
+    '<p><strong>ID:</strong> {}</p>'
+    '<p><strong>Close Date:</strong> {}</p>'
+    '<p><strong>Program Funding:</strong> {}</p>'
+    '<p><strong>Description (Snippet):</strong> {}</p>'
+    '</div></div></div>'
+)
+
+
+def render_cards_grants(rows):
+    """
+    Renders the card HTML of every grant in rows (a DataFrame or Arrow table)
+    at once, column by column, with the same fields as render_card_grants.
+    All values are HTML-escaped. Returns a list of card HTML strings.
+    """
+    df = as_frame(rows)
+    columns = zip(
+        text_column(df, 'AdditionalInformationURL', '#'),
+        text_column(df, 'OpportunityTitle'),
+        text_column(df, 'AgencyName'),
+        text_column(df, 'OpportunityID'),
+        date_column(df, 'CloseDate'),
+        money_column(df, 'EstimatedTotalProgramFunding'),
+        snippet_column(df, 'Description'),
+    )
+    return [_GRANT_CARD_TEMPLATE.format(*fields) for fields in columns]
+
+
 def render_card_nih(row):
     """
     Example NIH card function. Not used in the grants flow, but here for reference.
@@ -99,7 +140,7 @@ def render_card_nih(row):
     title = row.get('Title', 'N/A')
     url = row.get('URL', '#')
     title_html = f'<a href="{url}" target="_blank">{title}</a>'
-    release_date = row.get('Release_Date', 'N/A')
+    release_date = format_date(row.get('Release_Date'))
     activity = row.get('Activity_Code', 'N/A')
     organization = row.get('Organization', 'N/A')
     doc_type = row.get('Document_Type', 'N/A')
@@ -0,0 +1,33 @@
+# ui/ui_metrics.py
+import os
+
+import streamlit as st
+
+from utilities import metrics
+
+
+def render_metrics_panel():
+    """
+    Sidebar admin panel with the process's metrics (see utilities.metrics):
+    latency and row-count histograms as a table, and the Prometheus text
+    to read or download. The metrics are process-wide (every visitor's
+    activity), so the panel is only shown with FUNDR_METRICS_PANEL=1, and
+    never when metrics are off.
+    """
+    if not metrics.ENABLED or os.environ.get(metrics.PANEL_ENV, "").strip() != "1":
+        return
+    with st.sidebar.expander("Metrics"):
+        rows = metrics.summary()
+        if rows:
+            st.dataframe(rows, hide_index=True, column_config={
+                "mean": st.column_config.NumberColumn(format="%.1f"),
+                "p95": st.column_config.NumberColumn("p95 (bucket)", format="%g"),
+            })
+        else:
+            st.caption("Nothing recorded yet in this process.")
+        text = metrics.render_prometheus()
+        st.download_button("Download Prometheus metrics", text, file_name="fundr_metrics.prom",
+                           mime="text/plain", key="metrics_download")
+        st.code(text, language=None, height=300)
+        if os.environ.get(metrics.PORT_ENV):
+            st.caption(f"Also served at http://127.0.0.1:{os.environ[metrics.PORT_ENV]}/metrics")
@@ -0,0 +1,49 @@
+# ui/ui_podcast.py
+import os
+
+import streamlit as st
+
+from utilities.ai_podcast import podcast_audio_format, podcast_status
+
+# Seconds between status checks of a queued or running podcast job
+POLL_SECONDS = 2
+
+
+def render_podcast_job(job_key, submit, cached_path=None):
+    """
+    Shows the podcast job whose id is st.session_state[job_key]: its progress
+    while queued or running (re-checked every POLL_SECONDS without rerunning
+    the page), the error if it failed, or once done the audio file the job
+    returned, played from disk. If that file was purged from the cache since,
+    cached_path() (a lookup, no upstream call) may find it again; otherwise
+    a Regenerate button queues submit() as a new job. The page itself never
+    generates a podcast.
+    """
+    status = podcast_status(st.session_state[job_key])
+    if status is None:
+        return
+    if status["status"] == "done":
+        path = status["result"]
+        if not (path and os.path.exists(path)) and cached_path is not None:
+            path = cached_path()
+        if path and os.path.exists(path):
+            st.audio(path, format=podcast_audio_format())
+            return
+        st.warning("This podcast is no longer cached.")
+        if st.button("Regenerate", key=f"regenerate_{job_key}"):
+            st.session_state[job_key] = submit()
+            st.rerun()
+    elif status["status"] == "failed":
+        st.error(f"Error generating audio: {status['error']}")
+    else:
+        _poll_podcast_job(status["id"])
+
+
+@st.fragment(run_every=POLL_SECONDS)
+def _poll_podcast_job(job_id):
+    status = podcast_status(job_id)
+    if status is None or status["status"] in ("done", "failed"):
+        # Let the page render the result outside this polling fragment
+        st.rerun()
+    attempt = f" (attempt {status['attempts']})" if status["attempts"] > 1 else ""
+    st.info(f"Podcast {status['status']}{attempt}... you can keep browsing.")
@@ -5,34 +5,98 @@ import re
 import json
 import wave
 import io
+import threading
 
+import pandas as pd
 import streamlit as st  # Using st.secrets for credentials
-import google.cloud.texttospeech as tts
 
-# Import Gemini for content generation
-from google import genai
-from google.genai import types
-
-from google.oauth2.service_account import Credentials
+from ui.ui_format import format_date, format_money
+from utilities import metrics
+from utilities.grant_sumy import summarize_url
+from utilities.job_queue import JOB_COUNTERS, JobQueue
+from utilities.podcast_cache import content_key, get_podcast_cache
 
 #############################################
-# 1) Load Gemini / Google TTS credentials from st.secrets
+# 1) Gemini / Google TTS clients, created on first use
 #############################################
 
-# 1A) Load Gemini API key from st.secrets
-try:
-    gemini_api_key = st.secrets["gemini"]["api_key"]
-except (KeyError, AttributeError):
-    raise ValueError("Gemini API key not found in st.secrets['gemini']['api_key']")
-
-# 1B) Set up the Google Cloud TTS client using service account info from st.secrets["google_cloud"]
-try:
-    google_cloud_info = st.secrets["google_cloud"]
-    # google_cloud_info is a dict containing the service account JSON keys
-    credentials = Credentials.from_service_account_info(google_cloud_info)
-    tts_client = tts.TextToSpeechClient(credentials=credentials)
-except (KeyError, AttributeError):
-    raise ValueError("Google Cloud credentials not found in st.secrets['google_cloud']")
+# The Google client libraries take about a second to import and the clients
+# open their own connections, so nothing is loaded until a podcast is made.
+# Each client is then shared by every session of the process, keeping its
+# connections (and TLS sessions) open between podcasts.
+_clients = {}
+_clients_lock = threading.Lock()
+
+def _new_gemini_client():
+    # 1A) Gemini API key from st.secrets
+    from google import genai
+    try:
+        gemini_api_key = st.secrets["gemini"]["api_key"]
+    except (KeyError, AttributeError, FileNotFoundError):
+        raise ValueError("Gemini API key not found in st.secrets['gemini']['api_key']")
+    return genai.Client(api_key=gemini_api_key)
+
+def _new_tts_client():
+    # 1B) Google Cloud TTS client using service account info from st.secrets["google_cloud"]
+    import google.cloud.texttospeech as tts
+    from google.oauth2.service_account import Credentials
+    try:
+        # google_cloud_info is a dict containing the service account JSON keys
+        google_cloud_info = st.secrets["google_cloud"]
+        credentials = Credentials.from_service_account_info(google_cloud_info)
+    except (KeyError, AttributeError, FileNotFoundError):
+        raise ValueError("Google Cloud credentials not found in st.secrets['google_cloud']")
+    return tts.TextToSpeechClient(credentials=credentials)
+
+CLIENT_FACTORIES = {"gemini": _new_gemini_client, "tts": _new_tts_client}
+
+def get_client(name):
+    """
+    Returns the process-wide "gemini" or "tts" client, creating it on first use.
+    Raises ValueError if its credentials are missing from st.secrets.
+    """
+    client = _clients.get(name)
+    if client is None:
+        with _clients_lock:
+            client = _clients.get(name)
+            if client is None:
+                client = _clients[name] = CLIENT_FACTORIES[name]()
+    return client
+
+def reset_client(name, client):
+    """
+    Forgets `client` so the next get_client(name) creates a new one. Does
+    nothing if another thread already replaced it.
+    """
+    with _clients_lock:
+        if _clients.get(name) is client:
+            del _clients[name]
+
+def _is_connection_error(error):
+    import httpx
+    from google.api_core import exceptions as api_exceptions
+    return isinstance(error, (ConnectionError, httpx.TransportError, api_exceptions.ServiceUnavailable))
+
+def _call_with_reconnect(name, call, client=None):
+    """
+    Returns call(client), using the shared client `name` unless one is given.
+    If the shared client fails at the connection level (dropped channel, reset
+    socket), it is replaced and the call is retried once on the new client.
+    """
+    if client is not None:
+        with metrics.timer("upstream_call", api=name):
+            return call(client)
+    client = get_client(name)
+    try:
+        with metrics.timer("upstream_call", api=name):
+            return call(client)
+    except Exception as e:
+        if not _is_connection_error(e):
+            raise
+        reset_client(name, client)
+        metrics.inc("upstream_reconnects", api=name)
+        with metrics.timer("upstream_call", api=name):
+            return call(get_client(name))
 
 #############################################
 # 2) Load system prompt from prompt.json
@@ -53,12 +117,38 @@ if os.path.exists(PROMPT_PATH):
 # 3) Gemini & TTS helper functions
 #############################################
 
+GEMINI_MODEL = "gemini-2.0-flash"
+GENERATION_SETTINGS = {
+    "max_output_tokens": 500,  # Enough tokens for ~1 minute of speech
+    "temperature": 0.3,
+    "top_k": 40,
+    "top_p": 0.95,
+}
+VOICE_SETTINGS = {
+    "language_code": "en-US",
+    "name": "en-US-Standard-C",
+    "speaking_rate": 1.0,
+    "pitch": 0.0,
+    "sample_rate_hertz": 16000,
+    # Any key of AUDIO_MIME_TYPES; MP3 and OGG_OPUS clips are ~10x smaller than LINEAR16
+    "encoding": "MP3",
+}
+# TTS audio encodings the pages can play, with their MIME types
+AUDIO_MIME_TYPES = {"MP3": "audio/mpeg", "OGG_OPUS": "audio/ogg", "LINEAR16": "audio/wav"}
+# Google TTS takes at most 5000 bytes of text per request; longer scripts are sent in chunks
+MAX_TTS_INPUT_BYTES = 4800
+TARGET_MINUTES = 1.0
+# Background generation: jobs in flight and job starts per second
+# (Gemini's free tier allows 15 requests per minute)
+PODCAST_WORKERS = 2
+PODCAST_RATE = 0.25
+PODCAST_BURST = 2
+
 def load_gemini_client():
     """
-    Configures and returns a Gemini client using the st.secrets API key.
+    Returns the shared Gemini client (created on first use from the st.secrets API key).
     """
-    client = genai.Client(api_key=gemini_api_key)
-    return client
+    return get_client("gemini")
 
 def estimate_audio_duration(text, speaking_rate=1.0):
     """Estimate duration (in minutes) for final TTS at ~150 words per minute."""
@@ -79,49 +169,42 @@ def adjust_script_for_duration(text, target_minutes=1.0, speaking_rate=1.0):
         return truncated
     return text
 
-#############################################
-# 4) Main podcast generation function
-#############################################
-
-def generate_podcast_audio(row_dict, summary_text=None):
+def podcast_content(row_dict, summary_text=None):
     """
-    1) Construct a prompt from row_dict (OpportunityTitle, Description, etc.)
-       OR use the provided summary_text.
-    2) Use Gemini LLM (with system instructions from prompt.json) to get a ~1-minute script.
-    3) TTS that script with Google Cloud TTS, returning raw audio bytes (LINEAR16).
+    Returns the Gemini input for a grant: summary_text if given, otherwise
+    the title, funding, close date and description of row_dict, formatted
+    like the cards (M/D/YYYY dates, $ amounts, "N/A" for missing values).
     """
-    # 1) Build content from row_dict unless a summary is provided.
     if summary_text and summary_text.strip():
-        content_str = summary_text
+        return summary_text
     else:
-        title = row_dict.get("OpportunityTitle", "N/A")
-        desc = row_dict.get("Description", "")
-        close_date = row_dict.get("CloseDate", "")
-        funding = row_dict.get("EstimatedTotalProgramFunding", "N/A")
-        content_str = (
+        title = row_dict.get("OpportunityTitle")
+        title = "N/A" if title is None or pd.isna(title) else title
+        desc = row_dict.get("Description")
+        desc = "" if desc is None or pd.isna(desc) else desc
+        close_date = format_date(row_dict.get("CloseDate"))
+        funding = format_money(row_dict.get("EstimatedTotalProgramFunding"))
+        return (
             f"Grant Title: {title}\n"
             f"Funding: {funding}\n"
             f"Close Date: {close_date}\n"
             f"Description:\n{desc}\n"
         )
 
-    # 2) Use Gemini to generate a short, ~1-minute podcast script.
-    gemini_client = load_gemini_client()
-
-    config = types.GenerateContentConfig(
-        max_output_tokens=500,  # Enough tokens for ~1 minute of speech
-        temperature=0.3,
-        top_k=40,
-        top_p=0.95,
-        system_instruction=SYSTEM_INSTRUCTION
-    )
+def generate_script(content_str, gemini_client=None):
+    """
+    Uses Gemini (with system instructions from prompt.json) to write a ~1-minute
+    podcast script about content_str. Raises RuntimeError.
+    """
+    from google.genai import types
+    config = types.GenerateContentConfig(system_instruction=SYSTEM_INSTRUCTION, **GENERATION_SETTINGS)
 
     try:
-        response = gemini_client.models.generate_content(
-            model="gemini-2.0-flash",
+        response = _call_with_reconnect("gemini", lambda client: client.models.generate_content(
+            model=GEMINI_MODEL,
             contents=[content_str],
             config=config
-        )
+        ), gemini_client)
         script = response.text
         if not script or not script.strip():
             raise RuntimeError("Gemini returned empty script.")
@@ -131,33 +214,224 @@ def generate_podcast_audio(row_dict, summary_text=None):
         script = re.sub(r"`{3,}", "", script)       # Remove triple backticks
 
         # Truncate script to ~1 minute duration.
-        script = adjust_script_for_duration(script, target_minutes=1.0, speaking_rate=1.0)
+        return adjust_script_for_duration(script, target_minutes=TARGET_MINUTES,
+                                          speaking_rate=VOICE_SETTINGS["speaking_rate"])
     except Exception as e:
         raise RuntimeError(f"Error generating Gemini script: {e}")
 
-    # 3) Synthesize speech with Google Cloud TTS.
+def split_script(script, max_bytes=MAX_TTS_INPUT_BYTES):
+    """
+    Splits script into chunks of at most max_bytes (UTF-8) for TTS, breaking
+    between sentences, or between words inside an over-long sentence.
+    """
+    pieces = []
+    for sentence in re.split(r"(?<=[.!?])\s+", script.strip()):
+        if len(sentence.encode("utf-8")) <= max_bytes:
+            pieces.append(sentence)
+        else:
+            pieces.extend(sentence.split())
+
+    chunks = []
+    current = ""
+    for piece in pieces:
+        candidate = f"{current} {piece}" if current else piece
+        if len(candidate.encode("utf-8")) <= max_bytes:
+            current = candidate
+            continue
+        if current:
+            chunks.append(current)
+        # A single word longer than max_bytes is cut (on a character boundary)
+        while len(piece.encode("utf-8")) > max_bytes:
+            head = piece.encode("utf-8")[:max_bytes].decode("utf-8", errors="ignore")
+            chunks.append(head)
+            piece = piece[len(head):]
+        current = piece
+    if current:
+        chunks.append(current)
+    return chunks
+
+def _pcm_frames(clip):
+    # TTS returns LINEAR16 audio with a WAV header
+    if clip[:4] == b"RIFF":
+        with wave.open(io.BytesIO(clip), "rb") as wf:
+            return wf.readframes(wf.getnframes())
+    return clip
+
+# MPEG layer III bitrates (kbit/s) by version, and sample rates by version
+MP3_BITRATES = {
+    "1": (0, 32, 40, 48, 56, 64, 80, 96, 112, 128, 160, 192, 224, 256, 320),
+    "2": (0, 8, 16, 24, 32, 40, 48, 56, 64, 80, 96, 112, 128, 144, 160),
+}
+MP3_SAMPLE_RATES = {3: (44100, 48000, 32000), 2: (22050, 24000, 16000), 0: (11025, 12000, 8000)}
+
+def _mp3_frames(clip):
+    # Drops the ID3v2 tag and the Xing/Info frame, which records the length
+    # of this clip alone and would make players stop at its end
+    if clip[:3] == b"ID3":
+        size = (clip[6] & 0x7F) << 21 | (clip[7] & 0x7F) << 14 | (clip[8] & 0x7F) << 7 | (clip[9] & 0x7F)
+        clip = clip[10 + size:]
+    if len(clip) < 4 or clip[0] != 0xFF or clip[1] & 0xE0 != 0xE0:
+        return clip
+    version = (clip[1] >> 3) & 0x03
+    bitrate_index, rate_index = clip[2] >> 4, (clip[2] >> 2) & 0x03
+    if version == 1 or bitrate_index in (0, 15) or rate_index == 3:
+        return clip
+    bitrate = MP3_BITRATES["1" if version == 3 else "2"][bitrate_index] * 1000
+    frame_length = (144 if version == 3 else 72) * bitrate // MP3_SAMPLE_RATES[version][rate_index]
+    frame_length += (clip[2] >> 1) & 0x01
+    if b"Xing" in clip[4:48] or b"Info" in clip[4:48]:
+        return clip[frame_length:]
+    return clip
+
+def join_audio(clips, encoding, sample_rate_hertz):
+    """
+    Joins TTS clips of one encoding into one playable file. MP3 clips are
+    concatenated frame by frame, without their per-clip headers; Ogg clips
+    are concatenated into a chained stream, which not every browser plays
+    past the first clip (so MP3 is the default); LINEAR16 clips are
+    unwrapped to PCM and written as a single WAV.
+    """
+    if len(clips) == 1 and encoding != "LINEAR16":
+        return clips[0]
+    if encoding == "MP3":
+        return b"".join(_mp3_frames(clip) for clip in clips)
+    if encoding != "LINEAR16":
+        return b"".join(clips)
+    with io.BytesIO() as wav_buffer:
+        with wave.open(wav_buffer, "wb") as wf:
+            wf.setnchannels(1)
+            wf.setsampwidth(2)
+            wf.setframerate(sample_rate_hertz)
+            for clip in clips:
+                wf.writeframes(_pcm_frames(clip))
+        return wav_buffer.getvalue()
+
+def podcast_audio_format():
+    """
+    Returns the MIME type of the podcast audio, for st.audio.
+    """
+    return AUDIO_MIME_TYPES[VOICE_SETTINGS["encoding"]]
+
+def synthesize_audio(script, client=None):
+    """
+    Speaks script with Google Cloud TTS, in chunks of at most MAX_TTS_INPUT_BYTES,
+    and returns the joined audio in VOICE_SETTINGS["encoding"]. Raises RuntimeError.
+    """
+    import google.cloud.texttospeech as tts
     try:
-        input_text = tts.SynthesisInput(text=script)
         voice_params = tts.VoiceSelectionParams(
-            language_code="en-US",
+            language_code=VOICE_SETTINGS["language_code"],
             ssml_gender=tts.SsmlVoiceGender.FEMALE,
-            name="en-US-Standard-C"
+            name=VOICE_SETTINGS["name"]
         )
         audio_config = tts.AudioConfig(
-            audio_encoding=tts.AudioEncoding.LINEAR16,
-            speaking_rate=1.0,
-            pitch=0.0,
-            sample_rate_hertz=16000
+            audio_encoding=tts.AudioEncoding[VOICE_SETTINGS["encoding"]],
+            speaking_rate=VOICE_SETTINGS["speaking_rate"],
+            pitch=VOICE_SETTINGS["pitch"],
+            sample_rate_hertz=VOICE_SETTINGS["sample_rate_hertz"]
         )
-        response = tts_client.synthesize_speech(
-            request={"input": input_text, "voice": voice_params, "audio_config": audio_config}
-        )
-        with io.BytesIO() as wav_buffer:
-            with wave.open(wav_buffer, "wb") as wf:
-                wf.setnchannels(1)
-                wf.setsampwidth(2)
-                wf.setframerate(16000)
-                wf.writeframes(response.audio_content)
-            return wav_buffer.getvalue()
+        clips = []
+        for chunk in split_script(script):
+            request = {"input": tts.SynthesisInput(text=chunk), "voice": voice_params, "audio_config": audio_config}
+            response = _call_with_reconnect(
+                "tts", lambda tts_client: tts_client.synthesize_speech(request=request), client
+            )
+            clips.append(response.audio_content)
+        return join_audio(clips, VOICE_SETTINGS["encoding"], VOICE_SETTINGS["sample_rate_hertz"])
     except Exception as e:
         raise RuntimeError(f"Audio generation error: {e}")
+
+#############################################
+# 4) Main podcast generation function
+#############################################
+
+@metrics.timed("podcast", result="audio")
+def generate_podcast_audio(row_dict, summary_text=None, cache=None, gemini_client=None, tts_client=None):
+    """
+    1) Construct a prompt from row_dict (OpportunityTitle, Description, etc.)
+       OR use the provided summary_text.
+    2) Use Gemini LLM (with system instructions from prompt.json) to get a ~1-minute script.
+    3) TTS that script with Google Cloud TTS, returning the audio bytes
+       (encoded as VOICE_SETTINGS["encoding"]).
+
+    Scripts and audio are cached on disk by content and settings (see
+    utilities.podcast_cache), so the same grant is only sent upstream once
+    across all sessions, even when clicked concurrently.
+    """
+    cache = cache or get_podcast_cache()
+    return cache.get_or_create_podcast(
+        podcast_content(row_dict, summary_text),
+        _script_settings(),
+        VOICE_SETTINGS,
+        lambda content: generate_script(content, gemini_client),
+        lambda script: synthesize_audio(script, tts_client),
+    )
+
+def _script_settings():
+    return dict(GENERATION_SETTINGS, model=GEMINI_MODEL, system_instruction=SYSTEM_INSTRUCTION,
+                target_minutes=TARGET_MINUTES)
+
+@metrics.timed("podcast", result="path")
+def podcast_audio_path(row_dict, summary_text=None, cache=None, gemini_client=None, tts_client=None):
+    """
+    Like generate_podcast_audio, but returns the path of the cached audio file,
+    so pages play it from disk instead of holding the bytes in the session.
+    """
+    cache = cache or get_podcast_cache()
+    return cache.podcast_path(
+        podcast_content(row_dict, summary_text),
+        _script_settings(),
+        VOICE_SETTINGS,
+        lambda content: generate_script(content, gemini_client),
+        lambda script: synthesize_audio(script, tts_client),
+    )
+
+def cached_podcast_path(row_dict, summary_text=None):
+    """
+    Returns the path of the podcast audio if it was generated before, else None
+    (no upstream call).
+    """
+    return get_podcast_cache().cached_podcast_path(podcast_content(row_dict, summary_text),
+                                                   _script_settings(), VOICE_SETTINGS)
+
+#############################################
+# 5) Background podcast jobs
+#############################################
+
+_podcast_queue = None
+_podcast_queue_lock = threading.Lock()
+
+def get_podcast_queue():
+    """
+    Returns the process-wide JobQueue for podcasts, shared by all sessions.
+    """
+    global _podcast_queue
+    if _podcast_queue is None:
+        with _podcast_queue_lock:
+            if _podcast_queue is None:
+                _podcast_queue = JobQueue(workers=PODCAST_WORKERS, rate=PODCAST_RATE, burst=PODCAST_BURST)
+                metrics.register_stats("podcast_queue", _podcast_queue.metrics, counters=JOB_COUNTERS)
+    return _podcast_queue
+
+def _podcast_job(row_dict, summary_text, summary_url):
+    if summary_url:
+        summary_text = summarize_url(summary_url, sentence_count=10)
+    return podcast_audio_path(row_dict, summary_text=summary_text)
+
+def submit_podcast(row_dict, summary_text=None, summary_url=None):
+    """
+    Queues podcast generation for a grant (summarizing summary_url first if given)
+    and returns the job id. Once the job is done, its result is the path of
+    the audio file in the podcast cache.
+    """
+    if summary_url:
+        key = f"url:{summary_url}"
+    else:
+        key = content_key(podcast_content(row_dict, summary_text), _script_settings())
+    return get_podcast_queue().submit(key, _podcast_job, row_dict, summary_text, summary_url)
+
+def podcast_status(job_id):
+    """
+    Returns the status dict of a podcast job (see JobQueue.status), or None.
+    """
+    return get_podcast_queue().status(job_id)
@@ -0,0 +1,207 @@
+# utilities/db_pool.py
+"""
+Process-wide DuckDB database shared by every Streamlit session.
+
+Streamlit runs each session on its own thread but imports this module once
+per process, so each dataset is loaded a single time here and sessions only
+check out lightweight cursors on the shared database:
+
+    pool = get_pool()
+    pool.ensure_nih(NIH_FILE_PATH)
+    with pool.cursor() as conn:
+        df = query_nih_data(conn, ..., search_index=pool.get("nih"))
+"""
+import os
+import threading
+from contextlib import contextmanager
+
+import duckdb
+
+from utilities import metrics
+from utilities.grants_data import SEARCH_INDEX_NAME as GRANTS_SEARCH_INDEX, create_grants_view, load_search_index
+from utilities.grants_store import STORE_DIR, ensure_store
+from utilities.summary_pipeline import SUMMARY_TABLE
+from utilities.nih_data import (
+    SEARCH_INDEX_NAME as NIH_SEARCH_INDEX,
+    build_search_index as build_nih_search_index,
+    load_nih_data,
+)
+from utilities.search_index import SearchIndex
+from utilities.snapshots import ensure_nih_snapshot, load_snapshot
+
+MAX_IDLE_CURSORS = 32
+
+def _store_alias(path):
+    # The modification time tells a store rebuilt at the same path from the attached one
+    name = os.path.splitext(os.path.basename(path))[0]
+    return f"{name}_{os.stat(path).st_mtime_ns}"
+
+def _attach_grants_store(conn, path, alias=None):
+    """
+    Attaches a Grants.gov store file read-only as `alias` (see _store_alias),
+    unless it is attached already, points the 'grants' view (with its
+    computed GrantStatus) and the search index tables at it and returns the
+    loaded search index. Never detaches anything: other cursors may be
+    reading through the views.
+    """
+    alias = alias or _store_alias(path)
+    quoted_path = path.replace("'", "''")
+    if not conn.execute("SELECT count(*) FROM duckdb_databases() WHERE database_name = ?", [alias]).fetchone()[0]:
+        conn.execute(f"ATTACH '{quoted_path}' AS {alias} (READ_ONLY)")
+    create_grants_view(conn, f"{alias}.grants")
+    tables = [f"{GRANTS_SEARCH_INDEX}_postings", f"{GRANTS_SEARCH_INDEX}_doclen"]
+    conn.execute(f"DROP VIEW IF EXISTS {SUMMARY_TABLE}")
+    # Stores built before summaries were precomputed have no summary table
+    if conn.execute("SELECT count(*) FROM duckdb_tables() WHERE database_name = ? AND table_name = ?",
+                    [alias, SUMMARY_TABLE]).fetchone()[0]:
+        tables.append(SUMMARY_TABLE)
+    for table in tables:
+        conn.execute(f"CREATE OR REPLACE VIEW {table} AS SELECT * FROM {alias}.{table}")
+    return load_search_index(conn)
+
+def _load_nih(conn, file_path):
+    """
+    Loads the NIH data and its search index from the Parquet snapshot of the
+    CSV (see utilities.snapshots), writing the snapshot first if the CSV
+    changed. Falls back to the CSV if the snapshot cannot be written or read.
+    Returns the search index.
+    """
+    try:
+        load_snapshot(conn, ensure_nih_snapshot(file_path))
+    except (OSError, duckdb.Error):
+        load_nih_data(file_path, conn=conn)
+        return build_nih_search_index(conn)
+    return SearchIndex.load(conn, NIH_SEARCH_INDEX)
+
+class ConnectionPool:
+    """
+    A single DuckDB database plus a pool of idle cursors on it.
+    All methods are safe to call from several threads at once.
+    """
+
+    def __init__(self, database=":memory:", max_idle=MAX_IDLE_CURSORS):
+        self._conn = duckdb.connect(database=database)
+        self._lock = threading.Lock()
+        self._idle = []
+        self._max_idle = max_idle
+        self._datasets = {}
+        self._resources = {}
+        self._in_use = 0
+        self._grants_alias = None
+        # Aliases of superseded Grants.gov stores, detached once no cursor is checked out
+        self._retired = []
+
+    def ensure_dataset(self, name, version, loader):
+        """
+        Calls loader(cursor) unless dataset `name` is already loaded at `version`,
+        keeping what the loader returns for get(name). Concurrent callers wait
+        for the first one instead of loading again.
+        """
+        if self._datasets.get(name) == version:
+            return
+        with self._lock:
+            if self._datasets.get(name) == version:
+                return
+            cursor = self._conn.cursor()
+            try:
+                with metrics.timer("dataset_load", dataset=name):
+                    self._resources[name] = loader(cursor)
+            finally:
+                cursor.close()
+            self._datasets[name] = version
+
+    def get(self, name):
+        """
+        Returns what the loader of dataset `name` returned (its search index), or None.
+        """
+        return self._resources.get(name)
+
+    def ensure_nih(self, file_path):
+        """
+        Loads the NIH CSV into the 'nih' table and its search index, once per file version.
+        """
+        version = (file_path, os.path.getmtime(file_path))
+        self.ensure_dataset("nih", version, lambda conn: _load_nih(conn, file_path))
+
+    def ensure_grants(self, store_dir=STORE_DIR):
+        """
+        Exposes the latest Grants.gov store as the 'grants' view, building the
+        store first if there is none yet. Returns the store path.
+        """
+        path = ensure_store(store_dir)
+        version = (path, os.path.getmtime(path))
+
+        def load(conn):
+            alias = _store_alias(path)
+            search_index = _attach_grants_store(conn, path, alias)
+            if self._grants_alias not in (None, alias):
+                self._retired.append(self._grants_alias)
+            self._grants_alias = alias
+            self._detach_retired(conn)
+            return search_index
+
+        self.ensure_dataset("grants", version, load)
+        return path
+
+    def _detach_retired(self, conn):
+        """
+        Detaches the superseded store files (the views now point at the
+        latest one) unless a cursor is checked out and may still be reading
+        them. Called with the pool lock held.
+        """
+        if self._in_use:
+            return
+        while self._retired:
+            conn.execute(f"DETACH DATABASE IF EXISTS {self._retired.pop()}")
+
+    def reset(self, name):
+        """
+        Forgets dataset `name`, so that the next ensure_* call loads it again.
+        """
+        with self._lock:
+            self._datasets.pop(name, None)
+
+    def checkout(self):
+        """
+        Returns an idle cursor, or a new one if none is idle. Give it back with release().
+        """
+        with self._lock:
+            self._in_use += 1
+            if self._idle:
+                return self._idle.pop()
+            return self._conn.cursor()
+
+    def release(self, cursor):
+        with self._lock:
+            self._in_use -= 1
+            if self._retired and not self._in_use:
+                self._detach_retired(cursor)
+            if len(self._idle) < self._max_idle:
+                self._idle.append(cursor)
+                return
+        cursor.close()
+
+    @contextmanager
+    def cursor(self):
+        """
+        Context manager around checkout()/release().
+        """
+        cursor = self.checkout()
+        try:
+            yield cursor
+        finally:
+            self.release(cursor)
+
+_pool = None
+_pool_lock = threading.Lock()
+
+def get_pool():
+    """
+    Returns the process-wide ConnectionPool, creating it on first use.
+    """
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                _pool = ConnectionPool()
+    return _pool
@@ -0,0 +1,174 @@
+# utilities/extract_download.py
+"""
+Streaming, resumable download of the daily GrantsDBExtract zip.
+
+The zip is streamed to funddb/extracts/ in chunks (never held in memory),
+into a .part file that a later attempt resumes with an HTTP Range request.
+A finished download is checked (zip CRCs) and recorded with its SHA-256 in
+a .sha256 file next to it, so the extract of a day is downloaded once and
+reused while its checksum still matches. The last KEEP_EXTRACTS zips are
+kept. If the day's extract is not published yet (404), the previous days
+are tried, up to FALLBACK_DAYS back.
+
+The parser gets a streaming handle into the XML member of the zip:
+
+    path, extract_date = download_extract()
+    with open_extract_xml(path) as xml_file:
+        build_store(xml_file, extract_date)
+"""
+import hashlib
+import os
+import time
+import zipfile
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+
+from utilities.grants_data import GRANTS_EXTRACT_URL, extract_url_for
+from utilities.http_fetch import FETCH_TIMEOUT, get_session
+
+EXTRACT_DIR = os.path.join("funddb", "extracts")
+EXTRACT_PREFIX = "GrantsDBExtract"
+KEEP_EXTRACTS = 3
+FALLBACK_DAYS = 3
+CHUNK_SIZE = 1024 * 1024
+# Download attempts per extract; each one resumes where the previous stopped
+ATTEMPTS = 5
+RETRY_DELAY = 2
+
+def _date_key(extract_date):
+    if isinstance(extract_date, str):
+        return extract_date
+    return extract_date.strftime("%Y%m%d")
+
+def extract_path(extract_date, extract_dir=EXTRACT_DIR):
+    """
+    Returns the local path of the extract zip of a date (date or 'YYYYMMDD').
+    """
+    return os.path.join(extract_dir, f"{EXTRACT_PREFIX}{_date_key(extract_date)}.zip")
+
+def file_sha256(path):
+    """
+    Returns the SHA-256 hex digest of a file, read in chunks.
+    """
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(CHUNK_SIZE), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+def _checksum_path(path):
+    return path + ".sha256"
+
+def is_complete(path):
+    """
+    True if path is a downloaded extract whose recorded checksum still matches.
+    """
+    try:
+        with open(_checksum_path(path), encoding="ascii") as f:
+            expected = f.read().split()[0]
+    except (OSError, IndexError):
+        return False
+    return os.path.exists(path) and file_sha256(path) == expected
+
+def _stream_to_part(url, part_path, session, timeout):
+    """
+    Appends the rest of url to part_path, resuming with a Range request if it
+    already has data. Raises requests.RequestException.
+    """
+    offset = os.path.getsize(part_path) if os.path.exists(part_path) else 0
+    headers = {"Range": f"bytes={offset}-"} if offset else {}
+    with session.get(url, headers=headers, stream=True, timeout=timeout) as response:
+        if response.status_code == 416:
+            # Nothing left past offset: the part file is already complete
+            return
+        response.raise_for_status()
+        # 200 instead of 206: the server ignored the range, start over
+        mode = "ab" if response.status_code == 206 else "wb"
+        with open(part_path, mode) as f:
+            for chunk in response.iter_content(CHUNK_SIZE):
+                f.write(chunk)
+
+def _download(url, path, session, timeout):
+    import requests
+
+    part_path = path + ".part"
+    for attempt in range(1, ATTEMPTS + 1):
+        try:
+            _stream_to_part(url, part_path, session, timeout)
+            break
+        except requests.HTTPError:
+            raise
+        except requests.RequestException:
+            if attempt == ATTEMPTS:
+                raise
+            time.sleep(RETRY_DELAY * attempt)
+
+    try:
+        with zipfile.ZipFile(part_path) as zip_file:
+            bad_member = zip_file.testzip()
+    except zipfile.BadZipFile:
+        bad_member = part_path
+    if bad_member is not None:
+        os.remove(part_path)
+        raise zipfile.BadZipFile(f"Corrupt extract downloaded from {url} ({bad_member})")
+
+    with open(_checksum_path(path), "w", encoding="ascii") as f:
+        f.write(f"{file_sha256(part_path)}  {os.path.basename(path)}\n")
+    os.replace(part_path, path)
+
+def prune_extracts(extract_dir=EXTRACT_DIR, keep=KEEP_EXTRACTS):
+    """
+    Removes all but the `keep` most recent extract zips (and their checksums).
+    """
+    if not os.path.isdir(extract_dir):
+        return
+    zips = sorted(name for name in os.listdir(extract_dir)
+                  if name.startswith(EXTRACT_PREFIX) and name.endswith(".zip"))
+    for name in zips[:-keep] if keep else zips:
+        path = os.path.join(extract_dir, name)
+        for stale in (path, _checksum_path(path)):
+            if os.path.exists(stale):
+                os.remove(stale)
+
+def download_extract(extract_date=None, extract_dir=EXTRACT_DIR, keep=KEEP_EXTRACTS,
+                     fallback_days=FALLBACK_DAYS, base_zip_url=GRANTS_EXTRACT_URL,
+                     session=None, timeout=FETCH_TIMEOUT):
+    """
+    Makes sure the extract zip of extract_date (default: today) is on disk,
+    falling back to earlier days while the server answers 404.
+    Returns (path, 'YYYYMMDD' of the extract actually used).
+    Raises requests.RequestException or zipfile.BadZipFile.
+    """
+    import requests
+
+    extract_date = extract_date or datetime.today()
+    if isinstance(extract_date, str):
+        extract_date = datetime.strptime(extract_date, "%Y%m%d")
+    session = session or get_session()
+    os.makedirs(extract_dir, exist_ok=True)
+
+    for days_back in range(fallback_days + 1):
+        day = extract_date - timedelta(days=days_back)
+        path = extract_path(day, extract_dir)
+        if not is_complete(path):
+            try:
+                _download(extract_url_for(day, base_zip_url), path, session, timeout)
+            except requests.HTTPError as e:
+                # Not published (S3 answers 403 for a missing key)
+                if e.response is not None and e.response.status_code in (403, 404) and days_back < fallback_days:
+                    continue
+                raise
+        prune_extracts(extract_dir, keep)
+        return path, _date_key(day)
+
+@contextmanager
+def open_extract_xml(path):
+    """
+    Yields a binary file object streaming the XML member of an extract zip.
+    Raises IndexError if the zip holds no XML file.
+    """
+    with zipfile.ZipFile(path) as zip_file:
+        # Assuming there's only one XML file
+        xml_file_name = [name for name in zip_file.namelist() if name.endswith(".xml")][0]
+        with zip_file.open(xml_file_name) as xml_file:
+            yield xml_file
@@ -0,0 +1,104 @@
+# utilities/fast_lsa.py
+"""
+Drop-in replacement for Sumy's LsaSummarizer that avoids the full dense SVD.
+
+Sumy rates sentence j as sqrt(sum_i sigma_i^2 * v_ij^2) over the kept
+singular values, on the smoothed term-by-sentence matrix A. With every
+singular value kept (Sumy's REDUCTION_RATIO is 1), that sum is the squared
+norm of column j of A (A^T A = V S^2 V^T), so no SVD is needed at all: the
+ratings come straight from the word counts of each sentence, which are
+sparse. When a lower rank is asked for (REDUCTION_RATIO < 1), only that
+many singular values are computed, with a randomized truncated SVD.
+
+Each word is stemmed once per document, where Sumy stems every word twice.
+"""
+import math
+from collections import Counter
+
+import numpy
+from sumy.summarizers.lsa import LsaSummarizer
+
+# Smoothing of Sumy's maximum TF normalization
+SMOOTH = 0.4
+# Extra dimensions and power iterations of the randomized SVD
+OVERSAMPLES = 10
+POWER_ITERATIONS = 2
+
+def randomized_svd(matrix, rank, oversamples=OVERSAMPLES, iterations=POWER_ITERATIONS, seed=0):
+    """
+    Returns (sigma, vt) of the `rank` largest singular values of a dense matrix
+    (Halko, Martinsson & Tropp), like numpy.linalg.svd(..., full_matrices=False)[1:]
+    truncated to rank.
+    """
+    rows, cols = matrix.shape
+    size = min(rank + oversamples, rows, cols)
+    rng = numpy.random.default_rng(seed)
+    q, _ = numpy.linalg.qr(matrix @ rng.standard_normal((cols, size)))
+    for _ in range(iterations):
+        q, _ = numpy.linalg.qr(matrix.T @ q)
+        q, _ = numpy.linalg.qr(matrix @ q)
+    _, sigma, vt = numpy.linalg.svd(q.T @ matrix, full_matrices=False)
+    return sigma[:rank], vt[:rank]
+
+class FastLsaSummarizer(LsaSummarizer):
+    """
+    LsaSummarizer with the same sentence ratings, computed from sparse counts.
+    """
+
+    def __call__(self, document, sentences_count):
+        ranks = self.rate_sentences(document)
+        if ranks is None:
+            return ()
+        ranks = iter(ranks)
+        return self._get_best_sentences(document.sentences, sentences_count, lambda s: next(ranks))
+
+    def rate_sentences(self, document):
+        """
+        Returns the LSA rating of each sentence of document, in order,
+        or None if the document has no words to rate.
+        """
+        stems = {}
+
+        def stem(word):
+            normalized = self.normalize_word(word)
+            if normalized not in stems:
+                stems[normalized] = self._stemmer(normalized)
+            return normalized, stems[normalized]
+
+        # Same dictionary as Sumy: stems of every non-stop word of the document
+        dictionary = {s for w, s in map(stem, document.words) if w not in self._stop_words}
+        if not dictionary:
+            return None
+
+        sentences = document.sentences
+        counts = [Counter(s for _, s in map(stem, sentence.words) if s in dictionary) for sentence in sentences]
+        dimensions = max(self.MIN_DIMENSIONS, int(min(len(dictionary), len(sentences)) * self.REDUCTION_RATIO))
+        if dimensions >= min(len(dictionary), len(sentences)):
+            return self._column_norms(counts, len(dictionary))
+        return self._truncated_ranks(counts, dictionary, dimensions)
+
+    @staticmethod
+    def _column_norms(counts, words_count):
+        ranks = []
+        for sentence_counts in counts:
+            if not sentence_counts:
+                ranks.append(0.0)
+                continue
+            # Absent words are smoothed to SMOOTH, present ones to SMOOTH + (1 - SMOOTH) * tf
+            max_count = max(sentence_counts.values())
+            present = sum((SMOOTH + (1.0 - SMOOTH) * c / max_count) ** 2 for c in sentence_counts.values())
+            ranks.append(math.sqrt(present + (words_count - len(sentence_counts)) * SMOOTH ** 2))
+        return ranks
+
+    def _truncated_ranks(self, counts, dictionary, dimensions):
+        rows = {word: i for i, word in enumerate(sorted(dictionary))}
+        matrix = numpy.zeros((len(rows), len(counts)))
+        for col, sentence_counts in enumerate(counts):
+            if not sentence_counts:
+                continue
+            max_count = max(sentence_counts.values())
+            matrix[:, col] = SMOOTH
+            for word, c in sentence_counts.items():
+                matrix[rows[word], col] = SMOOTH + (1.0 - SMOOTH) * c / max_count
+        sigma, vt = randomized_svd(matrix, dimensions)
+        return numpy.sqrt((sigma[:, None] ** 2 * vt ** 2).sum(axis=0)).tolist()
@@ -1,39 +1,206 @@
 # utilities/grant_sumy.py
+"""
+Summarizer service shared by both pages and the summary pipeline.
 
-import os
-import nltk
+The Sumy objects a summary needs (Tokenizer with its Punkt model, and a
+summarizer with its Stemmer and stop words) are built once per language
+(and algorithm) per process and reused. They hold no per-call state after
+construction, so one set is shared by every thread; only their
+construction is locked.
 
-# --- 1) Instruct NLTK where to find local data (adjust as needed) ---
-# This assumes your tokenizers are in "src/nltk_data/tokenizers/punkt/english/" etc.
-nltk.data.path.append(os.path.join("src", "nltk_data"))
+    summarize_text(text)                    # plain text
+    summarize_html(html, url)               # a fetched page
+    summarize_many(texts)                   # a batch, in order
+    summarize_url(url)                      # fetch + summarize_html
 
-from sumy.parsers.plaintext import PlaintextParser
-from sumy.nlp.tokenizers import Tokenizer
-from sumy.summarizers.lsa import LsaSummarizer as Summarizer
-from sumy.nlp.stemmers import Stemmer
-from sumy.utils import get_stop_words
+Every function takes an `algorithm` (see SUMMARIZERS), or "auto" to pick
+the best one whose estimated cost for the document fits `budget_ms`.
+SUMMARY_MODES holds the settings pages use, e.g.
+summarize_text(text, **SUMMARY_MODES["preview"]).
+
+Sumy and NLTK (about 0.3 s to import) are only imported by the first
+summary, so pages can import this module for SUMMARY_MODES at no cost.
+"""
+
+import importlib
+import threading
+
+from utilities import http_fetch, metrics
+from utilities.summary_cache import get_cache, summary_key
 
 DEFAULT_LANGUAGE = "english"
 DEFAULT_SENTENCES_COUNT = 10
+NO_DESCRIPTION = "No description to summarize."
+
+# Summarizer classes by import path, imported on first use (see summarizer_class)
+SUMMARIZERS = {
+    "lsa": "utilities.fast_lsa.FastLsaSummarizer",
+    "lexrank": "utilities.summarizers.LexRankSummarizer",
+    "centroid": "utilities.summarizers.CentroidSummarizer",
+    "luhn": "sumy.summarizers.luhn.LuhnSummarizer",
+    "lead": "utilities.summarizers.LeadSummarizer",
+}
+DEFAULT_ALGORITHM = "lsa"
+AUTO = "auto"
+# "auto" takes the first of these whose estimated cost fits the budget (else the last)
+AUTO_ORDER = ("lexrank", "lsa", "lead")
+# Estimated summarizer ms per sentence and per pair of sentences of a document
+# (LexRank compares sentences pairwise), from benchmarks/bench_summary_modes.py
+COST_MS = {
+    "lexrank": (0.07, 0.0014),
+    "lsa": (0.03, 0.0),
+    "centroid": (0.03, 0.0),
+    "luhn": (0.4, 0.0),
+    "lead": (0.0, 0.0),
+}
+DEFAULT_BUDGET_MS = 20
+
+SUMMARY_MODES = {
+    # Short and cheap, for a quick look at a card
+    "preview": {"algorithm": AUTO, "sentence_count": 3, "budget_ms": 5},
+    # The summary precomputed for Grants.gov (see summary_pipeline)
+    "quality": {"algorithm": DEFAULT_ALGORITHM, "sentence_count": DEFAULT_SENTENCES_COUNT},
+}
+
+_tokenizers = {}
+_summarizers = {}
+_components_lock = threading.Lock()
+
+def get_tokenizer(language=DEFAULT_LANGUAGE):
+    """
+    Returns the Tokenizer for language, building it on first use.
+    """
+    tokenizer = _tokenizers.get(language)
+    if tokenizer is None:
+        with _components_lock:
+            tokenizer = _tokenizers.get(language)
+            if tokenizer is None:
+                # Punkt models come from the compact store in src/punkt (see utilities.punkt_store)
+                from utilities.punkt_store import StoreTokenizer
+                tokenizer = _tokenizers[language] = StoreTokenizer(language)
+    return tokenizer
 
-def summarize_text(text, language=DEFAULT_LANGUAGE, sentence_count=DEFAULT_SENTENCES_COUNT):
+def summarizer_class(algorithm):
     """
-    Summarize a block of text using Sumy's LSA summarizer.
+    Returns the summarizer class of `algorithm` (a SUMMARIZERS key), importing it.
+    """
+    if algorithm not in SUMMARIZERS:
+        raise ValueError(f"Unknown summarization algorithm: {algorithm!r}")
+    module, _, name = SUMMARIZERS[algorithm].rpartition(".")
+    return getattr(importlib.import_module(module), name)
+
+def get_summarizer(language=DEFAULT_LANGUAGE, algorithm=DEFAULT_ALGORITHM):
+    """
+    Returns the summarizer of `algorithm` (a SUMMARIZERS key) for language, building it on first use.
+    """
+    summarizer = _summarizers.get((language, algorithm))
+    if summarizer is None:
+        cls = summarizer_class(algorithm)
+        from sumy.nlp.stemmers import Stemmer
+        from sumy.utils import get_stop_words
+        with _components_lock:
+            summarizer = _summarizers.get((language, algorithm))
+            if summarizer is None:
+                summarizer = cls(Stemmer(language))
+                summarizer.stop_words = get_stop_words(language)
+                _summarizers[(language, algorithm)] = summarizer
+    return summarizer
+
+def choose_algorithm(sentences, budget_ms=DEFAULT_BUDGET_MS):
+    """
+    Returns the algorithm "auto" uses for a document of `sentences` sentences.
+    """
+    for algorithm in AUTO_ORDER:
+        per_sentence, per_pair = COST_MS[algorithm]
+        if per_sentence * sentences + per_pair * sentences * sentences <= budget_ms:
+            return algorithm
+    return AUTO_ORDER[-1]
+
+def _cache_algorithm(algorithm, budget_ms):
+    # "auto" picks by document, so its summaries are keyed by the budget instead
+    if algorithm == AUTO:
+        return f"{AUTO}:{budget_ms}"
+    if algorithm not in SUMMARIZERS:
+        raise ValueError(f"Unknown summarization algorithm: {algorithm!r}")
+    return algorithm
+
+def _summarize_document(document, language, sentence_count, algorithm, budget_ms):
+    if algorithm == AUTO:
+        algorithm = choose_algorithm(len(document.sentences), budget_ms)
+    summarizer = get_summarizer(language, algorithm)
+    with metrics.timer("summarizer", algorithm=algorithm):
+        return " ".join(str(s) for s in summarizer(document, sentence_count))
+
+@metrics.timed("summarize", source="text")
+def summarize_text(text, language=DEFAULT_LANGUAGE, sentence_count=DEFAULT_SENTENCES_COUNT,
+                   algorithm=DEFAULT_ALGORITHM, budget_ms=DEFAULT_BUDGET_MS, cache=True):
+    """
+    Summarize a block of text with the summarizer of `algorithm` (LSA by
+    default, see SUMMARIZERS).
 
     :param text: The text to summarize (string)
     :param language: The language to use (default "english")
     :param sentence_count: How many sentences to include in the summary
+    :param algorithm: A SUMMARIZERS key, or "auto"
+    :param budget_ms: Summarizer time budget for "auto"
+    :param cache: False to neither read nor write the summary cache
     :return: A string containing the summarized sentences.
+
+    Summaries are cached (see utilities.summary_cache), so the same text is
+    only summarized once across sessions.
     """
     if not text or not text.strip():
-        return "No description to summarize."
+        return NO_DESCRIPTION
+    key = summary_key(text, language, sentence_count, _cache_algorithm(algorithm, budget_ms))
+
+    def compute():
+        # 2) Use Sumy’s PlaintextParser and the shared Tokenizer
+        from sumy.parsers.plaintext import PlaintextParser
+        with metrics.timer("parse", parser="text"):
+            parser = PlaintextParser.from_string(text, get_tokenizer(language))
+        return _summarize_document(parser.document, language, sentence_count, algorithm, budget_ms)
+
+    if not cache:
+        return compute()
+    return get_cache().get_or_compute(key, compute)
+
+@metrics.timed("summarize", source="html")
+def summarize_html(html, url=None, language=DEFAULT_LANGUAGE, sentence_count=DEFAULT_SENTENCES_COUNT,
+                   algorithm=DEFAULT_ALGORITHM, budget_ms=DEFAULT_BUDGET_MS):
+    """
+    Summarize an HTML page like summarize_text. `html` is a string, or the
+    raw bytes of a fetched page, whose encoding the parser detects from its
+    <meta charset> (UTF-8 otherwise). `url` is only used to resolve relative links.
+    """
+    if not html or not html.strip():
+        return NO_DESCRIPTION
+    key = summary_key(html, language, sentence_count, _cache_algorithm(algorithm, budget_ms))
+
+    def compute():
+        from sumy.parsers.html import HtmlParser
+        with metrics.timer("parse", parser="html"):
+            parser = HtmlParser.from_string(html, url, get_tokenizer(language))
+        return _summarize_document(parser.document, language, sentence_count, algorithm, budget_ms)
+
+    return get_cache().get_or_compute(key, compute)
+
+def summarize_many(texts, language=DEFAULT_LANGUAGE, sentence_count=DEFAULT_SENTENCES_COUNT,
+                   algorithm=DEFAULT_ALGORITHM, budget_ms=DEFAULT_BUDGET_MS, cache=True):
+    """
+    Summarize each text of an iterable; returns the summaries in the same order.
+    """
+    return [summarize_text(text, language, sentence_count, algorithm, budget_ms, cache) for text in texts]
 
-    # 2) Use Sumy’s PlaintextParser and Tokenizer with local nltk_data
-    parser = PlaintextParser.from_string(text, Tokenizer(language))
-    stemmer = Stemmer(language)
-    summarizer = Summarizer(stemmer)
-    summarizer.stop_words = get_stop_words(language)
+def summarize_url(url, language=DEFAULT_LANGUAGE, sentence_count=DEFAULT_SENTENCES_COUNT,
+                  algorithm=DEFAULT_ALGORITHM, budget_ms=DEFAULT_BUDGET_MS):
+    """
+    Summarize the web page at `url` like summarize_text.
 
-    summary_sentences = summarizer(parser.document, sentence_count)
-    summary = " ".join(str(s) for s in summary_sentences)
-    return summary
\ No newline at end of file
+    The page comes from utilities.http_fetch (pooled connections, on-disk
+    cache with revalidation) and its summary is cached under the page
+    content, so an unchanged page is neither downloaded nor summarized again.
+    Raises requests.RequestException if the page cannot be fetched.
+    """
+    page = http_fetch.fetch(url)
+    # The raw bytes: the parser reads the page's own <meta charset>
+    return summarize_html(page["content"], url, language, sentence_count, algorithm, budget_ms)
@@ -1,160 +1,503 @@
-# utilities/grants_data.py
-
-import duckdb
-import pandas as pd
-import xml.etree.ElementTree as ET
-import re
-from datetime import datetime
-import requests
-import zipfile
-import io
-import os
-import streamlit as st
-
-def parse_xml(xml_source):
-    """
-    Dynamically parses the XML, removing namespaces so that tags like
-    '{http://apply.grants.gov/system/OpportunityDetail-V1.0}OpportunityID'
-    become simply 'OpportunityID'.
-    """
-    tree = ET.parse(xml_source)
-    root = tree.getroot()
-
-    def strip_ns(tag):
-        return re.sub(r'{.*}', '', tag)
-
-    # Strip namespaces in the entire XML
-    for elem in root.iter():
-        elem.tag = strip_ns(elem.tag)
-
-    records = []
-    for parent in root.iter():
-        opp_id_elem = parent.find('.//OpportunityID')
-        if opp_id_elem is not None:
-            record = {}
-            for child in parent:
-                tag_name = child.tag
-                value = child.text.strip() if child.text else None
-
-                # If repeated tag, store in a list
-                if tag_name in record:
-                    if isinstance(record[tag_name], list):
-                        record[tag_name].append(value)
-                    else:
-                        record[tag_name] = [record[tag_name], value]
-                else:
-                    record[tag_name] = value
-            records.append(record)
-
-    return records
-
-def load_data_into_duckdb_from_memory(xml_data):
-    """
-    Loads XML data (bytes) into an in-memory DuckDB table named 'grants'.
-    Returns the DuckDB connection.
-    Raises ValueError if no records are found.
-    """
-    # Parse in memory using BytesIO
-    with io.BytesIO(xml_data) as buffer:
-        records = parse_xml(buffer)
-
-    if not records:
-        raise ValueError("No records found in XML data (bytes).")
-
-    df = pd.DataFrame(records)
-    df.dropna(how="all", inplace=True)
-
-    conn = duckdb.connect(database=':memory:')
-    conn.execute("CREATE TABLE grants AS SELECT * FROM df")
-    return conn
-
-def query_grants(conn,
-                 title_search='',
-                 id_search='',
-                 number_search='',
-                 agency_search='',
-                 description_search=''):
-    sql = "SELECT * FROM grants WHERE 1=1"
-
-    if title_search:
-        sql += f" AND OpportunityTitle ILIKE '%{title_search}%'"
-    if id_search:
-        sql += f" AND OpportunityID ILIKE '%{id_search}%'"
-    if number_search:
-        sql += f" AND OpportunityNumber ILIKE '%{number_search}%'"
-    if agency_search:
-        sql += f" AND AgencyName ILIKE '%{agency_search}%'"
-    if description_search:
-        sql += f" AND Description ILIKE '%{description_search}%'"
-
-    return conn.execute(sql).fetchdf()
-
-def get_unique_values(conn, column):
-    query = f"SELECT DISTINCT {column} FROM grants WHERE {column} IS NOT NULL ORDER BY {column}"
-    df = conn.execute(query).fetchdf()
-    return df[column].tolist()
-
-def get_grant_status(close_date_str):
-    if not close_date_str:
-        return "No close date"
-    try:
-        close_dt = datetime.strptime(close_date_str, "%m%d%Y")
-        now = datetime.now()
-        return "Retired" if close_dt < now else "Active"
-    except ValueError:
-        return "No close date"
-
-def top_10_agencies_by_budget(df):
-    df["AwardCeiling"] = pd.to_numeric(df["AwardCeiling"], errors='coerce')
-    df["EstimatedTotalProgramFunding"] = pd.to_numeric(df["EstimatedTotalProgramFunding"], errors='coerce')
-    df["TotalBudget"] = df["AwardCeiling"].fillna(0) + df["EstimatedTotalProgramFunding"].fillna(0)
-    grouped = df.groupby('AgencyName')["TotalBudget"].sum().reset_index()
-    return grouped.sort_values("TotalBudget", ascending=False).head(10)
-
-def top_10_agencies_by_count(df):
-    freq_df = df["AgencyName"].value_counts().reset_index()
-    freq_df.columns = ["AgencyName", "Frequency"]
-    return freq_df.head(10)
-
-def download_and_extract_xml(st, base_zip_url="https://prod-grants-gov-chatbot.s3.amazonaws.com/extracts/GrantsDBExtractYYYYMMDDv2.zip", grants_xml_data=None):
-    """
-    Downloads and extracts the Grants.gov XML data from a zip file, returning bytes.
-
-    Args:
-        st: Streamlit object for UI elements.
-        base_zip_url (str, optional): The base URL for the zip file. Defaults to GrantsDBExtractYYYYMMDDv2.zip
-        grants_xml_data (bytes, optional): If already available, pass it.
-    Returns:
-        bytes: The raw XML data or None if an error occurred.
-    """
-    if grants_xml_data:
-        # If we somehow already have bytes, return them
-        return grants_xml_data
-
-    # Otherwise attempt to download from the URL
-    today = datetime.today().strftime("%Y%m%d")
-    zip_url = base_zip_url.replace("YYYYMMDD", today)
-
-    try:
-        response = requests.get(zip_url)
-        response.raise_for_status()
-
-        zip_file = zipfile.ZipFile(io.BytesIO(response.content))
-        # Assuming there's only one XML file
-        xml_file_name = [name for name in zip_file.namelist() if name.endswith(".xml")][0]
-
-        with zip_file.open(xml_file_name) as source:
-            xml_data = source.read()
-
-        st.success(f"Successfully downloaded XML from {zip_url} without saving locally.")
-        return xml_data
-
-    except requests.exceptions.RequestException as e:
-        st.error(f"Error downloading XML from {zip_url}: {e}")
-    except zipfile.BadZipFile:
-        st.error(f"Error: Could not open the zip file from {zip_url}. It may not be valid.")
-    except IndexError:
-        st.error(f"Error: No XML file found inside the zip archive at {zip_url}.")
-    except Exception as e:
-        st.error(f"An unexpected error occurred: {e}")
-    return None
+# utilities/grants_data.py
+
+import duckdb
+import pandas as pd
+import xml.etree.ElementTree as ET
+from datetime import datetime
+import zipfile
+import io
+import os
+import streamlit as st
+from utilities import metrics, pagination, query_builder
+from utilities.search_index import SearchIndex
+
+OPPORTUNITY_ID_TAG = "OpportunityID"
+DEFAULT_BATCH_SIZE = 5000
+
+SEARCH_INDEX_NAME = "grants_search"
+SEARCH_FIELDS = ("OpportunityTitle", "Description", "AgencyName")
+TITLE_SEARCH_FIELDS = ("OpportunityTitle",)
+
+# Extract columns stored with a real type instead of VARCHAR. Values that do
+# not parse (blank, 'none', '1,000') become NULL.
+DATE_COLUMNS = ("PostDate", "CloseDate", "LastUpdatedDate", "ArchiveDate")
+EXTRACT_DATE_FORMAT = "%m%d%Y"
+MONEY_COLUMNS = ("AwardCeiling", "AwardFloor", "EstimatedTotalProgramFunding")
+MONEY_TYPE = "DECIMAL(18, 2)"
+COUNT_COLUMNS = ("ExpectedNumberOfAwards",)
+
+TOP_AGENCIES = 10
+
+# Status of an opportunity, computed by DuckDB from the typed CloseDate
+GRANT_STATUS_SQL = """CASE WHEN CloseDate IS NULL THEN 'No close date'
+     WHEN CloseDate <= current_date THEN 'Retired'
+     ELSE 'Active' END"""
+
+def _local_name(tag):
+    """
+    Returns the tag without its namespace, so that
+    '{http://apply.grants.gov/system/OpportunityDetail-V1.0}OpportunityID'
+    becomes simply 'OpportunityID'.
+    """
+    return tag.rsplit('}', 1)[-1]
+
+def _is_opportunity_id(tag):
+    return tag == OPPORTUNITY_ID_TAG or tag.endswith('}' + OPPORTUNITY_ID_TAG)
+
+def _element_to_record(elem):
+    """
+    Builds a record from the direct children of an opportunity element.
+    Repeated tags are stored as a list, in document order.
+    """
+    record = {}
+    for child in elem:
+        tag_name = _local_name(child.tag)
+        value = child.text.strip() if child.text else None
+
+        # If repeated tag, store in a list
+        if tag_name in record:
+            if isinstance(record[tag_name], list):
+                record[tag_name].append(value)
+            else:
+                record[tag_name] = [record[tag_name], value]
+        else:
+            record[tag_name] = value
+    return record
+
+def iter_opportunity_records(xml_source):
+    """
+    Streams the opportunity records out of a GrantsDBExtract file (path or
+    file object) with iterparse, yielding one dict per element that directly
+    contains an OpportunityID. Tags are matched without their namespace.
+
+    Elements are cleared as soon as they have been consumed, so memory use
+    stays flat regardless of the size of the extract.
+    """
+    stack = []
+    opportunity_elems = set()
+
+    for event, elem in ET.iterparse(xml_source, events=("start", "end")):
+        if event == "start":
+            stack.append(elem)
+            continue
+
+        stack.pop()
+        if len(elem):
+            if id(elem) in opportunity_elems:
+                opportunity_elems.discard(id(elem))
+                yield _element_to_record(elem)
+                elem.clear()
+        elif stack and _is_opportunity_id(elem.tag):
+            opportunity_elems.add(id(stack[-1]))
+
+        # Everything below a finished top-level element has been consumed
+        if len(stack) == 1:
+            stack[0].clear()
+
+def parse_xml(xml_source):
+    """
+    Parses the XML into a list of opportunity records, removing namespaces
+    from the tag names. Prefer iter_opportunity_records or
+    load_xml_into_duckdb for full extracts, which never hold the whole list.
+    """
+    return list(iter_opportunity_records(xml_source))
+
+def iter_record_batches(records, batch_size=DEFAULT_BATCH_SIZE):
+    """
+    Groups an iterable of records into lists of at most batch_size records.
+    """
+    batch = []
+    for record in records:
+        batch.append(record)
+        if len(batch) >= batch_size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+def _records_to_frame(records):
+    """
+    Converts a batch of records to a DataFrame of strings. Repeated tags are
+    rendered as the string form of their list, which is how DuckDB stored
+    them when whole DataFrames were loaded at once.
+    """
+    rows = [
+        {key: str(value) if isinstance(value, list) else value for key, value in record.items()}
+        for record in records
+    ]
+    df = pd.DataFrame(rows, dtype=object)
+    df.dropna(how="all", inplace=True)
+    return df
+
+def load_xml_into_duckdb(xml_source, conn=None, table="grants", batch_size=DEFAULT_BATCH_SIZE):
+    """
+    Streams the XML (path or file object) into a DuckDB table in batches of
+    batch_size records. Columns are VARCHAR and are added as new tags show up.
+    Returns the DuckDB connection (a new in-memory one if conn is None).
+    Raises ValueError if no records are found.
+    """
+    if conn is None:
+        conn = duckdb.connect(database=':memory:')
+
+    columns = set()
+    total_rows = 0
+    records = iter_opportunity_records(xml_source)
+    for batch in iter_record_batches(records, batch_size):
+        df = _records_to_frame(batch)
+        if df.empty:
+            continue
+
+        new_columns = [col for col in df.columns if col not in columns]
+        if not columns:
+            column_defs = ", ".join(f'"{col}" VARCHAR' for col in new_columns)
+            conn.execute(f"CREATE OR REPLACE TABLE {table} ({column_defs})")
+        else:
+            for col in new_columns:
+                conn.execute(f'ALTER TABLE {table} ADD COLUMN "{col}" VARCHAR')
+        columns.update(new_columns)
+
+        conn.register("grants_batch", df)
+        try:
+            conn.execute(f"INSERT INTO {table} BY NAME SELECT * FROM grants_batch")
+        finally:
+            conn.unregister("grants_batch")
+        total_rows += len(df)
+
+    if not total_rows:
+        raise ValueError("No records found in XML data.")
+    return conn
+
+def typed_select_sql(columns):
+    """
+    Returns a SELECT list over the raw VARCHAR extract columns that parses the
+    date, money and count columns into DATE, DECIMAL and INTEGER.
+    """
+    exprs = []
+    for col in columns:
+        if col in DATE_COLUMNS:
+            exprs.append(f'CAST(try_strptime("{col}", \'{EXTRACT_DATE_FORMAT}\') AS DATE) AS "{col}"')
+        elif col in MONEY_COLUMNS:
+            exprs.append(f'TRY_CAST("{col}" AS {MONEY_TYPE}) AS "{col}"')
+        elif col in COUNT_COLUMNS:
+            exprs.append(f'TRY_CAST("{col}" AS INTEGER) AS "{col}"')
+        else:
+            exprs.append(f'"{col}"')
+    return ", ".join(exprs)
+
+def create_grants_view(conn, source):
+    """
+    Creates (or replaces) the 'grants' view the pages query: the typed table
+    `source` plus the computed GrantStatus column.
+    """
+    conn.execute(f"CREATE OR REPLACE VIEW grants AS SELECT *, {GRANT_STATUS_SQL} AS GrantStatus FROM {source}")
+
+def load_data_into_duckdb_from_memory(xml_data):
+    """
+    Loads XML data (bytes) into an in-memory DuckDB database, typed as
+    described by typed_select_sql and exposed as the 'grants' view.
+    Returns the DuckDB connection.
+    Raises ValueError if no records are found.
+    """
+    with io.BytesIO(xml_data) as buffer:
+        conn = load_xml_into_duckdb(buffer, table="grants_raw")
+    columns = [row[0] for row in conn.execute("DESCRIBE grants_raw").fetchall()]
+    conn.execute(f"CREATE TABLE grants_typed AS SELECT {typed_select_sql(columns)} FROM grants_raw")
+    conn.execute("DROP TABLE grants_raw")
+    create_grants_view(conn, "grants_typed")
+    return conn
+
+def load_search_index(conn):
+    """
+    Loads the full-text index stored next to the 'grants' table (see grants_store).
+    """
+    return SearchIndex.load(conn, SEARCH_INDEX_NAME)
+
+def _grant_filters(title_search, id_search, number_search, agency_search,
+                   description_search, status, search_index):
+    """
+    Returns (filters, hits) for the sidebar searches: the query_builder
+    filters, and the full-text hits DataFrame (None without a search_index
+    or searchable terms, in which case the text searches become filters).
+    """
+    hits = None
+    if search_index is not None:
+        hits = search_index.search_all([(title_search, TITLE_SEARCH_FIELDS),
+                                        (description_search, SEARCH_FIELDS)])
+
+    filters = [
+        ("OpportunityID", "contains", id_search),
+        ("OpportunityNumber", "contains", number_search),
+        ("AgencyName", "contains", agency_search),
+        ("GrantStatus", "equals", status),
+    ]
+    if hits is None:
+        filters += [
+            ("OpportunityTitle", "contains", title_search),
+            ("Description", "contains", description_search),
+        ]
+    return filters, hits
+
+@metrics.timed("query", rows=len, query="grants")
+def query_grants(conn,
+                 title_search='',
+                 id_search='',
+                 number_search='',
+                 agency_search='',
+                 description_search='',
+                 status='All',
+                 search_index=None):
+    """
+    Queries the 'grants' view. With a search_index, title_search runs a
+    ranked full-text search over OpportunityTitle and description_search
+    one over OpportunityTitle, Description and AgencyName, and results come
+    best match first; otherwise both are substring matches.
+    status ('Active', 'Retired', 'No close date' or 'All') filters on GrantStatus.
+    """
+    filters, hits = _grant_filters(title_search, id_search, number_search, agency_search,
+                                   description_search, status, search_index)
+    if hits is None:
+        return query_builder.select(conn, "grants", filters)
+
+    conn.register("search_hits", hits)
+    try:
+        return query_builder.select(
+            conn, "grants", filters,
+            columns="grants.*",
+            joins="JOIN search_hits ON grants.OpportunityID = search_hits.doc_id",
+            order_by="search_hits.score DESC, search_hits.doc_id",
+        )
+    finally:
+        conn.unregister("search_hits")
+
+# Columns the page statistics need; full rows are only read for the page itself
+_PAGE_STAT_COLUMNS = "grants.OpportunityID, grants.AgencyName, grants.AwardCeiling, grants.EstimatedTotalProgramFunding"
+
+def grants_sort_keys(searched):
+    """
+    Sort keys of query_grants_page: best match first when searching, by OpportunityID otherwise.
+    """
+    if searched:
+        return [("SearchScore", True), ("OpportunityID", False)]
+    return [("OpportunityID", False)]
+
+def _page_sql(conditions, selection, searched, has_cursor):
+    """
+    SQL of query_grants_page for the given filter conditions, agency
+    selection conditions, whether search_hits is joined and whether a page
+    cursor is given. Parameters are the filter values, then the selection
+    values, then the cursor values and the page size.
+    """
+    if searched:
+        filtered = query_builder.build_select(
+            "grants", conditions,
+            columns=f"{_PAGE_STAT_COLUMNS}, search_hits.score AS SearchScore",
+            joins="JOIN search_hits ON grants.OpportunityID = search_hits.doc_id",
+        )
+    else:
+        filtered = query_builder.build_select("grants", conditions, columns=_PAGE_STAT_COLUMNS)
+    selected = query_builder.build_select("filtered", selection, first_param=len(conditions) + 1)
+    sort_keys = grants_sort_keys(searched)
+    order_by = pagination.order_by_sql(sort_keys)
+    next_param = len(conditions) + len(selection) + 1
+    after = "true"
+    if has_cursor:
+        after = pagination.keyset_condition(sort_keys, next_param)
+        next_param += len(sort_keys)
+
+    return f"""
+        WITH filtered AS MATERIALIZED ({filtered}),
+             selected AS ({selected}),
+             totals AS (
+                 SELECT count(*) AS page_total,
+                        count(*) FILTER (WHERE {after}) AS page_remaining,
+                        count(DISTINCT AgencyName) AS page_unique_agencies,
+                        coalesce(sum(EstimatedTotalProgramFunding), 0) AS page_total_funding
+                 FROM selected
+             ),
+             budgets AS (
+                 SELECT AgencyName,
+                        sum(coalesce(AwardCeiling, 0) + coalesce(EstimatedTotalProgramFunding, 0)) AS budget,
+                        count(*) AS n
+                 FROM filtered WHERE AgencyName IS NOT NULL GROUP BY AgencyName
+             ),
+             tops AS (
+                 SELECT coalesce(list(AgencyName ORDER BY budget DESC, AgencyName)[:{TOP_AGENCIES}], [])
+                            AS page_top_by_budget,
+                        coalesce(list(AgencyName ORDER BY n DESC, AgencyName)[:{TOP_AGENCIES}], [])
+                            AS page_top_by_count
+                 FROM budgets
+             ),
+             page_ids AS (
+                 SELECT * FROM selected WHERE {after} ORDER BY {order_by} LIMIT ${next_param}
+             ),
+             page AS (
+                 SELECT grants.*{", page_ids.SearchScore" if searched else ""}
+                 FROM page_ids JOIN grants ON grants.OpportunityID = page_ids.OpportunityID
+             )
+        SELECT totals.*, tops.*, page.*
+        FROM totals CROSS JOIN tops LEFT JOIN page ON true
+        ORDER BY {order_by}
+    """
+
+@metrics.timed("query", rows=lambda result: result["total"], query="grants_page")
+def query_grants_page(conn,
+                      title_search='',
+                      id_search='',
+                      number_search='',
+                      agency_search='',
+                      description_search='',
+                      status='All',
+                      agencies=None,
+                      after=None,
+                      page_size=pagination.DEFAULT_PAGE_SIZE,
+                      search_index=None):
+    """
+    Runs the whole Grants.gov page in one DuckDB query instead of fetching
+    every matching row. Takes the query_grants searches, plus `agencies` (an
+    optional list of AgencyName values to narrow to) and the page to return:
+    the page_size rows after the cursor `after` (see utilities.pagination),
+    or the first ones if it is None.
+    Returns a dict with:
+      - page: DataFrame of at most page_size rows (best match first when
+        searching, by OpportunityID otherwise)
+      - next_cursor: the cursor of the next page, or None on the last page
+      - total, unique_agencies, total_funding: over all rows matching the
+        searches and the agency selection
+      - top_by_budget, top_by_count: the 10 agencies with the largest
+        AwardCeiling + EstimatedTotalProgramFunding and the most
+        opportunities, over the rows matching the searches
+    """
+    filters, hits = _grant_filters(title_search, id_search, number_search, agency_search,
+                                   description_search, status, search_index)
+    searched = hits is not None
+    active = query_builder.active_filters(filters)
+    selection = query_builder.active_filters([("AgencyName", "in", list(agencies or []))])
+    conditions = tuple((column, op) for column, op, _ in active)
+    selection_conditions = tuple((column, op) for column, op, _ in selection)
+    has_cursor = after is not None
+    params = (query_builder.filter_params(active) + query_builder.filter_params(selection)
+              + list(after or ()) + [int(page_size)])
+    key = ("grants_page", conditions, selection_conditions, searched, has_cursor)
+    build_sql = lambda: _page_sql(conditions, selection_conditions, searched, has_cursor)
+
+    if searched:
+        conn.register("search_hits", hits)
+    try:
+        df = query_builder.execute(conn, key, build_sql, params).fetchdf()
+    finally:
+        if searched:
+            conn.unregister("search_hits")
+
+    stats = df.iloc[0]
+    remaining = int(stats["page_remaining"])
+    page_df = df.iloc[:min(int(page_size), remaining)]
+    next_cursor = None
+    if remaining > int(page_size):
+        next_cursor = pagination.row_cursor(page_df.iloc[-1], grants_sort_keys(searched))
+    page_df = page_df.drop(columns=[col for col in df.columns if col.startswith("page_")] + ["SearchScore"],
+                           errors="ignore").reset_index(drop=True)
+    return {
+        "page": page_df,
+        "next_cursor": next_cursor,
+        "total": int(stats["page_total"]),
+        "unique_agencies": int(stats["page_unique_agencies"]),
+        "total_funding": float(stats["page_total_funding"]),
+        "top_by_budget": list(stats["page_top_by_budget"]),
+        "top_by_count": list(stats["page_top_by_count"]),
+    }
+
+def get_unique_values(conn, column):
+    return query_builder.distinct_values(conn, "grants", column)
+
+def get_grant_status(close_date):
+    """
+    Python twin of GRANT_STATUS_SQL, for a single CloseDate (date, Timestamp,
+    'MMDDYYYY' string or None).
+    """
+    if isinstance(close_date, str):
+        try:
+            close_date = datetime.strptime(close_date, EXTRACT_DATE_FORMAT)
+        except ValueError:
+            close_date = None
+    if close_date is None or pd.isna(close_date):
+        return "No close date"
+    if isinstance(close_date, datetime):
+        close_date = close_date.date()
+    return "Retired" if close_date <= datetime.now().date() else "Active"
+
+def top_10_agencies_by_budget(df):
+    """
+    Returns the 10 agencies with the largest AwardCeiling + EstimatedTotalProgramFunding
+    in df, as AgencyName/TotalBudget columns. df is not modified.
+    """
+    budget = df["AwardCeiling"].astype(float).fillna(0) + df["EstimatedTotalProgramFunding"].astype(float).fillna(0)
+    grouped = budget.groupby(df["AgencyName"]).sum().rename("TotalBudget").reset_index()
+    return grouped.sort_values("TotalBudget", ascending=False).head(10)
+
+def top_10_agencies_by_count(df):
+    freq_df = df["AgencyName"].value_counts().reset_index()
+    freq_df.columns = ["AgencyName", "Frequency"]
+    return freq_df.head(10)
+
+GRANTS_EXTRACT_URL = "https://prod-grants-gov-chatbot.s3.amazonaws.com/extracts/GrantsDBExtractYYYYMMDDv2.zip"
+
+def extract_url_for(extract_date, base_zip_url=GRANTS_EXTRACT_URL):
+    """
+    Returns the extract URL for a date given as a datetime/date or 'YYYYMMDD' string.
+    """
+    if not isinstance(extract_date, str):
+        extract_date = extract_date.strftime("%Y%m%d")
+    return base_zip_url.replace("YYYYMMDD", extract_date)
+
+def fetch_extract_xml(zip_url):
+    """
+    Downloads the extract zip at zip_url and returns the bytes of the XML file inside.
+    Raises requests.exceptions.RequestException, zipfile.BadZipFile or
+    IndexError (no XML file in the archive).
+    """
+    import requests
+
+    response = requests.get(zip_url)
+    response.raise_for_status()
+
+    zip_file = zipfile.ZipFile(io.BytesIO(response.content))
+    # Assuming there's only one XML file
+    xml_file_name = [name for name in zip_file.namelist() if name.endswith(".xml")][0]
+
+    with zip_file.open(xml_file_name) as source:
+        return source.read()
+
+def download_and_extract_xml(st, base_zip_url=GRANTS_EXTRACT_URL, grants_xml_data=None):
+    """
+    Downloads and extracts the Grants.gov XML data from a zip file, returning bytes.
+
+    Args:
+        st: Streamlit object for UI elements.
+        base_zip_url (str, optional): The base URL for the zip file. Defaults to GrantsDBExtractYYYYMMDDv2.zip
+        grants_xml_data (bytes, optional): If already available, pass it.
+    Returns:
+        bytes: The raw XML data or None if an error occurred.
+    """
+    if grants_xml_data:
+        # If we somehow already have bytes, return them
+        return grants_xml_data
+
+    # Otherwise attempt to download from the URL
+    import requests
+
+    zip_url = extract_url_for(datetime.today(), base_zip_url)
+
+    try:
+        xml_data = fetch_extract_xml(zip_url)
+        st.success(f"Successfully downloaded XML from {zip_url} without saving locally.")
+        return xml_data
+
+    except requests.exceptions.RequestException as e:
+        st.error(f"Error downloading XML from {zip_url}: {e}")
+    except zipfile.BadZipFile:
+        st.error(f"Error: Could not open the zip file from {zip_url}. It may not be valid.")
+    except IndexError:
+        st.error(f"Error: No XML file found inside the zip archive at {zip_url}.")
+    except Exception as e:
+        st.error(f"An unexpected error occurred: {e}")
+    return None
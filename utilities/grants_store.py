@@ -0,0 +1,276 @@
+# utilities/grants_store.py
+"""
+Persistent on-disk DuckDB store for the Grants.gov extract.
+
+Each load produces one file per extract date under funddb/grants_store/.
+A refresh starts from a copy of the latest file and only applies the
+opportunities that were inserted, updated or closed since then, so the pages
+can keep the previous file open read-only while the next one is built.
+
+    python -m utilities.grants_store                    # download today's extract
+    python -m utilities.grants_store --xml extract.xml --date 20250301
+"""
+import argparse
+import os
+import shutil
+import threading
+from datetime import datetime
+
+import duckdb
+
+from utilities.grants_data import (
+    SEARCH_FIELDS,
+    SEARCH_INDEX_NAME,
+    load_xml_into_duckdb,
+    typed_select_sql,
+)
+from utilities.extract_download import download_extract, open_extract_xml
+from utilities.search_index import build_postings
+from utilities.summary_pipeline import create_summary_table, precompute_summaries
+
+STORE_DIR = os.path.join("funddb", "grants_store")
+STORE_PREFIX = "grants_"
+STORE_SUFFIX = ".duckdb"
+KEEP_STORES = 3
+ROW_HASH_COLUMN = "RowHash"
+
+_build_lock = threading.Lock()
+
+def _date_key(extract_date):
+    if isinstance(extract_date, str):
+        return extract_date
+    return extract_date.strftime("%Y%m%d")
+
+def store_path(extract_date, store_dir=STORE_DIR):
+    """
+    Returns the path of the store file for an extract date (date or 'YYYYMMDD').
+    """
+    return os.path.join(store_dir, f"{STORE_PREFIX}{_date_key(extract_date)}{STORE_SUFFIX}")
+
+def list_stores(store_dir=STORE_DIR):
+    """
+    Returns the store files in store_dir as (YYYYMMDD, path) pairs, oldest first.
+    """
+    if not os.path.isdir(store_dir):
+        return []
+    stores = []
+    for name in os.listdir(store_dir):
+        if name.startswith(STORE_PREFIX) and name.endswith(STORE_SUFFIX):
+            stores.append((name[len(STORE_PREFIX):-len(STORE_SUFFIX)], os.path.join(store_dir, name)))
+    return sorted(stores)
+
+def latest_store_path(store_dir=STORE_DIR):
+    """
+    Returns the path of the most recent store file, or None if there is none.
+    """
+    stores = list_stores(store_dir)
+    return stores[-1][1] if stores else None
+
+def open_store(path=None, store_dir=STORE_DIR):
+    """
+    Opens a store file read-only (the latest one if path is None).
+    Raises FileNotFoundError if there is no store yet.
+    """
+    path = path or latest_store_path(store_dir)
+    if not path or not os.path.exists(path):
+        raise FileNotFoundError(f"No Grants.gov store found in {store_dir}.")
+    return duckdb.connect(database=path, read_only=True)
+
+def _table_exists(conn, table):
+    return conn.execute(
+        "SELECT count(*) FROM information_schema.tables WHERE table_name = ?", [table]
+    ).fetchone()[0] > 0
+
+def _columns(conn, table):
+    return [row[0] for row in conn.execute(f"DESCRIBE {table}").fetchall()]
+
+def _column_types(conn, table):
+    return {row[0]: row[1] for row in conn.execute(f"DESCRIBE {table}").fetchall()}
+
+def _stage_extract(conn, xml_source):
+    """
+    Loads the extract into 'grants_new' with typed date and money columns
+    (see grants_data.typed_select_sql), plus a hash of every raw row so that
+    changed opportunities can be found without comparing each column.
+    """
+    load_xml_into_duckdb(xml_source, conn=conn, table="grants_raw")
+    columns = _columns(conn, "grants_raw")
+    parts = ", ".join(f'coalesce("{col}", chr(0))' for col in sorted(columns))
+    conn.execute(f"""
+        CREATE OR REPLACE TABLE grants_new AS
+        SELECT {typed_select_sql(columns)}, md5(concat_ws(chr(31), {parts})) AS {ROW_HASH_COLUMN}
+        FROM grants_raw
+    """)
+    conn.execute("DROP TABLE grants_raw")
+
+def _schema_matches(conn):
+    """
+    True if every column 'grants' shares with 'grants_new' has the same type,
+    i.e. the copied store can be updated in place.
+    """
+    old, new = _column_types(conn, "grants"), _column_types(conn, "grants_new")
+    return all(old[col] == new[col] for col in old.keys() & new.keys())
+
+def _apply_changes(conn):
+    """
+    Brings 'grants' in line with 'grants_new', touching only the opportunities
+    whose rows differ, which are left in the 'changed_ids' temp table.
+    Returns a dict with inserted/updated/closed counts.
+    """
+    existing = set(_columns(conn, "grants"))
+    for col, col_type in _column_types(conn, "grants_new").items():
+        if col not in existing:
+            conn.execute(f'ALTER TABLE grants ADD COLUMN "{col}" {col_type}')
+
+    # An opportunity changed if the set of row hashes stored for it differs
+    conn.execute(f"""
+        CREATE OR REPLACE TEMP TABLE changed_ids AS
+        WITH old AS (SELECT OpportunityID, {ROW_HASH_COLUMN} FROM grants),
+             new AS (SELECT OpportunityID, {ROW_HASH_COLUMN} FROM grants_new),
+             diff AS ((SELECT * FROM old EXCEPT SELECT * FROM new)
+                      UNION ALL
+                      (SELECT * FROM new EXCEPT SELECT * FROM old))
+        SELECT DISTINCT
+            d.OpportunityID,
+            d.OpportunityID IN (SELECT OpportunityID FROM old) AS in_old,
+            d.OpportunityID IN (SELECT OpportunityID FROM new) AS in_new
+        FROM diff d
+    """)
+    inserted, updated, closed = conn.execute("""
+        SELECT count(*) FILTER (WHERE NOT in_old),
+               count(*) FILTER (WHERE in_old AND in_new),
+               count(*) FILTER (WHERE NOT in_new)
+        FROM changed_ids
+    """).fetchone()
+
+    conn.execute("DELETE FROM grants WHERE OpportunityID IN (SELECT OpportunityID FROM changed_ids)")
+    conn.execute("""
+        INSERT INTO grants BY NAME
+        SELECT * FROM grants_new WHERE OpportunityID IN (SELECT OpportunityID FROM changed_ids)
+    """)
+    return {"inserted": inserted, "updated": updated, "closed": closed}
+
+def _record_extract(conn, extract_date, changes):
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS extract_meta (
+            extract_date VARCHAR, loaded_at TIMESTAMP,
+            inserted BIGINT, updated BIGINT, closed BIGINT, total BIGINT
+        )
+    """)
+    total = conn.execute("SELECT count(*) FROM grants").fetchone()[0]
+    conn.execute(
+        "INSERT INTO extract_meta VALUES (?, ?, ?, ?, ?, ?)",
+        [extract_date, datetime.now(), changes["inserted"], changes["updated"], changes["closed"], total],
+    )
+    return total
+
+def _prune_stores(store_dir, keep):
+    for _, path in list_stores(store_dir)[:-keep]:
+        os.remove(path)
+
+def build_store(xml_source, extract_date, store_dir=STORE_DIR, keep=KEEP_STORES,
+                summarize=True, workers=None):
+    """
+    Builds the store file for extract_date from an extract (path or file object).
+    If an older store exists, it is copied and only the changes are applied
+    (unless its column types are outdated, in which case it is rebuilt).
+    With summarize, the summaries of active opportunities are brought up to
+    date in `workers` processes (see summary_pipeline).
+    Older store files beyond `keep` are removed.
+    Returns (path, stats) where stats holds the inserted/updated/closed/total
+    counts, and the summary_pipeline stats under "summaries" if summarize.
+    """
+    date_key = _date_key(extract_date)
+    os.makedirs(store_dir, exist_ok=True)
+    target = store_path(date_key, store_dir)
+    tmp_path = target + ".tmp"
+    if os.path.exists(tmp_path):
+        os.remove(tmp_path)
+
+    previous = latest_store_path(store_dir)
+    if previous:
+        shutil.copyfile(previous, tmp_path)
+
+    conn = duckdb.connect(database=tmp_path)
+    try:
+        _stage_extract(conn, xml_source)
+        if _table_exists(conn, "grants") and not _schema_matches(conn):
+            for table in ("grants", f"{SEARCH_INDEX_NAME}_postings", f"{SEARCH_INDEX_NAME}_doclen"):
+                conn.execute(f"DROP TABLE IF EXISTS {table}")
+        if _table_exists(conn, "grants"):
+            changes = _apply_changes(conn)
+            conn.execute("DROP TABLE grants_new")
+            if _table_exists(conn, f"{SEARCH_INDEX_NAME}_postings"):
+                build_postings(conn, SEARCH_INDEX_NAME, "grants", "OpportunityID", SEARCH_FIELDS,
+                               ids_table="changed_ids")
+            else:
+                build_postings(conn, SEARCH_INDEX_NAME, "grants", "OpportunityID", SEARCH_FIELDS)
+            conn.execute("DROP TABLE changed_ids")
+        else:
+            conn.execute("ALTER TABLE grants_new RENAME TO grants")
+            build_postings(conn, SEARCH_INDEX_NAME, "grants", "OpportunityID", SEARCH_FIELDS)
+            count = conn.execute("SELECT count(*) FROM grants").fetchone()[0]
+            changes = {"inserted": count, "updated": 0, "closed": 0}
+        create_summary_table(conn)
+        if summarize:
+            changes["summaries"] = precompute_summaries(conn, workers=workers)
+        changes["total"] = _record_extract(conn, date_key, changes)
+        conn.execute("CHECKPOINT")
+    finally:
+        conn.close()
+
+    os.replace(tmp_path, target)
+    _prune_stores(store_dir, keep)
+    return target, changes
+
+def refresh_store(extract_date=None, store_dir=STORE_DIR, summarize=True, workers=None):
+    """
+    Downloads the extract for extract_date (default: today, or the latest
+    published day before it) and builds its store, parsing straight from the zip.
+    Returns (path, stats) like build_store.
+    """
+    zip_path, extract_date = download_extract(extract_date)
+    with open_extract_xml(zip_path) as xml_file:
+        return build_store(xml_file, extract_date, store_dir=store_dir, summarize=summarize, workers=workers)
+
+def ensure_store(store_dir=STORE_DIR):
+    """
+    Returns the latest store path, downloading and building today's store
+    first if there is none yet. Only one thread builds at a time. Summaries
+    are left to the next scheduled refresh so that the first page load is
+    not held up by them.
+    """
+    path = latest_store_path(store_dir)
+    if path:
+        return path
+    with _build_lock:
+        path = latest_store_path(store_dir)
+        if path:
+            return path
+        path, _ = refresh_store(store_dir=store_dir, summarize=False)
+        return path
+
+def main():
+    parser = argparse.ArgumentParser(description="Build or refresh the Grants.gov DuckDB store.")
+    parser.add_argument("--date", help="Extract date as YYYYMMDD (default: today)")
+    parser.add_argument("--xml", help="Load this extract XML file instead of downloading it")
+    parser.add_argument("--store-dir", default=STORE_DIR)
+    parser.add_argument("--no-summaries", action="store_true", help="Skip summarizing active opportunities")
+    parser.add_argument("--workers", type=int, default=None, help="Summary worker processes (default: all CPUs)")
+    args = parser.parse_args()
+
+    extract_date = args.date or datetime.today().strftime("%Y%m%d")
+    options = dict(store_dir=args.store_dir, summarize=not args.no_summaries, workers=args.workers)
+    if args.xml:
+        path, stats = build_store(args.xml, extract_date, **options)
+    else:
+        path, stats = refresh_store(extract_date, **options)
+    print(f"{path}: {stats['inserted']} inserted, {stats['updated']} updated, "
+          f"{stats['closed']} closed, {stats['total']} total")
+    if "summaries" in stats:
+        summaries = stats["summaries"]
+        print(f"summaries: {summaries['summarized']} summarized, {summaries['removed']} removed "
+              f"in {summaries['seconds']:.1f} s ({summaries['docs_per_sec']:.1f} docs/sec)")
+
+if __name__ == "__main__":
+    main()
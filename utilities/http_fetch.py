@@ -0,0 +1,227 @@
+# utilities/http_fetch.py
+"""
+Cached, pooled HTTP fetching for NIH funding announcement pages.
+
+Every fetch goes through one requests.Session (keep-alive connections,
+pooled per host) and an on-disk cache under funddb/http_cache keyed by URL:
+a gzip-compressed body plus a JSON file with its ETag/Last-Modified. A
+cached page younger than `max_age` is returned without touching the
+network; an older one is revalidated with If-None-Match/If-Modified-Since,
+so an unchanged page costs a 304 and no body. If the server cannot be
+reached, a cached copy (however old) is returned instead of failing.
+Concurrent fetches of one URL share a single request.
+
+    page = fetch(url)                  # {"content", "text", "source", ...}
+    page = cached(url)                 # the cached copy only, or None
+    prefetch(urls, workers=8)          # bulk, bounded parallelism
+
+    python -m utilities.http_fetch --workers 8     # prefetch every NIH_data.csv URL
+"""
+import argparse
+import csv
+import gzip
+import hashlib
+import json
+import os
+import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from utilities import metrics
+
+# requests (about 0.1 s to import) is imported by the first fetch, not with this module
+CACHE_DIR = os.path.join("funddb", "http_cache")
+NIH_CSV_PATH = os.path.join("funddb", "NIH_data.csv")
+FETCH_TIMEOUT = 30
+FETCH_HEADERS = {"User-Agent": "Mozilla/5.0 (compatible; Fundr summarizer)"}
+# Pages younger than this are served from the cache without revalidating
+MAX_AGE_SECONDS = 24 * 3600
+DEFAULT_WORKERS = 8
+POOL_SIZE = 16
+# A <meta charset="..."> or <meta http-equiv content="...; charset=..."> near the top of the page
+META_CHARSET = re.compile(rb"""<meta[^>]+charset=["']?([A-Za-z0-9_.:-]+)""", re.IGNORECASE)
+
+_session = None
+_session_lock = threading.Lock()
+_url_locks = {}
+_url_locks_lock = threading.Lock()
+
+def get_session():
+    """
+    Returns the process-wide requests.Session, with connection pools sized for prefetch.
+    """
+    global _session
+    if _session is None:
+        import requests
+        from requests.adapters import HTTPAdapter
+        with _session_lock:
+            if _session is None:
+                session = requests.Session()
+                adapter = HTTPAdapter(pool_connections=POOL_SIZE, pool_maxsize=POOL_SIZE)
+                session.mount("http://", adapter)
+                session.mount("https://", adapter)
+                session.headers.update(FETCH_HEADERS)
+                _session = session
+    return _session
+
+def _url_lock(url):
+    with _url_locks_lock:
+        return _url_locks.setdefault(url, threading.Lock())
+
+def _cache_paths(url, cache_dir):
+    digest = hashlib.sha256(url.encode("utf-8")).hexdigest()
+    base = os.path.join(cache_dir, digest[:2], digest)
+    return base + ".json", base + ".gz"
+
+def _read_cache(url, cache_dir):
+    meta_path, body_path = _cache_paths(url, cache_dir)
+    try:
+        with open(meta_path, encoding="utf-8") as f:
+            meta = json.load(f)
+        with open(body_path, "rb") as f:
+            meta["content"] = gzip.decompress(f.read())
+    except (OSError, ValueError, EOFError):
+        return None
+    return meta
+
+def _write_atomic(path, data):
+    tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(data)
+    os.replace(tmp_path, path)
+
+def _write_cache(url, cache_dir, entry):
+    meta_path, body_path = _cache_paths(url, cache_dir)
+    os.makedirs(os.path.dirname(meta_path), exist_ok=True)
+    meta = {key: value for key, value in entry.items() if key not in ("content", "text", "source")}
+    # Body first: a meta file always has a body written before it
+    if "content" in entry:
+        _write_atomic(body_path, gzip.compress(entry["content"], compresslevel=6))
+    _write_atomic(meta_path, json.dumps(meta).encode("utf-8"))
+
+def _encoding(response):
+    """
+    Returns the encoding of a response body: the charset of its Content-Type,
+    else the page's <meta charset>, else the one detected from the bytes.
+    requests' own default for text/* without a charset, ISO-8859-1, would
+    turn the UTF-8 NIH pages into mojibake.
+    """
+    from requests.utils import get_encoding_from_headers
+
+    if "charset" in response.headers.get("Content-Type", "").lower():
+        return get_encoding_from_headers(response.headers)
+    match = META_CHARSET.search(response.content[:4096])
+    if match:
+        return match.group(1).decode("ascii")
+    return response.apparent_encoding or "utf-8"
+
+def _result(entry, source):
+    metrics.inc("http_fetch", source=source)
+    result = dict(entry, source=source)
+    try:
+        result["text"] = entry["content"].decode(entry.get("encoding") or "utf-8", errors="replace")
+    except LookupError:
+        # A <meta charset> Python does not know
+        result["text"] = entry["content"].decode("utf-8", errors="replace")
+    return result
+
+def cached(url, cache_dir=CACHE_DIR):
+    """
+    Returns the cached copy of url like fetch (source "cache"), however old,
+    or None if it was never fetched. Never touches the network.
+    """
+    entry = _read_cache(url, cache_dir)
+    return _result(entry, "cache") if entry is not None else None
+
+def fetch(url, max_age=MAX_AGE_SECONDS, cache_dir=CACHE_DIR, session=None, timeout=FETCH_TIMEOUT):
+    """
+    Returns the page at url as a dict with url, content (bytes), text, encoding,
+    etag, last_modified, fetched_at and source: "cache" (fresh copy), "revalidated"
+    (the server answered 304), "network" or "stale" (server unreachable, old copy).
+    Raises requests.RequestException if the page cannot be fetched and is not cached.
+    """
+    import requests
+
+    with _url_lock(url):
+        cached = _read_cache(url, cache_dir)
+        if cached is not None and time.time() - cached["fetched_at"] < max_age:
+            return _result(cached, "cache")
+
+        headers = {}
+        if cached is not None:
+            if cached.get("etag"):
+                headers["If-None-Match"] = cached["etag"]
+            if cached.get("last_modified"):
+                headers["If-Modified-Since"] = cached["last_modified"]
+        try:
+            with metrics.timer("upstream_call", api="http"):
+                response = (session or get_session()).get(url, headers=headers, timeout=timeout)
+            if response.status_code == 304 and cached is not None:
+                cached["fetched_at"] = time.time()
+                _write_cache(url, cache_dir, {key: v for key, v in cached.items() if key != "content"})
+                return _result(cached, "revalidated")
+            response.raise_for_status()
+        except requests.RequestException:
+            if cached is not None:
+                return _result(cached, "stale")
+            raise
+
+        entry = {
+            "url": url,
+            "content": response.content,
+            "encoding": _encoding(response),
+            "etag": response.headers.get("ETag"),
+            "last_modified": response.headers.get("Last-Modified"),
+            "fetched_at": time.time(),
+        }
+        _write_cache(url, cache_dir, entry)
+        return _result(entry, "network")
+
+def prefetch(urls, workers=DEFAULT_WORKERS, max_age=MAX_AGE_SECONDS, cache_dir=CACHE_DIR, session=None):
+    """
+    Fetches every URL into the cache with at most `workers` requests in flight.
+    Returns a dict with the count per source, "errors" (url -> message) and seconds.
+    """
+    import requests
+
+    start = time.perf_counter()
+    urls = list(dict.fromkeys(url for url in urls if url))
+    stats = {"cache": 0, "revalidated": 0, "network": 0, "stale": 0, "errors": {}}
+
+    def fetch_one(url):
+        try:
+            return url, fetch(url, max_age=max_age, cache_dir=cache_dir, session=session)["source"], None
+        except requests.RequestException as e:
+            return url, None, str(e)
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        for url, source, error in executor.map(fetch_one, urls):
+            if error is None:
+                stats[source] += 1
+            else:
+                stats["errors"][url] = error
+    stats["seconds"] = time.perf_counter() - start
+    return stats
+
+def nih_urls(csv_path=NIH_CSV_PATH):
+    """
+    Returns the announcement URLs of the NIH CSV, in file order.
+    """
+    with open(csv_path, newline="", encoding="utf-8") as f:
+        return [row["URL"] for row in csv.DictReader(f) if row.get("URL")]
+
+def main():
+    parser = argparse.ArgumentParser(description="Prefetch every NIH announcement page into the HTTP cache.")
+    parser.add_argument("--csv", default=NIH_CSV_PATH)
+    parser.add_argument("--workers", type=int, default=DEFAULT_WORKERS)
+    parser.add_argument("--max-age", type=float, default=MAX_AGE_SECONDS, help="Seconds before revalidating")
+    parser.add_argument("--cache-dir", default=CACHE_DIR)
+    args = parser.parse_args()
+
+    stats = prefetch(nih_urls(args.csv), workers=args.workers, max_age=args.max_age, cache_dir=args.cache_dir)
+    print(f"{stats['network']} downloaded, {stats['revalidated']} revalidated, {stats['cache']} fresh, "
+          f"{stats['stale']} stale, {len(stats['errors'])} failed in {stats['seconds']:.1f} s")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,234 @@
+# utilities/job_queue.py
+"""
+Background job queue for slow upstream calls (Gemini + TTS podcasts).
+
+Jobs run on a fixed pool of worker threads, so at most `workers` upstream
+calls are in flight, and each attempt first takes a token from a shared
+token bucket (`rate` attempts per second, bursts of `burst`). A job that
+raises is retried after an exponential backoff, up to `max_attempts`.
+Submitting a key that is already queued or running returns the existing
+job, so repeated clicks do not queue duplicates.
+
+    queue = JobQueue(workers=2, rate=0.5)
+    job_id = queue.submit("grant-123", generate_podcast_audio, row_dict)
+    queue.status(job_id)   # {"status": "queued" | "running" | "done" | "failed", ...}
+    queue.metrics()        # queue depth, running, retries, wait/run latency
+"""
+import itertools
+import queue
+import statistics
+import threading
+import time
+from collections import OrderedDict, deque
+
+DEFAULT_WORKERS = 2
+DEFAULT_RATE = 1.0
+DEFAULT_BURST = 2
+MAX_ATTEMPTS = 3
+BACKOFF_SECONDS = 2.0
+MAX_BACKOFF_SECONDS = 60.0
+# Finished jobs kept for status() before the oldest are forgotten
+MAX_FINISHED = 500
+# Latency samples kept for metrics()
+LATENCY_WINDOW = 200
+# Keys of metrics() that only ever grow
+JOB_COUNTERS = ("submitted", "deduplicated", "done", "failed", "retries")
+
+class TokenBucket:
+    """
+    Allows `rate` acquisitions per second on average, `burst` at once. Thread-safe.
+    """
+
+    def __init__(self, rate, burst):
+        self.rate = rate
+        self.burst = burst
+        self._tokens = float(burst)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        """
+        Blocks until a token is available and takes it.
+        """
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait = (1 - self._tokens) / self.rate
+            time.sleep(wait)
+
+class Job:
+    """
+    One submitted call and its state.
+    """
+
+    def __init__(self, job_id, key, fn, args, kwargs):
+        self.id = job_id
+        self.key = key
+        self.fn = fn
+        self.args = args
+        self.kwargs = kwargs
+        self.status = "queued"
+        self.result = None
+        self.error = None
+        self.attempts = 0
+        self.submitted_at = time.time()
+        self.started_at = None
+        self.finished_at = None
+
+    def snapshot(self):
+        return {
+            "id": self.id,
+            "key": self.key,
+            "status": self.status,
+            "result": self.result,
+            "error": self.error,
+            "attempts": self.attempts,
+            "submitted_at": self.submitted_at,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+        }
+
+class JobQueue:
+    """
+    Thread pool with rate limiting, retries and per-key deduplication.
+    Workers are daemon threads started on first submit.
+    """
+
+    def __init__(self, workers=DEFAULT_WORKERS, rate=DEFAULT_RATE, burst=DEFAULT_BURST,
+                 max_attempts=MAX_ATTEMPTS, backoff=BACKOFF_SECONDS, max_backoff=MAX_BACKOFF_SECONDS):
+        self.workers = workers
+        self.max_attempts = max_attempts
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self._limiter = TokenBucket(rate, burst)
+        self._queue = queue.Queue()
+        self._lock = threading.Lock()
+        self._ids = itertools.count(1)
+        self._jobs = {}
+        self._active_by_key = {}
+        self._finished = OrderedDict()
+        self._threads = []
+        self._waiting_retry = 0
+        self._running = 0
+        self._counters = dict.fromkeys(JOB_COUNTERS, 0)
+        self._wait_times = deque(maxlen=LATENCY_WINDOW)
+        self._run_times = deque(maxlen=LATENCY_WINDOW)
+
+    def _start_workers(self):
+        while len(self._threads) < self.workers:
+            thread = threading.Thread(target=self._work, name=f"job-worker-{len(self._threads)}", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+
+    def submit(self, key, fn, *args, **kwargs):
+        """
+        Queues fn(*args, **kwargs) under key and returns the job id; returns
+        the id of the queued or running job with the same key instead, if any.
+        """
+        with self._lock:
+            active = self._active_by_key.get(key)
+            if active is not None:
+                self._counters["deduplicated"] += 1
+                return active.id
+            job = Job(next(self._ids), key, fn, args, kwargs)
+            self._jobs[job.id] = job
+            self._active_by_key[key] = job
+            self._counters["submitted"] += 1
+            self._start_workers()
+        self._queue.put(job)
+        return job.id
+
+    def submit_many(self, items):
+        """
+        Submits (key, fn, args) tuples; returns their job ids in order.
+        """
+        return [self.submit(key, fn, *args) for key, fn, args in items]
+
+    def status(self, job_id):
+        """
+        Returns a snapshot dict of the job, or None for an unknown (or forgotten) id.
+        """
+        with self._lock:
+            job = self._jobs.get(job_id)
+            return job.snapshot() if job is not None else None
+
+    def metrics(self):
+        """
+        Returns queue depth, running/retrying job counts, the counters, and
+        median/p95 seconds from submit to start (wait) and of the last attempt (run).
+        """
+        with self._lock:
+            metrics = dict(self._counters)
+            metrics["queue_depth"] = self._queue.qsize()
+            metrics["running"] = self._running
+            metrics["waiting_retry"] = self._waiting_retry
+            samples = {"wait": list(self._wait_times), "run": list(self._run_times)}
+        for name, values in samples.items():
+            values.sort()
+            metrics[f"{name}_p50"] = statistics.median(values) if values else 0.0
+            metrics[f"{name}_p95"] = values[int(0.95 * (len(values) - 1))] if values else 0.0
+        return metrics
+
+    def _work(self):
+        while True:
+            job = self._queue.get()
+            self._limiter.acquire()
+            with self._lock:
+                self._running += 1
+                job.status = "running"
+                job.attempts += 1
+                if job.started_at is None:
+                    job.started_at = time.time()
+                    self._wait_times.append(job.started_at - job.submitted_at)
+            start = time.perf_counter()
+            try:
+                result = job.fn(*job.args, **job.kwargs)
+            except Exception as e:
+                self._failed_attempt(job, e, time.perf_counter() - start)
+            else:
+                self._finish(job, "done", time.perf_counter() - start, result=result)
+            finally:
+                self._queue.task_done()
+
+    def _failed_attempt(self, job, error, seconds):
+        if job.attempts >= self.max_attempts:
+            self._finish(job, "failed", seconds, error=str(error))
+            return
+        delay = min(self.max_backoff, self.backoff * 2 ** (job.attempts - 1))
+        with self._lock:
+            self._running -= 1
+            self._waiting_retry += 1
+            self._counters["retries"] += 1
+            job.status = "queued"
+            job.error = str(error)
+
+        def requeue():
+            with self._lock:
+                self._waiting_retry -= 1
+            self._queue.put(job)
+
+        timer = threading.Timer(delay, requeue)
+        timer.daemon = True
+        timer.start()
+
+    def _finish(self, job, status, seconds, result=None, error=None):
+        with self._lock:
+            self._running -= 1
+            self._run_times.append(seconds)
+            self._counters[status] += 1
+            job.status = status
+            job.result = result
+            job.error = error
+            job.finished_at = time.time()
+            job.fn = job.args = job.kwargs = None
+            if self._active_by_key.get(job.key) is job:
+                del self._active_by_key[job.key]
+            self._finished[job.id] = job
+            while len(self._finished) > MAX_FINISHED:
+                old_id, _ = self._finished.popitem(last=False)
+                self._jobs.pop(old_id, None)
@@ -0,0 +1,264 @@
+# utilities/metrics.py
+"""
+Process-wide metrics for the hot paths (queries, summaries, page fetches,
+podcasts), exported in the Prometheus text format.
+
+    @timed("query", rows=len, query="grants")       # latency and rows histograms
+    def query_grants(...): ...
+
+    with timer("summarizer", algorithm="lsa"):      # latency histogram
+        ...
+    inc("http_fetch", source="network")             # counter
+    register_stats("summary_cache", cache.stats, counters=("misses", ...))
+
+    render_prometheus()    # text for a scraper or the sidebar panel
+    summary()              # the histograms as rows (count, mean, p95) for a table
+
+A timed block records fundr_<name>_seconds, plus fundr_<name>_errors_total
+when it raises; timed(rows=...) also records fundr_<name>_rows from the
+result. Stats functions registered with register_stats (the summary and
+podcast caches, the podcast queue) are read at export time, so their own
+counters are not duplicated here.
+
+Metrics are on unless FUNDR_METRICS=0; then timed returns the function
+unchanged and timer, inc and observe do nothing. With FUNDR_METRICS_PORT
+set, the first process to bind the port also serves /metrics over HTTP.
+The pages only show the sidebar admin panel (ui/ui_metrics.py) with
+FUNDR_METRICS_PANEL=1.
+"""
+import bisect
+import functools
+import os
+import threading
+import time
+from contextlib import contextmanager, nullcontext
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+ENV = "FUNDR_METRICS"
+PORT_ENV = "FUNDR_METRICS_PORT"
+# The sidebar panel shows every session's activity, so it is for admins only
+PANEL_ENV = "FUNDR_METRICS_PANEL"
+PREFIX = "fundr_"
+# Upper bounds of the histogram buckets (Prometheus' default latency buckets, plus 30 s)
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+ROWS_BUCKETS = (0, 1, 10, 100, 1000, 10000, 100000)
+
+ENABLED = os.environ.get(ENV, "1").strip() != "0"
+
+_lock = threading.Lock()
+_counters = {}     # (name, labels) -> value
+_histograms = {}   # (name, labels) -> [count per bucket..., count above the last bucket, sum]
+_buckets = {}      # histogram name -> bucket upper bounds
+_stats = {}        # name -> (stats function, counter keys)
+_server = None
+
+def _label_key(labels):
+    return tuple(sorted(labels.items()))
+
+def inc(name, amount=1, **labels):
+    """
+    Adds amount to the counter fundr_<name>_total{labels}.
+    """
+    if not ENABLED:
+        return
+    key = (name, _label_key(labels))
+    with _lock:
+        _counters[key] = _counters.get(key, 0) + amount
+
+def observe(name, value, buckets=LATENCY_BUCKETS, **labels):
+    """
+    Records value in the histogram fundr_<name>{labels}. A histogram keeps
+    the buckets it was first observed with.
+    """
+    if not ENABLED:
+        return
+    _observe((name, _label_key(labels)), buckets, value)
+
+def _observe(key, buckets, value):
+    with _lock:
+        bounds = _buckets.setdefault(key[0], buckets)
+        counts = _histograms.get(key)
+        if counts is None:
+            counts = _histograms[key] = [0] * (len(bounds) + 1) + [0.0]
+        counts[bisect.bisect_left(bounds, value)] += 1
+        counts[-1] += value
+
+@contextmanager
+def _timer(name, labels):
+    start = time.perf_counter()
+    try:
+        yield
+    except Exception:
+        inc(f"{name}_errors", **labels)
+        raise
+    finally:
+        observe(f"{name}_seconds", time.perf_counter() - start, **labels)
+
+def timer(name, **labels):
+    """
+    Context manager recording the time of its block in fundr_<name>_seconds{labels}.
+    """
+    if not ENABLED:
+        return nullcontext()
+    return _timer(name, labels)
+
+def timed(name, rows=None, **labels):
+    """
+    Decorator timing every call like timer(name, **labels); with rows (a
+    function of the result returning a row count), the count is recorded
+    in fundr_<name>_rows{labels}.
+    """
+    seconds_key = (f"{name}_seconds", _label_key(labels))
+
+    def decorate(fn):
+        if not ENABLED:
+            return fn
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            # Same as `with timer(...)`, without a generator per call
+            start = time.perf_counter()
+            try:
+                result = fn(*args, **kwargs)
+            except Exception:
+                inc(f"{name}_errors", **labels)
+                raise
+            finally:
+                _observe(seconds_key, LATENCY_BUCKETS, time.perf_counter() - start)
+            if rows is not None:
+                observe(f"{name}_rows", rows(result), buckets=ROWS_BUCKETS, **labels)
+            return result
+        return wrapper
+    return decorate
+
+def register_stats(name, stats, counters=()):
+    """
+    Exports the numeric values of the dict returned by stats() as
+    fundr_<name>_<key>: counters (the keys in `counters`) with a _total
+    suffix, gauges otherwise. Registering a name again replaces it.
+    """
+    with _lock:
+        _stats[name] = (stats, frozenset(counters))
+
+def reset():
+    """
+    Drops every recorded counter and histogram (registered stats stay).
+    """
+    with _lock:
+        _counters.clear()
+        _histograms.clear()
+        _buckets.clear()
+
+def _format_labels(labels, extra=()):
+    pairs = list(labels) + list(extra)
+    if not pairs:
+        return ""
+    escaped = (str(v).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n") for _, v in pairs)
+    return "{" + ",".join(f'{k}="{v}"' for (k, _), v in zip(pairs, escaped)) + "}"
+
+def _format_value(value):
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+def _numeric(value):
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+def render_prometheus():
+    """
+    Returns every metric in the Prometheus text exposition format.
+    """
+    with _lock:
+        counters = sorted(_counters.items())
+        histograms = sorted((key, list(counts)) for key, counts in _histograms.items())
+        buckets = dict(_buckets)
+        stats = sorted(_stats.items())
+    families = {}
+    for (name, labels), value in counters:
+        families.setdefault((f"{PREFIX}{name}_total", "counter"), []).append(
+            f"{PREFIX}{name}_total{_format_labels(labels)} {_format_value(value)}")
+    for (name, labels), counts in histograms:
+        lines = families.setdefault((PREFIX + name, "histogram"), [])
+        cumulative = 0
+        for bound, count in zip(buckets[name] + (float("inf"),), counts[:-1]):
+            cumulative += count
+            le = "+Inf" if bound == float("inf") else _format_value(bound)
+            lines.append(f"{PREFIX}{name}_bucket{_format_labels(labels, [('le', le)])} {cumulative}")
+        lines.append(f"{PREFIX}{name}_sum{_format_labels(labels)} {_format_value(counts[-1])}")
+        lines.append(f"{PREFIX}{name}_count{_format_labels(labels)} {cumulative}")
+    for name, (stats_fn, counter_keys) in stats:
+        for key, value in stats_fn().items():
+            if not _numeric(value):
+                continue
+            if key in counter_keys:
+                metric, kind = f"{PREFIX}{name}_{key}_total", "counter"
+            else:
+                metric, kind = f"{PREFIX}{name}_{key}", "gauge"
+            families.setdefault((metric, kind), []).append(f"{metric} {_format_value(value)}")
+    out = []
+    for (metric, kind), lines in families.items():
+        out.append(f"# TYPE {metric} {kind}")
+        out.extend(lines)
+    return "\n".join(out) + "\n"
+
+def _quantile(bounds, counts, q):
+    # Upper bound of the bucket holding the q-quantile (the last bound if it is above them all)
+    total = sum(counts[:-1])
+    target, cumulative = q * total, 0
+    for bound, count in zip(bounds, counts):
+        cumulative += count
+        if cumulative >= target:
+            return bound
+    return bounds[-1]
+
+def summary():
+    """
+    Returns one dict per recorded histogram: metric, labels, count, mean and
+    p95 (the upper bound of its bucket). Seconds histograms are in ms.
+    """
+    with _lock:
+        histograms = sorted((key, list(counts)) for key, counts in _histograms.items())
+        buckets = dict(_buckets)
+    rows = []
+    for (name, labels), counts in histograms:
+        count = sum(counts[:-1])
+        scale = 1000 if name.endswith("_seconds") else 1
+        rows.append({
+            "metric": name[:-len("_seconds")] + " ms" if scale == 1000 else name,
+            "labels": ", ".join(f"{k}={v}" for k, v in labels),
+            "count": count,
+            "mean": counts[-1] / count * scale if count else 0.0,
+            "p95": _quantile(buckets[name], counts, 0.95) * scale,
+        })
+    return rows
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path.split("?")[0] != "/metrics":
+            self.send_error(404)
+            return
+        body = render_prometheus().encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+def start_server(port, host="127.0.0.1"):
+    """
+    Serves /metrics on host:port from a daemon thread, once per process.
+    Returns the server, or None if the port is taken (another process serves it).
+    """
+    global _server
+    with _lock:
+        if _server is None:
+            try:
+                _server = ThreadingHTTPServer((host, port), _MetricsHandler)
+            except OSError:
+                return None
+            threading.Thread(target=_server.serve_forever, name="fundr-metrics", daemon=True).start()
+    return _server
+
+if ENABLED and os.environ.get(PORT_ENV):
+    start_server(int(os.environ[PORT_ENV]))
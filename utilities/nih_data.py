@@ -1,24 +1,66 @@
 # utilities/nih_data.py
 import duckdb
-import pandas as pd
+from utilities import metrics, pagination, query_builder
+from utilities.search_index import SearchIndex, build_postings
 
-def load_nih_data(file_path):
+SEARCH_INDEX_NAME = "nih_search"
+SEARCH_FIELDS = ("Title",)
+
+# Columns parsed into DATE at load time (the CSV writes them as M/D/YYYY)
+DATE_COLUMNS = ("Release_Date", "Expired_Date")
+CSV_DATE_FORMAT = "%m/%d/%Y"
+
+def load_nih_data(file_path, conn=None):
     """
-    Loads the NIH CSV data from the given file path into an in-memory DuckDB table named 'nih'.
+    Loads the NIH CSV data from the given file path into a DuckDB table named 'nih'
+    (in a new in-memory database if conn is None, replacing any existing table otherwise).
+    Release_Date and Expired_Date are stored as DATE (NULL if they do not parse),
+    every other column as VARCHAR.
     Returns a DuckDB connection.
     """
-    df = pd.read_csv(file_path)
-    conn = duckdb.connect(database=':memory:')
-    conn.execute("CREATE TABLE nih AS SELECT * FROM df")
+    if conn is None:
+        conn = duckdb.connect(database=':memory:')
+    quoted_path = file_path.replace("'", "''")
+    columns = [row[0] for row in conn.execute(
+        f"DESCRIBE SELECT * FROM read_csv('{quoted_path}', header=true, all_varchar=true)"
+    ).fetchall()]
+    exprs = [
+        f'CAST(try_strptime("{col}", \'{CSV_DATE_FORMAT}\') AS DATE) AS "{col}"' if col in DATE_COLUMNS else f'"{col}"'
+        for col in columns
+    ]
+    conn.execute(f"""
+        CREATE OR REPLACE TABLE nih AS
+        SELECT {", ".join(exprs)} FROM read_csv('{quoted_path}', header=true, all_varchar=true)
+    """)
     return conn
 
+def build_search_index(conn):
+    """
+    Builds the full-text index over the 'nih' table and returns it loaded in memory.
+    """
+    build_postings(conn, SEARCH_INDEX_NAME, "nih", "Document_Number", SEARCH_FIELDS)
+    return SearchIndex.load(conn, SEARCH_INDEX_NAME)
+
+def _nih_filters(release_date_search, activity_code_search, parent_org_filter,
+                 organization_filter, document_type_filter, clinical_trials_search):
+    return [
+        ("Release_Date", "date_contains", release_date_search),
+        ("Activity_Code", "contains", activity_code_search),
+        ("Parent_Organization", "equals", parent_org_filter),
+        ("Organization", "equals", organization_filter),
+        ("Document_Type", "equals", document_type_filter),
+        ("Clinical_Trials", "contains", clinical_trials_search),
+    ]
+
+@metrics.timed("query", rows=len, query="nih")
 def query_nih_data(conn, title_search='', release_date_search='', activity_code_search='',
                    parent_org_filter='All', organization_filter='All', document_type_filter='All',
-                   clinical_trials_search=''):
+                   clinical_trials_search='', search_index=None):
     """
     Queries the 'nih' table with optional filters.
-      - title_search: case-insensitive keyword search on Title.
-      - release_date_search: case-insensitive keyword search on Release_Date.
+      - title_search: ranked full-text search on Title if a search_index is given
+        (best match first), case-insensitive keyword search otherwise.
+      - release_date_search: keyword search on Release_Date written as M/D/YYYY.
       - activity_code_search: case-insensitive keyword search on Activity_Code.
       - parent_org_filter: exact match on Parent_Organization.
       - organization_filter: exact match on Organization.
@@ -26,27 +68,124 @@ def query_nih_data(conn, title_search='', release_date_search='', activity_code_
       - clinical_trials_search: case-insensitive keyword search on Clinical_Trials.
     Returns the result as a Pandas DataFrame.
     """
-    sql = "SELECT * FROM nih WHERE 1=1"
-    if title_search:
-        sql += f" AND Title ILIKE '%{title_search}%'"
-    if release_date_search:
-        sql += f" AND Release_Date ILIKE '%{release_date_search}%'"
-    if activity_code_search:
-        sql += f" AND Activity_Code ILIKE '%{activity_code_search}%'"
-    if parent_org_filter != 'All':
-        sql += f" AND Parent_Organization = '{parent_org_filter}'"
-    if organization_filter != 'All':
-        sql += f" AND Organization = '{organization_filter}'"
-    if document_type_filter != 'All':
-        sql += f" AND Document_Type = '{document_type_filter}'"
-    if clinical_trials_search:
-        sql += f" AND Clinical_Trials ILIKE '%{clinical_trials_search}%'"
-    return conn.execute(sql).fetchdf()
+    hits = search_index.search(title_search) if search_index is not None else None
+    filters = _nih_filters(release_date_search, activity_code_search, parent_org_filter,
+                           organization_filter, document_type_filter, clinical_trials_search)
+    if hits is None:
+        filters.append(("Title", "contains", title_search))
+        return query_builder.select(conn, "nih", filters)
+
+    conn.register("search_hits", hits)
+    try:
+        return query_builder.select(
+            conn, "nih", filters,
+            columns="nih.*",
+            joins="JOIN search_hits ON nih.Document_Number = search_hits.doc_id",
+            order_by="search_hits.score DESC, search_hits.doc_id",
+        )
+    finally:
+        conn.unregister("search_hits")
+
+def nih_sort_keys(searched):
+    """
+    Sort keys of query_nih_page: best match first when searching, newest release first otherwise.
+    """
+    if searched:
+        return [("SearchScore", True), ("Document_Number", False)]
+    return [("ReleaseOrder", True), ("Document_Number", False)]
+
+def _page_sql(conditions, searched, has_cursor):
+    """
+    SQL of query_nih_page. Parameters are the filter values, then the cursor
+    values and the page size.
+    """
+    # Keyset comparisons need non-NULL sort keys
+    columns = "nih.*, coalesce(nih.Release_Date, DATE '0001-01-01') AS ReleaseOrder"
+    if searched:
+        filtered = query_builder.build_select(
+            "nih", conditions,
+            columns=f"{columns}, search_hits.score AS SearchScore",
+            joins="JOIN search_hits ON nih.Document_Number = search_hits.doc_id",
+        )
+    else:
+        filtered = query_builder.build_select("nih", conditions, columns=columns)
+    sort_keys = nih_sort_keys(searched)
+    order_by = pagination.order_by_sql(sort_keys)
+    next_param = len(conditions) + 1
+    after = "true"
+    if has_cursor:
+        after = pagination.keyset_condition(sort_keys, next_param)
+        next_param += len(sort_keys)
+
+    return f"""
+        WITH filtered AS MATERIALIZED ({filtered}),
+             totals AS (
+                 SELECT count(*) AS page_total,
+                        count(*) FILTER (WHERE {after}) AS page_remaining,
+                        count(DISTINCT Organization) AS page_unique_orgs,
+                        count(DISTINCT Activity_Code) AS page_unique_activity
+                 FROM filtered
+             ),
+             page AS (SELECT * FROM filtered WHERE {after} ORDER BY {order_by} LIMIT ${next_param})
+        SELECT totals.*, page.*
+        FROM totals LEFT JOIN page ON true
+        ORDER BY {order_by}
+    """
+
+@metrics.timed("query", rows=lambda result: result["total"], query="nih_page")
+def query_nih_page(conn, title_search='', release_date_search='', activity_code_search='',
+                   parent_org_filter='All', organization_filter='All', document_type_filter='All',
+                   clinical_trials_search='', after=None, page_size=pagination.DEFAULT_PAGE_SIZE,
+                   search_index=None):
+    """
+    Runs the NIH page in one query: takes the query_nih_data filters plus the
+    page to return (the page_size rows after the cursor `after`, see
+    utilities.pagination; the first ones if None).
+    Returns a dict with:
+      - page: DataFrame of at most page_size rows (best match first when
+        searching, newest Release_Date first otherwise)
+      - next_cursor: the cursor of the next page, or None on the last page
+      - total, unique_orgs, unique_activity: over all matching rows
+    """
+    hits = search_index.search(title_search) if search_index is not None else None
+    searched = hits is not None
+    filters = _nih_filters(release_date_search, activity_code_search, parent_org_filter,
+                           organization_filter, document_type_filter, clinical_trials_search)
+    if not searched:
+        filters.append(("Title", "contains", title_search))
+    active = query_builder.active_filters(filters)
+    conditions = tuple((column, op) for column, op, _ in active)
+    has_cursor = after is not None
+    params = query_builder.filter_params(active) + list(after or ()) + [int(page_size)]
+    key = ("nih_page", conditions, searched, has_cursor)
+    build_sql = lambda: _page_sql(conditions, searched, has_cursor)
+
+    if searched:
+        conn.register("search_hits", hits)
+    try:
+        df = query_builder.execute(conn, key, build_sql, params).fetchdf()
+    finally:
+        if searched:
+            conn.unregister("search_hits")
+
+    stats = df.iloc[0]
+    remaining = int(stats["page_remaining"])
+    page_df = df.iloc[:min(int(page_size), remaining)]
+    next_cursor = None
+    if remaining > int(page_size):
+        next_cursor = pagination.row_cursor(page_df.iloc[-1], nih_sort_keys(searched))
+    page_df = page_df.drop(columns=[col for col in df.columns if col.startswith("page_")]
+                           + ["ReleaseOrder", "SearchScore"], errors="ignore").reset_index(drop=True)
+    return {
+        "page": page_df,
+        "next_cursor": next_cursor,
+        "total": int(stats["page_total"]),
+        "unique_orgs": int(stats["page_unique_orgs"]),
+        "unique_activity": int(stats["page_unique_activity"]),
+    }
 
 def get_unique_values(conn, column):
     """
     Returns a list of unique, non-null values for a given column from the 'nih' table.
     """
-    query = f"SELECT DISTINCT {column} FROM nih WHERE {column} IS NOT NULL ORDER BY {column}"
-    df = conn.execute(query).fetchdf()
-    return df[column].tolist()
+    return query_builder.distinct_values(conn, "nih", column)
@@ -0,0 +1,97 @@
+# utilities/pagination.py
+"""
+Keyset (cursor) pagination shared by the NIH and Grants.gov pages.
+
+A result is sorted on a list of (column, descending) sort keys whose last
+column is unique, so the order is stable from one rerun to the next. A page
+is fetched with "rows after the last row of the previous page" instead of an
+OFFSET, which DuckDB answers with a top-N over the matching rows rather than
+sorting and skipping everything before the page:
+
+    sort_keys = [("SearchScore", True), ("OpportunityID", False)]
+    where = keyset_condition(sort_keys, first_param=3)   # uses $3 and $4
+    order = order_by_sql(sort_keys)
+
+Each page remembers, in Streamlit session state, the cursors of the pages
+before it, so Previous walks back without recomputing anything. The state
+starts over whenever the filters or the page size change.
+"""
+
+PAGE_SIZE_OPTIONS = (25, 50, 100, 200)
+DEFAULT_PAGE_SIZE = 50
+
+def order_by_sql(sort_keys):
+    """
+    Returns the ORDER BY list for sort_keys.
+    """
+    return ", ".join(f"{column} {'DESC' if descending else 'ASC'}" for column, descending in sort_keys)
+
+def keyset_condition(sort_keys, first_param):
+    """
+    Returns a condition selecting the rows that sort after a cursor, the
+    cursor values being parameters $first_param, $first_param + 1, ...
+    """
+    alternatives = []
+    for i, (column, descending) in enumerate(sort_keys):
+        equal = [f"{prev} = ${first_param + j}" for j, (prev, _) in enumerate(sort_keys[:i])]
+        after = f"{column} {'<' if descending else '>'} ${first_param + i}"
+        alternatives.append("(" + " AND ".join(equal + [after]) + ")")
+    return "(" + " OR ".join(alternatives) + ")"
+
+def _python_value(value):
+    # numpy scalars and pandas Timestamps do not render as SQL literals
+    if hasattr(value, "to_pydatetime"):
+        return value.to_pydatetime()
+    if hasattr(value, "item"):
+        return value.item()
+    return value
+
+def row_cursor(row, sort_keys):
+    """
+    Returns the cursor (tuple of sort key values) of a result row.
+    """
+    return tuple(_python_value(row[column]) for column, _ in sort_keys)
+
+def page_state(session_state, name, signature, page_size):
+    """
+    Returns the pagination state stored under `name` in session_state,
+    starting over at the first page if the query signature (e.g. a tuple of
+    the filter values) or page size changed since the last rerun.
+    """
+    state = session_state.get(name)
+    if state is None or state["signature"] != signature or state["page_size"] != page_size:
+        state = {"signature": signature, "page_size": page_size, "cursors": [None]}
+        session_state[name] = state
+    return state
+
+def current_cursor(state):
+    """
+    Returns the cursor to fetch the current page with (None on the first page).
+    """
+    return state["cursors"][-1]
+
+def first_row(state):
+    """
+    Returns the 0-based position of the current page's first row in the result.
+    """
+    return (len(state["cursors"]) - 1) * state["page_size"]
+
+def next_page(state, cursor):
+    """
+    Moves to the page after the row whose cursor is given (the current page's last row).
+    """
+    if cursor is not None:
+        state["cursors"].append(cursor)
+
+def previous_page(state):
+    """
+    Moves back one page (no-op on the first page).
+    """
+    if len(state["cursors"]) > 1:
+        state["cursors"].pop()
+
+def first_page(state):
+    """
+    Moves back to the first page.
+    """
+    del state["cursors"][1:]
@@ -0,0 +1,244 @@
+# utilities/podcast_cache.py
+"""
+Content-addressed disk cache for FundrAI podcasts, shared by every session.
+
+A podcast is made in two upstream calls, each cached on its own:
+
+    script = Gemini(content)       keyed by content + model + prompt/generation settings
+    audio  = TTS(script)           keyed by script + voice/rate/encoding settings
+
+so the same grant clicked twice (by anyone) costs no upstream call, and
+the same script re-voiced only costs TTS. Concurrent requests for a key
+that is being computed wait for that one computation (single flight)
+instead of calling upstream again. Entries live under funddb/podcast_cache
+and the least recently used beyond MAX_ENTRIES per kind are removed.
+
+    cache = get_podcast_cache()
+    audio = cache.get_or_create_podcast(content, script_settings, audio_settings,
+                                        generate_script, synthesize)
+    path = cache.podcast_path(...)   # same, but the audio file's path, for playback
+    cache.stats()   # hits, upstream_calls, deduplicated, hit_rate, calls_saved
+"""
+import hashlib
+import json
+import os
+import threading
+
+from utilities import metrics
+
+CACHE_DIR = os.path.join("funddb", "podcast_cache")
+MAX_ENTRIES = 2000
+# Trim a kind's directory once every this many writes
+PURGE_EVERY = 50
+# Audio is stored in whatever encoding the audio settings ask for
+KINDS = {"script": ".txt", "audio": ".audio"}
+# Keys of stats() that only ever grow
+COUNTERS = tuple(f"{kind}_{name}" for kind in KINDS
+                 for name in ("hits", "upstream_calls", "deduplicated", "calls_saved"))
+
+def content_key(content, settings):
+    """
+    Returns the cache key of making something from `content` (str or bytes)
+    with `settings` (a JSON-serializable dict of everything else that
+    changes the result: model, prompt, voice, rate...).
+    """
+    if isinstance(content, str):
+        content = content.encode("utf-8")
+    digest = hashlib.sha256(content)
+    digest.update(json.dumps(settings, sort_keys=True, default=str).encode("utf-8"))
+    return digest.hexdigest()
+
+class PodcastCache:
+    """
+    Disk cache of podcast scripts and audio with single-flight computation. Thread-safe.
+    """
+
+    def __init__(self, cache_dir=CACHE_DIR, max_entries=MAX_ENTRIES):
+        self.cache_dir = cache_dir
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._in_flight = {}
+        self._writes = {kind: 0 for kind in KINDS}
+        self._counters = {f"{kind}_{name}": 0 for kind in KINDS
+                          for name in ("hits", "upstream_calls", "deduplicated")}
+        for kind in KINDS:
+            os.makedirs(os.path.join(cache_dir, kind), exist_ok=True)
+
+    def _path(self, kind, key):
+        return os.path.join(self.cache_dir, kind, key + KINDS[kind])
+
+    def _count(self, kind, name):
+        with self._lock:
+            self._counters[f"{kind}_{name}"] += 1
+
+    def get_path(self, kind, key):
+        """
+        Returns the path of the cached file of (kind, key), or None.
+        """
+        path = self._path(kind, key)
+        try:
+            # Recently used entries survive _purge
+            os.utime(path)
+        except OSError:
+            return None
+        return path
+
+    def get(self, kind, key):
+        """
+        Returns the cached bytes of (kind, key), or None.
+        """
+        path = self.get_path(kind, key)
+        if path is None:
+            return None
+        try:
+            with open(path, "rb") as f:
+                return f.read()
+        except OSError:
+            return None
+
+    def put(self, kind, key, data):
+        """
+        Stores bytes under (kind, key).
+        """
+        path = self._path(kind, key)
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+        with self._lock:
+            self._writes[kind] += 1
+            purge = self._writes[kind] % PURGE_EVERY == 0
+        if purge:
+            self._purge(kind)
+
+    def get_or_create(self, kind, key, compute):
+        """
+        Returns the cached bytes of (kind, key). On a miss, calls compute()
+        (which must return bytes) once, however many threads ask at the same
+        time; the others wait for its result. If compute() raises, every
+        waiting thread gets the exception and nothing is cached.
+        """
+        data = self.get(kind, key)
+        if data is not None:
+            self._count(kind, "hits")
+            return data
+
+        with self._lock:
+            flight = self._in_flight.get((kind, key))
+            leader = flight is None
+            if leader:
+                flight = self._in_flight[(kind, key)] = {"done": threading.Event()}
+        if not leader:
+            flight["done"].wait()
+            self._count(kind, "deduplicated")
+            if "error" in flight:
+                raise flight["error"]
+            return flight["data"]
+
+        try:
+            # Another thread may have finished this key between our get and taking the lead
+            data = self.get(kind, key)
+            if data is not None:
+                self._count(kind, "hits")
+            else:
+                self._count(kind, "upstream_calls")
+                data = compute()
+                self.put(kind, key, data)
+            flight["data"] = data
+            return data
+        except Exception as e:
+            flight["error"] = e
+            raise
+        finally:
+            with self._lock:
+                del self._in_flight[(kind, key)]
+            flight["done"].set()
+
+    def _podcast_script(self, content, script_settings, generate_script):
+        script_key = content_key(content, script_settings)
+        return self.get_or_create(
+            "script", script_key, lambda: generate_script(content).encode("utf-8")
+        ).decode("utf-8")
+
+    def get_or_create_podcast(self, content, script_settings, audio_settings, generate_script, synthesize):
+        """
+        Returns the podcast audio for `content`: generate_script(content) -> str
+        and synthesize(script) -> bytes are only called on cache misses.
+        """
+        script = self._podcast_script(content, script_settings, generate_script)
+        audio_key = content_key(script, audio_settings)
+        return self.get_or_create("audio", audio_key, lambda: synthesize(script))
+
+    def podcast_path(self, content, script_settings, audio_settings, generate_script, synthesize):
+        """
+        Like get_or_create_podcast, but returns the path of the cached audio
+        file, so a hit costs no read and callers can play it by reference.
+        """
+        script = self._podcast_script(content, script_settings, generate_script)
+        audio_key = content_key(script, audio_settings)
+        path = self.get_path("audio", audio_key)
+        if path is not None:
+            self._count("audio", "hits")
+            return path
+        self.get_or_create("audio", audio_key, lambda: synthesize(script))
+        return self._path("audio", audio_key)
+
+    def cached_podcast_path(self, content, script_settings, audio_settings):
+        """
+        Returns the path of the cached podcast audio for `content`, or None
+        without computing anything.
+        """
+        script = self.get("script", content_key(content, script_settings))
+        path = None
+        if script is not None:
+            path = self.get_path("audio", content_key(script.decode("utf-8"), audio_settings))
+        if path is not None:
+            self._count("script", "hits")
+            self._count("audio", "hits")
+        return path
+
+    def stats(self):
+        """
+        Returns the counters of this process, plus per kind the hit rate and
+        the upstream calls saved (hits and deduplicated requests).
+        """
+        with self._lock:
+            stats = dict(self._counters)
+        for kind in KINDS:
+            saved = stats[f"{kind}_hits"] + stats[f"{kind}_deduplicated"]
+            requests = saved + stats[f"{kind}_upstream_calls"]
+            stats[f"{kind}_calls_saved"] = saved
+            stats[f"{kind}_hit_rate"] = saved / requests if requests else 0.0
+        return stats
+
+    def _purge(self, kind):
+        directory = os.path.join(self.cache_dir, kind)
+        entries = []
+        for name in os.listdir(directory):
+            if name.endswith(KINDS[kind]):
+                path = os.path.join(directory, name)
+                try:
+                    entries.append((os.path.getmtime(path), path))
+                except OSError:
+                    continue
+        entries.sort(reverse=True)
+        for _, path in entries[self.max_entries:]:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+_cache = None
+_cache_lock = threading.Lock()
+
+def get_podcast_cache():
+    """
+    Returns the process-wide PodcastCache, creating it on first use.
+    """
+    global _cache
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                _cache = PodcastCache()
+                metrics.register_stats("podcast_cache", _cache.stats, counters=COUNTERS)
+    return _cache
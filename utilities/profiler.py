@@ -0,0 +1,157 @@
+# utilities/profiler.py
+"""
+Startup and rerun profiler for the Streamlit entry points, off unless the
+FUNDR_PROFILE environment variable is set:
+
+    FUNDR_PROFILE=1 streamlit run app.py            # JSON lines under funddb/profiles
+    FUNDR_PROFILE=/tmp/profiles streamlit run app.py
+
+Each script starts a run at its top, times its sections, and finishes the
+run at its end; every finished run appends one JSON object to
+<dir>/<page>.jsonl:
+
+    run = start_run("grants")
+    with run.section("query"):
+        ...
+    run.finish()
+
+    {"page": "grants", "run": 1, "started_at": 1760000000.0, "total_ms": 912.4,
+     "sections": {"data load": 410.2, "query": 35.1, "render": 12.9},
+     "import_ms": 402.7,
+     "imports": {"utilities.db_pool": 402.7, "duckdb": 250.4, ...}}
+
+"imports" holds the modules first imported since the previous run finished
+(so the cold imports on a process's first run, and deferred ones when they
+happen), with inclusive milliseconds. Only imports that cross a package
+boundary are recorded (the page importing utilities.db_pool, utilities
+importing duckdb), not every module a package imports internally.
+"import_ms" is the time spent in them, counting nested imports once.
+
+With profiling off, start_run returns a run whose section() and finish()
+do nothing, and no import hook is installed.
+"""
+import builtins
+import itertools
+import json
+import os
+import sys
+import threading
+import time
+from contextlib import contextmanager, nullcontext
+
+PROFILE_ENV = "FUNDR_PROFILE"
+PROFILE_DIR = os.path.join("funddb", "profiles")
+
+_run_numbers = {}
+_lock = threading.Lock()
+_new_imports = {}
+_import_ms = 0.0
+_depth = threading.local()
+_original_import = builtins.__import__
+
+def profile_dir():
+    """
+    Returns the directory profiles are written to, or None if profiling is off.
+    """
+    value = os.environ.get(PROFILE_ENV, "").strip()
+    if value in ("", "0"):
+        return None
+    return PROFILE_DIR if value == "1" else value
+
+def _timed_import(name, globals=None, locals=None, fromlist=(), level=0):
+    global _import_ms
+    importer = (globals or {}).get("__name__") or ""
+    if level or name in sys.modules or name.partition(".")[0] == importer.partition(".")[0]:
+        return _original_import(name, globals, locals, fromlist, level)
+    depth = getattr(_depth, "value", 0)
+    _depth.value = depth + 1
+    start = time.perf_counter()
+    try:
+        return _original_import(name, globals, locals, fromlist, level)
+    finally:
+        ms = (time.perf_counter() - start) * 1000
+        _depth.value = depth
+        if name in sys.modules:
+            with _lock:
+                _new_imports.setdefault(name, ms)
+                if depth == 0:
+                    _import_ms += ms
+
+def install_import_timer():
+    """
+    Starts recording module imports (see the module docstring). Idempotent.
+    """
+    builtins.__import__ = _timed_import
+
+class ProfileRun:
+    """
+    Section timings of one script run, written as a JSON line by finish().
+    """
+
+    def __init__(self, page, out_dir):
+        self.page = page
+        self.out_dir = out_dir
+        self.started_at = time.time()
+        self.sections = {}
+        self._start = time.perf_counter()
+        with _lock:
+            counter = _run_numbers.setdefault(page, itertools.count(1))
+            self.number = next(counter)
+
+    @contextmanager
+    def section(self, name):
+        """
+        Adds the time spent in the with-block to section `name`.
+        """
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.sections[name] = self.sections.get(name, 0.0) + (time.perf_counter() - start) * 1000
+
+    def finish(self, **extra):
+        """
+        Appends the run (plus any extra JSON-serializable fields) to
+        <out_dir>/<page>.jsonl and returns it as a dict.
+        """
+        global _import_ms
+        with _lock:
+            imports = dict(_new_imports)
+            import_ms = _import_ms
+            _new_imports.clear()
+            _import_ms = 0.0
+        record = {
+            "page": self.page,
+            "run": self.number,
+            "started_at": self.started_at,
+            "total_ms": (time.perf_counter() - self._start) * 1000,
+            "sections": self.sections,
+            "import_ms": import_ms,
+            "imports": dict(sorted(imports.items(), key=lambda item: -item[1])),
+            **extra,
+        }
+        os.makedirs(self.out_dir, exist_ok=True)
+        line = json.dumps(record) + "\n"
+        with _lock:
+            with open(os.path.join(self.out_dir, f"{self.page}.jsonl"), "a", encoding="utf-8") as f:
+                f.write(line)
+        return record
+
+class _NoProfileRun:
+    def section(self, name):
+        return nullcontext()
+
+    def finish(self, **extra):
+        return None
+
+def start_run(page):
+    """
+    Starts profiling a run of `page`; returns a run that does nothing if profiling is off.
+    """
+    out_dir = profile_dir()
+    if out_dir is None:
+        return _NoProfileRun()
+    return ProfileRun(page, out_dir)
+
+if profile_dir() is not None:
+    install_import_timer()
@@ -0,0 +1,176 @@
+# utilities/punkt_store.py
+"""
+Compact store of the pretrained Punkt sentence-tokenizer models.
+
+Each language's parameters (abbreviations, collocations, sentence starters
+and orthographic contexts) are one gzipped JSON file under src/punkt,
+converted once from NLTK's punkt_tab data, so loading a model is a single
+small read and json.load with no NLTK data path lookup and no download.
+Models are loaded on first use per language (English is the only one the
+pages need) and shared by every tokenizer in the process.
+
+    tokenizer = StoreTokenizer("english")   # a sumy Tokenizer backed by the store
+    load_params("german")                   # PunktParameters, loaded once
+
+Rebuild the store from an NLTK data directory with
+
+    python -m utilities.punkt_store --nltk-data ~/nltk_data
+"""
+import argparse
+import copy
+import gzip
+import json
+import os
+import re
+import threading
+from collections import defaultdict
+
+from nltk.tokenize.destructive import NLTKWordTokenizer
+from nltk.tokenize.punkt import PunktParameters, PunktSentenceTokenizer
+from sumy.nlp.tokenizers import Tokenizer
+
+STORE_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src", "punkt")
+SUFFIX = ".json.gz"
+# nltk.word_tokenize splits sentences with the English model whatever the document language
+WORD_TOKENIZER_LANGUAGE = "english"
+
+_params = {}
+_params_lock = threading.Lock()
+
+def store_path(language, store_dir=STORE_DIR):
+    return os.path.join(store_dir, language + SUFFIX)
+
+def available_languages(store_dir=STORE_DIR):
+    """
+    Returns the languages that have a model in the store, sorted.
+    """
+    return sorted(name[:-len(SUFFIX)] for name in os.listdir(store_dir) if name.endswith(SUFFIX))
+
+def load_params(language, store_dir=STORE_DIR):
+    """
+    Returns the PunktParameters of language, read from the store on first use.
+    Raises LookupError if the store has no model for it.
+    """
+    params = _params.get((store_dir, language))
+    if params is None:
+        with _params_lock:
+            params = _params.get((store_dir, language))
+            if params is None:
+                try:
+                    with gzip.open(store_path(language, store_dir), "rt", encoding="utf-8") as f:
+                        data = json.load(f)
+                except FileNotFoundError:
+                    raise LookupError(f"No Punkt model for {language!r} in {store_dir}")
+                params = PunktParameters()
+                params.abbrev_types = set(data["abbrev_types"])
+                params.collocations = set(map(tuple, data["collocations"]))
+                params.sent_starters = set(data["sent_starters"])
+                params.ortho_context = defaultdict(int, data["ortho_context"])
+                _params[(store_dir, language)] = params
+    return params
+
+class PunktStoreTokenizer(PunktSentenceTokenizer):
+    """
+    Punkt sentence tokenizer with its parameters from the store.
+    """
+
+    def __init__(self, language=WORD_TOKENIZER_LANGUAGE):
+        PunktSentenceTokenizer.__init__(self)
+        # Sumy adds abbreviations to abbrev_types, so each tokenizer gets its
+        # own copy of that set; the (much larger) rest is shared
+        shared = load_params(language)
+        self._params = copy.copy(shared)
+        self._params.abbrev_types = set(shared.abbrev_types)
+        self._lang = language
+
+class StoreWordTokenizer:
+    """
+    Same tokens as nltk.word_tokenize, without its lookup of the Punkt model
+    in the NLTK data path.
+    """
+
+    def __init__(self):
+        self._sentences = PunktStoreTokenizer(WORD_TOKENIZER_LANGUAGE)
+        self._words = NLTKWordTokenizer()
+
+    def tokenize(self, text):
+        return [token for sentence in self._sentences.tokenize(text) for token in self._words.tokenize(sentence)]
+
+class StoreGreekSentenceTokenizer:
+    """
+    Sumy's GreekSentencesTokenizer (Punkt, then a split after the Latin or
+    Greek question mark ';'), with the Greek model from the store instead
+    of nltk.sent_tokenize's lookup in the NLTK data path.
+    """
+
+    def __init__(self):
+        self._sentences = PunktStoreTokenizer("greek")
+
+    def tokenize(self, text):
+        return [sentence.strip() for punkt_sentence in self._sentences.tokenize(text)
+                for sentence in re.split(r"(?<=[;\u037e])\s+", punkt_sentence) if sentence]
+
+class StoreTokenizer(Tokenizer):
+    """
+    Sumy Tokenizer that takes its Punkt models from the store; languages
+    with a special (non-Punkt) tokenizer in sumy keep it, except Greek,
+    whose special tokenizer is Punkt-based (see StoreGreekSentenceTokenizer).
+    """
+
+    def _get_sentence_tokenizer(self, language):
+        if language == "greek":
+            return StoreGreekSentenceTokenizer()
+        if language in self.SPECIAL_SENTENCE_TOKENIZERS:
+            return self.SPECIAL_SENTENCE_TOKENIZERS[language]
+        return PunktStoreTokenizer(language)
+
+    def _get_word_tokenizer(self, language):
+        if language in self.SPECIAL_WORD_TOKENIZERS:
+            return self.SPECIAL_WORD_TOKENIZERS[language]
+        return StoreWordTokenizer()
+
+def build_store(nltk_data_dir, store_dir=STORE_DIR):
+    """
+    Converts every punkt_tab model under nltk_data_dir into the store.
+    Returns {language: bytes written}.
+    """
+    from nltk.tabdata import PunktDecoder
+
+    decoder = PunktDecoder()
+    tab_dir = os.path.join(nltk_data_dir, "tokenizers", "punkt_tab")
+    os.makedirs(store_dir, exist_ok=True)
+    sizes = {}
+    for language in sorted(os.listdir(tab_dir)):
+        lang_dir = os.path.join(tab_dir, language)
+        if not os.path.isdir(lang_dir):
+            continue
+        # Same parsing as nltk.tokenize.punkt.load_punkt_params
+        data = {}
+        for key, name, decode in (
+            ("abbrev_types", "abbrev_types.txt", lambda f: sorted(decoder.txt2set(f))),
+            ("collocations", "collocations.tab", lambda f: sorted(set(decoder.tab2tups(f)))),
+            ("sent_starters", "sent_starters.txt", lambda f: sorted(decoder.txt2set(f))),
+            ("ortho_context", "ortho_context.tab", lambda f: dict(sorted(decoder.tab2intdict(f).items()))),
+        ):
+            with open(os.path.join(lang_dir, name), encoding="utf-8") as f:
+                data[key] = decode(f)
+        path = store_path(language, store_dir)
+        # mtime=0 keeps rebuilds of the same model byte-identical
+        with open(path, "wb") as raw, gzip.GzipFile(fileobj=raw, mode="wb", compresslevel=9, mtime=0) as f:
+            f.write(json.dumps(data, ensure_ascii=False, separators=(",", ":")).encode("utf-8"))
+        sizes[language] = os.path.getsize(path)
+    return sizes
+
+def main():
+    parser = argparse.ArgumentParser(description="Build the compact Punkt model store from NLTK's punkt_tab data.")
+    parser.add_argument("--nltk-data", required=True, help="NLTK data directory containing tokenizers/punkt_tab")
+    parser.add_argument("--store-dir", default=STORE_DIR)
+    args = parser.parse_args()
+
+    sizes = build_store(args.nltk_data, args.store_dir)
+    for language, size in sizes.items():
+        print(f"{language:<12} {size:>9} bytes")
+    print(f"{len(sizes)} models, {sum(sizes.values())} bytes in {args.store_dir}")
+
+if __name__ == "__main__":
+    main()
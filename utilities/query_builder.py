@@ -0,0 +1,116 @@
+# utilities/query_builder.py
+"""
+Parameterized queries shared by the NIH and Grants.gov pages.
+
+A query is a table plus a list of (column, operator, value) filters. The SQL
+text, with $1..$n placeholders for the values, is built once per combination
+of active filters and kept in a small LRU cache, so a rerun from any session
+only looks it up and executes it with the new values. Values are always
+bound as DuckDB parameters, never spliced into the statement text, so quotes
+in the search boxes cannot break the query.
+
+Statements are not PREPAREd once and reused: the search queries join
+relations registered per call (search_hits), and a prepared statement would
+stay bound to the first relation registered under that name.
+"""
+import re
+import threading
+from collections import OrderedDict
+
+MAX_CACHED_STATEMENTS = 128
+
+# How each filter operator compares a column with its parameter
+OPERATORS = {
+    "contains": "{column} ILIKE {param}",
+    "date_contains": "strftime({column}, '%-m/%-d/%Y') ILIKE {param}",
+    "equals": "{column} = {param}",
+    "in": "list_contains({param}, {column})",
+}
+
+# Operators whose value is matched anywhere in the column text
+SUBSTRING_OPERATORS = ("contains", "date_contains")
+
+_IDENTIFIER = re.compile(r"^[A-Za-z_][A-Za-z0-9_]*$")
+
+_lock = threading.Lock()
+_statements = OrderedDict()
+
+def _check_identifier(name):
+    if not _IDENTIFIER.match(name):
+        raise ValueError(f"Invalid SQL identifier: {name!r}")
+    return name
+
+def _statement(key, build_sql):
+    """
+    Returns the SQL for a cache key, building it on a cache miss.
+    """
+    with _lock:
+        sql = _statements.get(key)
+        if sql is not None:
+            _statements.move_to_end(key)
+            return sql
+
+    sql = build_sql()
+    with _lock:
+        _statements[key] = sql
+        while len(_statements) > MAX_CACHED_STATEMENTS:
+            _statements.popitem(last=False)
+    return sql
+
+def execute(conn, key, build_sql, params=()):
+    """
+    Executes the SQL cached under `key` (built by build_sql() on a miss, with
+    $1..$n placeholders) on conn with `params` bound to the placeholders.
+    Returns the DuckDB result.
+    """
+    return conn.execute(_statement(key, build_sql), list(params))
+
+def active_filters(filters):
+    """
+    Drops filters whose value is empty, None or 'All'.
+    """
+    return [(column, op, value) for column, op, value in filters
+            if value is not None and value != "" and value != "All" and value != []]
+
+def build_select(table, conditions, columns="*", joins="", order_by="", first_param=1):
+    """
+    Builds SELECT SQL for `table` with one $n placeholder per (column, operator)
+    condition, numbered from first_param.
+    """
+    sql = f"SELECT {columns} FROM {table} {joins} WHERE 1=1"
+    for i, (column, op) in enumerate(conditions, start=first_param):
+        condition = OPERATORS[op].format(column=f'{table}."{_check_identifier(column)}"', param=f"${i}")
+        sql += f" AND {condition}"
+    if order_by:
+        sql += f" ORDER BY {order_by}"
+    return sql
+
+def filter_params(active):
+    """
+    Returns the parameter values of active filters, wrapped in % for substring operators.
+    """
+    return [f"%{value}%" if op in SUBSTRING_OPERATORS else value for _, op, value in active]
+
+def select(conn, table, filters, columns="*", joins="", order_by=""):
+    """
+    Runs a parameterized SELECT over `table` with the active (column, operator, value)
+    filters and returns the result as a DataFrame. 'contains' filters are
+    case-insensitive substring matches, 'date_contains' the same on a DATE
+    column written as M/D/YYYY.
+    """
+    _check_identifier(table)
+    active = active_filters(filters)
+    conditions = tuple((column, op) for column, op, _ in active)
+    params = filter_params(active)
+    key = ("select", table, columns, joins, order_by, conditions)
+    result = execute(conn, key, lambda: build_select(table, conditions, columns, joins, order_by), params)
+    return result.fetchdf()
+
+def distinct_values(conn, table, column):
+    """
+    Returns the sorted, non-null distinct values of table.column as a list.
+    """
+    table, column = _check_identifier(table), _check_identifier(column)
+    key = ("distinct", table, column)
+    sql = f'SELECT DISTINCT "{column}" FROM {table} WHERE "{column}" IS NOT NULL ORDER BY "{column}"'
+    return [row[0] for row in execute(conn, key, lambda: sql).fetchall()]
@@ -0,0 +1,192 @@
+# utilities/search_index.py
+"""
+BM25 full-text search over the text columns of a DuckDB table.
+
+The index is built at load time in two steps:
+  - build_postings() tokenizes the columns inside DuckDB, stems the
+    vocabulary with Sumy's Stemmer (so search and summaries agree on word
+    forms) and stores (term, doc_id, field, tf) rows in '<name>_postings'
+    plus per-field document lengths in '<name>_doclen';
+  - SearchIndex.load() reads those tables once per process into numpy
+    arrays with precomputed BM25 weights, so a query is a few array
+    operations instead of an ILIKE scan over every description.
+"""
+import re
+
+import numpy as np
+import pandas as pd
+
+DEFAULT_LANGUAGE = "english"
+BM25_K1 = 1.2
+BM25_B = 0.75
+
+# Runs of letters, the same words Sumy's tokenizer keeps (minus ' and -)
+_TOKEN_REGEX_SQL = r"\p{L}+"
+_TOKEN_PATTERN = re.compile(r"[^\W\d_]+")
+
+def _tokens_sql(table, id_column, fields, ids_table=None):
+    where = ""
+    if ids_table:
+        where = f' WHERE "{id_column}" IN (SELECT "{id_column}" FROM {ids_table})'
+    selects = [
+        f"""SELECT CAST("{id_column}" AS VARCHAR) AS doc_id, '{field}' AS field,
+                   unnest(regexp_extract_all(lower("{field}"), '{_TOKEN_REGEX_SQL}')) AS token
+            FROM {table}{where}"""
+        for field in fields
+    ]
+    return " UNION ALL ".join(selects)
+
+def build_postings(conn, name, table, id_column, fields, language=DEFAULT_LANGUAGE, ids_table=None):
+    """
+    Builds the '<name>_postings' and '<name>_doclen' tables for the given text
+    fields of `table`. If ids_table is given (a table with an `id_column`
+    column), only the postings of those documents are replaced, which keeps
+    incremental refreshes proportional to the number of changed documents.
+    """
+    conn.execute(f"CREATE OR REPLACE TEMP TABLE {name}_tokens AS "
+                 f"{_tokens_sql(table, id_column, fields, ids_table)}")
+
+    stemmer, stop_words = _analyzer(language)
+    vocabulary = [row[0] for row in conn.execute(f"SELECT DISTINCT token FROM {name}_tokens").fetchall()]
+    vocabulary = [token for token in vocabulary if token not in stop_words]
+    stems = pd.DataFrame({"token": vocabulary, "term": [stemmer(token) for token in vocabulary]}, dtype=object)
+
+    postings_sql = f"""
+        SELECT s.term, t.doc_id, t.field, CAST(count(*) AS INTEGER) AS tf
+        FROM {name}_tokens t JOIN search_stems s USING (token)
+        GROUP BY ALL
+    """
+    doclen_sql = f"""
+        SELECT doc_id, field, CAST(sum(tf) AS INTEGER) AS len
+        FROM {name}_postings
+        {{where}}
+        GROUP BY ALL
+    """
+    conn.register("search_stems", stems)
+    try:
+        if ids_table is None:
+            conn.execute(f"CREATE OR REPLACE TABLE {name}_postings AS {postings_sql} ORDER BY term")
+            conn.execute(f"CREATE OR REPLACE TABLE {name}_doclen AS {doclen_sql.format(where='')}")
+        else:
+            changed = f'SELECT CAST("{id_column}" AS VARCHAR) FROM {ids_table}'
+            conn.execute(f"DELETE FROM {name}_postings WHERE doc_id IN ({changed})")
+            conn.execute(f"DELETE FROM {name}_doclen WHERE doc_id IN ({changed})")
+            conn.execute(f"INSERT INTO {name}_postings {postings_sql}")
+            conn.execute(f"INSERT INTO {name}_doclen {doclen_sql.format(where=f'WHERE doc_id IN ({changed})')}")
+    finally:
+        conn.unregister("search_stems")
+        conn.execute(f"DROP TABLE {name}_tokens")
+
+def _analyzer(language):
+    # Sumy's Stemmer imports NLTK (about 0.3 s), so it is only loaded when text is analyzed
+    from sumy.nlp.stemmers import Stemmer
+    from sumy.utils import get_stop_words
+
+    return Stemmer(language), get_stop_words(language)
+
+class SearchIndex:
+    """
+    In-memory BM25 index loaded from the tables written by build_postings().
+    Queries match documents containing every query term (after stop-word
+    removal and stemming) and rank them by their summed BM25 score.
+    """
+
+    def __init__(self, language=DEFAULT_LANGUAGE):
+        self.language = language
+        self._analyzer = None
+        self.doc_ids = np.array([], dtype=object)
+        self.fields = ()
+        self._postings = {}
+
+    @classmethod
+    def load(cls, conn, name, language=DEFAULT_LANGUAGE, k1=BM25_K1, b=BM25_B):
+        """
+        Reads '<name>_postings' and '<name>_doclen' from conn into a new index.
+        """
+        index = cls(language)
+        index.doc_ids = np.array(
+            [row[0] for row in conn.execute(f"SELECT DISTINCT doc_id FROM {name}_doclen ORDER BY doc_id").fetchall()],
+            dtype=object,
+        )
+        conn.execute(f"""
+            CREATE OR REPLACE TEMP TABLE search_weights AS
+            WITH stats AS (SELECT field, count(*) AS n, avg(len) AS avgdl FROM {name}_doclen GROUP BY field),
+                 df AS (SELECT field, term, count(*) AS df FROM {name}_postings GROUP BY field, term),
+                 docs AS (SELECT doc_id, CAST(row_number() OVER (ORDER BY doc_id) - 1 AS INTEGER) AS pos
+                          FROM (SELECT DISTINCT doc_id FROM {name}_doclen))
+            SELECT p.field, p.term, d.pos,
+                   CAST(ln(1 + (s.n - df.df + 0.5) / (df.df + 0.5))
+                        * p.tf * ({k1} + 1) / (p.tf + {k1} * (1 - {b} + {b} * l.len / s.avgdl)) AS FLOAT) AS weight
+            FROM {name}_postings p
+            JOIN {name}_doclen l USING (doc_id, field)
+            JOIN stats s USING (field)
+            JOIN df USING (field, term)
+            JOIN docs d USING (doc_id)
+            ORDER BY p.field, p.term, d.pos
+        """)
+        try:
+            arrays = conn.execute("SELECT pos, weight FROM search_weights").fetchnumpy()
+            groups = conn.execute(
+                "SELECT field, term, count(*) FROM search_weights GROUP BY field, term ORDER BY field, term"
+            ).fetchall()
+        finally:
+            conn.execute("DROP TABLE search_weights")
+
+        positions = np.asarray(arrays["pos"], dtype=np.int32)
+        weights = np.asarray(arrays["weight"], dtype=np.float32)
+        start = 0
+        for field, term, count in groups:
+            index._postings[(field, term)] = (positions[start:start + count], weights[start:start + count])
+            start += count
+        index.fields = tuple(sorted({field for field, _, _ in groups}))
+        return index
+
+    def query_terms(self, query):
+        """
+        Returns the distinct stemmed, non-stop-word terms of a query, in order.
+        """
+        tokens = _TOKEN_PATTERN.findall((query or "").lower())
+        if not tokens:
+            return []
+        if self._analyzer is None:
+            self._analyzer = _analyzer(self.language)
+        stemmer, stop_words = self._analyzer
+        terms = []
+        for token in tokens:
+            if token in stop_words:
+                continue
+            term = stemmer(token)
+            if term not in terms:
+                terms.append(term)
+        return terms
+
+    def search_all(self, queries):
+        """
+        Runs several (query, fields) searches at once, keeping only documents
+        that match every term of every query. fields=None means all fields.
+        Returns a DataFrame with doc_id and score columns (in doc_id order, to be
+        ranked by score in SQL), or None if the queries contain no searchable terms.
+        """
+        scores = np.zeros(len(self.doc_ids), dtype=np.float32)
+        matched = None
+        for query, fields in queries:
+            for term in self.query_terms(query):
+                hit = np.zeros(len(self.doc_ids), dtype=bool)
+                for field in fields or self.fields:
+                    entry = self._postings.get((field, term))
+                    if entry is not None:
+                        positions, weights = entry
+                        scores[positions] += weights
+                        hit[positions] = True
+                matched = hit if matched is None else matched & hit
+
+        if matched is None:
+            return None
+        positions = np.flatnonzero(matched)
+        return pd.DataFrame({"doc_id": self.doc_ids[positions], "score": scores[positions]})
+
+    def search(self, query, fields=None):
+        """
+        Searches one query over the given fields (all fields if None). See search_all.
+        """
+        return self.search_all([(query, fields)])
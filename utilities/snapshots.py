@@ -0,0 +1,226 @@
+# utilities/snapshots.py
+"""
+Parquet snapshots of the datasets, for opening them in a fresh process
+without re-parsing the source.
+
+A snapshot is a directory with one zstd-compressed Parquet file per table
+(the data, sorted so that row-group statistics let DuckDB skip row groups
+on the sorted columns, plus the search-index tables) and a manifest.json
+recording the source file and its modification time:
+
+    funddb/snapshots/nih/nih.parquet                    sorted by Expired_Date, Organization
+                         nih_search_postings.parquet
+                         nih_search_doclen.parquet
+                         manifest.json
+
+The NIH page loads its snapshot (see db_pool), writing it first whenever
+the CSV is newer, so only the first process after a CSV change parses it
+and builds the search index. A Grants.gov snapshot is an export of a store
+file (sorted by CloseDate, AgencyName) that DuckDB can scan in place:
+
+    python -m utilities.snapshots nih                   # from funddb/NIH_data.csv
+    python -m utilities.snapshots grants                # from the latest Grants.gov store
+    python -m utilities.snapshots grants --source funddb/grants_store/grants_20250301.duckdb --out /tmp/grants
+"""
+import argparse
+import json
+import os
+import shutil
+import time
+
+import duckdb
+
+from utilities.grants_data import SEARCH_INDEX_NAME as GRANTS_SEARCH_INDEX, create_grants_view
+from utilities.nih_data import SEARCH_FIELDS as NIH_SEARCH_FIELDS, SEARCH_INDEX_NAME as NIH_SEARCH_INDEX, load_nih_data
+from utilities.search_index import build_postings
+from utilities.summary_pipeline import SUMMARY_TABLE
+
+SNAPSHOT_DIR = os.path.join("funddb", "snapshots")
+MANIFEST = "manifest.json"
+COMPRESSION = "zstd"
+# Small enough that a sorted column's min/max per row group prune a filter on it
+ROW_GROUP_SIZE = 10000
+
+# Tables of each dataset's snapshot and the columns each is sorted by
+NIH_TABLES = {
+    "nih": ("Expired_Date", "Organization"),
+    f"{NIH_SEARCH_INDEX}_postings": ("term", "doc_id"),
+    f"{NIH_SEARCH_INDEX}_doclen": ("doc_id", "field"),
+}
+GRANTS_TABLES = {
+    "grants": ("CloseDate", "AgencyName"),
+    f"{GRANTS_SEARCH_INDEX}_postings": ("term", "doc_id"),
+    f"{GRANTS_SEARCH_INDEX}_doclen": ("doc_id", "field"),
+    SUMMARY_TABLE: ("OpportunityID",),
+}
+
+def snapshot_dir(dataset, root=SNAPSHOT_DIR):
+    return os.path.join(root, dataset)
+
+def _quote(path):
+    return path.replace("'", "''")
+
+def read_manifest(directory):
+    """
+    Returns the manifest of the snapshot in directory, or None if there is none.
+    """
+    try:
+        with open(os.path.join(directory, MANIFEST), encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+def is_fresh(directory, source):
+    """
+    True if directory holds a snapshot of the current version of the source file.
+    """
+    manifest = read_manifest(directory)
+    return (manifest is not None and manifest["source"] == os.path.abspath(source)
+            and manifest["source_mtime"] == os.path.getmtime(source))
+
+def write_snapshot(conn, tables, directory, source):
+    """
+    Writes each table of conn (a dict of table name -> sort columns) to
+    <directory>/<table>.parquet, plus the manifest. The directory is
+    replaced as a whole: the files are written next to it and swapped in.
+    Tables conn does not have are skipped. Returns the manifest.
+    """
+    parent = os.path.dirname(os.path.abspath(directory))
+    os.makedirs(parent, exist_ok=True)
+    staging = f"{directory}.tmp-{os.getpid()}"
+    shutil.rmtree(staging, ignore_errors=True)
+    os.makedirs(staging)
+    existing = {row[0] for row in conn.execute("SELECT table_name FROM duckdb_tables()").fetchall()}
+    manifest = {"source": os.path.abspath(source), "source_mtime": os.path.getmtime(source),
+                "created": time.time(), "tables": {}}
+    try:
+        for table, order_by in tables.items():
+            if table not in existing:
+                continue
+            path = os.path.join(staging, f"{table}.parquet")
+            order = ", ".join(f'"{column}"' for column in order_by)
+            conn.execute(f"""
+                COPY (SELECT * FROM {table} ORDER BY {order})
+                TO '{_quote(path)}' (FORMAT parquet, COMPRESSION {COMPRESSION}, ROW_GROUP_SIZE {ROW_GROUP_SIZE})
+            """)
+            rows = conn.execute(f"SELECT count(*) FROM {table}").fetchone()[0]
+            manifest["tables"][table] = {"rows": rows, "bytes": os.path.getsize(path), "sorted_by": list(order_by)}
+        with open(os.path.join(staging, MANIFEST), "w", encoding="utf-8") as f:
+            json.dump(manifest, f, indent=2)
+        # Move the old snapshot aside, then the new one in; if another process
+        # swapped its own in meanwhile, keep that one
+        retired = f"{directory}.old-{os.getpid()}"
+        if os.path.exists(directory):
+            os.replace(directory, retired)
+        try:
+            os.replace(staging, directory)
+        except OSError:
+            pass
+        shutil.rmtree(retired, ignore_errors=True)
+    finally:
+        shutil.rmtree(staging, ignore_errors=True)
+    return manifest
+
+def drop_relation(conn, name):
+    """
+    Drops the table or view `name` of the current schema, if there is one.
+    DuckDB's DROP VIEW IF EXISTS raises on a table of that name (and DROP
+    TABLE on a view), so the kind is looked up first.
+    """
+    kinds = conn.execute("""
+        SELECT 'TABLE' FROM duckdb_tables()
+        WHERE table_name = $1 AND database_name = current_database() AND schema_name = current_schema()
+        UNION ALL
+        SELECT 'VIEW' FROM duckdb_views()
+        WHERE view_name = $1 AND database_name = current_database() AND schema_name = current_schema()
+    """, [name]).fetchall()
+    for (kind,) in kinds:
+        conn.execute(f"DROP {kind} {name}")
+
+def load_snapshot(conn, directory, materialize=True, rename=None):
+    """
+    Creates one table (materialize=True, read into DuckDB's memory) or view
+    (scanning the Parquet file on every query) per table of the snapshot,
+    named as in the snapshot unless `rename` maps it to another name.
+    Returns the manifest. Raises FileNotFoundError if there is no snapshot.
+    """
+    manifest = read_manifest(directory)
+    if manifest is None:
+        raise FileNotFoundError(f"No snapshot in {directory}")
+    kind = "TABLE" if materialize else "VIEW"
+    for table in manifest["tables"]:
+        path = os.path.abspath(os.path.join(directory, f"{table}.parquet"))
+        name = (rename or {}).get(table, table)
+        drop_relation(conn, name)
+        conn.execute(f"CREATE {kind} {name} AS SELECT * FROM read_parquet('{_quote(path)}')")
+    return manifest
+
+def write_nih_snapshot(csv_path, directory=None):
+    """
+    Loads the NIH CSV, builds its search index and writes both as a snapshot.
+    Returns the manifest.
+    """
+    conn = duckdb.connect(database=":memory:")
+    try:
+        load_nih_data(csv_path, conn)
+        build_postings(conn, NIH_SEARCH_INDEX, "nih", "Document_Number", NIH_SEARCH_FIELDS)
+        return write_snapshot(conn, NIH_TABLES, directory or snapshot_dir("nih"), csv_path)
+    finally:
+        conn.close()
+
+def ensure_nih_snapshot(csv_path, directory=None):
+    """
+    Returns the directory of the snapshot of csv_path, writing it first
+    unless it is up to date.
+    """
+    directory = directory or snapshot_dir("nih")
+    if not is_fresh(directory, csv_path):
+        write_nih_snapshot(csv_path, directory)
+    return directory
+
+def write_grants_snapshot(store_path, directory=None):
+    """
+    Exports a Grants.gov store file (its grants table, search index and
+    summaries) as a snapshot. Returns the manifest.
+    """
+    conn = duckdb.connect(database=store_path, read_only=True)
+    try:
+        return write_snapshot(conn, GRANTS_TABLES, directory or snapshot_dir("grants"), store_path)
+    finally:
+        conn.close()
+
+def load_grants_snapshot(conn, directory=None, materialize=False):
+    """
+    Exposes a Grants.gov snapshot as the 'grants' view the pages query (see
+    grants_data.create_grants_view) plus its search-index and summary tables.
+    By default everything is scanned from the Parquet files in place.
+    Returns the manifest.
+    """
+    manifest = load_snapshot(conn, directory or snapshot_dir("grants"), materialize,
+                             rename={"grants": "grants_snapshot"})
+    create_grants_view(conn, "grants_snapshot")
+    return manifest
+
+def main():
+    parser = argparse.ArgumentParser(description="Write a Parquet snapshot of the NIH or Grants.gov dataset.")
+    parser.add_argument("dataset", choices=("nih", "grants"))
+    parser.add_argument("--source", help="NIH CSV, or Grants.gov store file (default: the latest store)")
+    parser.add_argument("--out", help="Snapshot directory (default: funddb/snapshots/<dataset>)")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    if args.dataset == "nih":
+        manifest = write_nih_snapshot(args.source or os.path.join("funddb", "NIH_data.csv"), args.out)
+    else:
+        from utilities.grants_store import latest_store_path
+        source = args.source or latest_store_path()
+        if not source:
+            parser.error("no Grants.gov store yet; build one with python -m utilities.grants_store")
+        manifest = write_grants_snapshot(source, args.out)
+    seconds = time.perf_counter() - start
+    for table, info in manifest["tables"].items():
+        print(f"{table:<24} {info['rows']:>9} rows {info['bytes']:>11} bytes  sorted by {', '.join(info['sorted_by'])}")
+    print(f"snapshot of {manifest['source']} written to {args.out or snapshot_dir(args.dataset)} in {seconds:.1f} s")
+
+if __name__ == "__main__":
+    main()
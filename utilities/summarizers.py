@@ -0,0 +1,139 @@
+# utilities/summarizers.py
+"""
+Cheaper extractive summarizers than LSA, with the same interface as Sumy's
+(summarizer(document, sentences_count) -> sentences, stop_words setter):
+
+    CentroidSummarizer   sentences closest to the TF-IDF centroid of the document
+    LexRankSummarizer    continuous LexRank on a sparse TF-IDF cosine graph
+    LeadSummarizer       the first sentences, for documents too long for the others
+
+The first two work on per-sentence counts of stemmed, non-stop words. Similarities
+are only computed between sentences that share a word (found through an
+inverted index), so LexRank does not build the dense n x n matrix that
+Sumy's LexRankSummarizer does. Sumy's LuhnSummarizer is used as is.
+"""
+import math
+from collections import Counter, defaultdict
+
+from sumy.summarizers._summarizer import AbstractSummarizer
+
+# LexRank: minimum cosine similarity for an edge, damping and convergence
+LEXRANK_THRESHOLD = 0.1
+LEXRANK_DAMPING = 0.85
+LEXRANK_EPSILON = 1e-4
+LEXRANK_MAX_ITERATIONS = 100
+
+class _TermSummarizer(AbstractSummarizer):
+    _stop_words = frozenset()
+
+    @property
+    def stop_words(self):
+        return self._stop_words
+
+    @stop_words.setter
+    def stop_words(self, words):
+        self._stop_words = frozenset(map(self.normalize_word, words))
+
+    def __call__(self, document, sentences_count):
+        sentences = document.sentences
+        if not sentences:
+            return ()
+        ratings = iter(self.rate_sentences(self._tfidf_vectors(sentences)))
+        return self._get_best_sentences(sentences, sentences_count, lambda s: next(ratings))
+
+    def rate_sentences(self, vectors):
+        raise NotImplementedError("This method should be overriden in subclass")
+
+    def _tfidf_vectors(self, sentences):
+        """
+        Returns one {stem: tf-idf} dict per sentence, each sentence counting as a document.
+        """
+        stems = {}
+        counts = []
+        for sentence in sentences:
+            terms = Counter()
+            for word in sentence.words:
+                normalized = self.normalize_word(word)
+                if normalized in self._stop_words:
+                    continue
+                if normalized not in stems:
+                    stems[normalized] = self._stemmer(normalized)
+                terms[stems[normalized]] += 1
+            counts.append(terms)
+
+        document_frequency = Counter(term for terms in counts for term in terms)
+        idf = {term: math.log(len(counts) / df) + 1.0 for term, df in document_frequency.items()}
+        return [{term: tf * idf[term] for term, tf in terms.items()} for terms in counts]
+
+class CentroidSummarizer(_TermSummarizer):
+    """
+    Rates each sentence by the cosine similarity of its TF-IDF vector to the document centroid.
+    """
+
+    def rate_sentences(self, vectors):
+        centroid = defaultdict(float)
+        for vector in vectors:
+            for term, weight in vector.items():
+                centroid[term] += weight
+        centroid_norm = math.sqrt(sum(w * w for w in centroid.values())) or 1.0
+
+        ratings = []
+        for vector in vectors:
+            norm = math.sqrt(sum(w * w for w in vector.values()))
+            dot = sum(weight * centroid[term] for term, weight in vector.items())
+            ratings.append(dot / (norm * centroid_norm) if norm else 0.0)
+        return ratings
+
+class LexRankSummarizer(_TermSummarizer):
+    """
+    Continuous LexRank: PageRank over sentences linked by TF-IDF cosine
+    similarity above LEXRANK_THRESHOLD.
+    """
+
+    def rate_sentences(self, vectors):
+        n = len(vectors)
+        norms = [math.sqrt(sum(w * w for w in vector.values())) for vector in vectors]
+        postings = defaultdict(list)
+        for i, vector in enumerate(vectors):
+            for term, weight in vector.items():
+                postings[term].append((i, weight))
+
+        # Dot products of every pair of sentences sharing a term, both directions
+        edges = [defaultdict(float) for _ in range(n)]
+        for entries in postings.values():
+            for i, wi in entries:
+                for j, wj in entries:
+                    if i != j:
+                        edges[i][j] += wi * wj
+        for i, neighbours in enumerate(edges):
+            for j in list(neighbours):
+                similarity = neighbours[j] / (norms[i] * norms[j])
+                if similarity < LEXRANK_THRESHOLD:
+                    del neighbours[j]
+                else:
+                    neighbours[j] = similarity
+
+        # Each sentence passes its score to its neighbours in proportion to similarity
+        out_weights = [sum(neighbours.values()) for neighbours in edges]
+        scores = [1.0 / n] * n
+        for _ in range(LEXRANK_MAX_ITERATIONS):
+            # Isolated sentences spread their score evenly
+            dangling = sum(scores[i] for i in range(n) if not out_weights[i])
+            updated = [((1.0 - LEXRANK_DAMPING) + LEXRANK_DAMPING * dangling) / n] * n
+            for i, neighbours in enumerate(edges):
+                for j, similarity in neighbours.items():
+                    updated[j] += LEXRANK_DAMPING * scores[i] * similarity / out_weights[i]
+            delta = sum(abs(u - s) for u, s in zip(updated, scores))
+            scores = updated
+            if delta < LEXRANK_EPSILON:
+                break
+        return scores
+
+class LeadSummarizer(AbstractSummarizer):
+    """
+    Picks the first sentences of the document; costs nothing beyond parsing.
+    """
+    stop_words = frozenset()
+
+    def __call__(self, document, sentences_count):
+        return self._get_best_sentences(document.sentences, sentences_count, lambda s: 0.0)
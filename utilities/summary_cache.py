@@ -0,0 +1,180 @@
+# utilities/summary_cache.py
+"""
+Two-tier cache for summaries, shared by every session and process.
+
+Entries are keyed by a hash of what was summarized (the text, or the fetched
+page for a URL) plus the language, sentence count and algorithm, so the same
+description summarized from two pages is only computed once. Lookups go to
+an in-process LRU first, then to a SQLite file under funddb/ that all
+Streamlit processes share. Entries older than the TTL are treated as misses,
+and the file is trimmed to its most recently used entries as it grows.
+
+    cache = get_cache()
+    summary = cache.get_or_compute(summary_key(text, "english", 10, "lsa"), compute)
+    cache.stats()   # {"memory_hits": ..., "disk_hits": ..., "misses": ..., ...}
+"""
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+from utilities import metrics
+
+CACHE_PATH = os.path.join("funddb", "summary_cache.sqlite")
+MAX_MEMORY_ENTRIES = 512
+MAX_DISK_ENTRIES = 20000
+TTL_SECONDS = 30 * 24 * 3600
+# Trim the disk tier once every this many writes
+PURGE_EVERY = 100
+# Keys of stats() that only ever grow
+COUNTERS = ("memory_hits", "disk_hits", "misses", "writes", "evictions")
+
+def summary_key(content, language, sentence_count, algorithm):
+    """
+    Returns the cache key for summarizing `content` (text, or bytes of a fetched page).
+    """
+    if isinstance(content, str):
+        content = content.encode("utf-8")
+    digest = hashlib.sha256(content).hexdigest()
+    return f"{algorithm}:{language}:{sentence_count}:{digest}"
+
+class SummaryCache:
+    """
+    In-memory LRU in front of a SQLite table of summaries. Thread-safe.
+    """
+
+    def __init__(self, path=CACHE_PATH, max_memory=MAX_MEMORY_ENTRIES,
+                 max_disk=MAX_DISK_ENTRIES, ttl=TTL_SECONDS):
+        self.path = path
+        self.max_memory = max_memory
+        self.max_disk = max_disk
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._memory = OrderedDict()
+        self._writes = 0
+        self._counters = dict.fromkeys(COUNTERS, 0)
+        self._db = None
+        if path:
+            directory = os.path.dirname(path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            self._db = sqlite3.connect(path, timeout=30, check_same_thread=False, isolation_level=None)
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute("""
+                CREATE TABLE IF NOT EXISTS summaries (
+                    key TEXT PRIMARY KEY, summary TEXT, created REAL, accessed REAL
+                )
+            """)
+
+    def _count(self, name, amount=1):
+        self._counters[name] += amount
+
+    def get(self, key):
+        """
+        Returns the cached summary for key, or None on a miss (or an expired entry).
+        """
+        now = time.time()
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None and now - entry[1] <= self.ttl:
+                self._memory.move_to_end(key)
+                self._count("memory_hits")
+                return entry[0]
+            self._memory.pop(key, None)
+
+            row = None
+            if self._db is not None:
+                row = self._db.execute("SELECT summary, created FROM summaries WHERE key = ?", [key]).fetchone()
+            if row is None or now - row[1] > self.ttl:
+                self._count("misses")
+                return None
+            self._db.execute("UPDATE summaries SET accessed = ? WHERE key = ?", [now, key])
+            self._remember(key, row[0], row[1])
+            self._count("disk_hits")
+            return row[0]
+
+    def put(self, key, summary):
+        """
+        Stores a summary in both tiers.
+        """
+        now = time.time()
+        with self._lock:
+            self._remember(key, summary, now)
+            self._count("writes")
+            if self._db is None:
+                return
+            self._db.execute(
+                "INSERT OR REPLACE INTO summaries (key, summary, created, accessed) VALUES (?, ?, ?, ?)",
+                [key, summary, now, now],
+            )
+            self._writes += 1
+            if self._writes % PURGE_EVERY == 0:
+                self._purge(now)
+
+    def get_or_compute(self, key, compute):
+        """
+        Returns the cached summary for key, calling compute() and caching its
+        result on a miss.
+        """
+        summary = self.get(key)
+        if summary is None:
+            summary = compute()
+            self.put(key, summary)
+        return summary
+
+    def stats(self):
+        """
+        Returns the hit/miss counters of this process plus the entry counts of both tiers.
+        """
+        with self._lock:
+            stats = dict(self._counters)
+            stats["memory_entries"] = len(self._memory)
+            stats["disk_entries"] = 0
+            if self._db is not None:
+                stats["disk_entries"] = self._db.execute("SELECT count(*) FROM summaries").fetchone()[0]
+        lookups = stats["memory_hits"] + stats["disk_hits"] + stats["misses"]
+        stats["hit_rate"] = (stats["memory_hits"] + stats["disk_hits"]) / lookups if lookups else 0.0
+        return stats
+
+    def clear(self):
+        """
+        Drops every entry from both tiers.
+        """
+        with self._lock:
+            self._memory.clear()
+            if self._db is not None:
+                self._db.execute("DELETE FROM summaries")
+
+    def _remember(self, key, summary, created):
+        self._memory[key] = (summary, created)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_memory:
+            self._memory.popitem(last=False)
+            self._count("evictions")
+
+    def _purge(self, now):
+        # Expired entries first, then the least recently used beyond max_disk
+        deleted = self._db.execute("DELETE FROM summaries WHERE created < ?", [now - self.ttl]).rowcount
+        deleted += self._db.execute("""
+            DELETE FROM summaries WHERE key IN (
+                SELECT key FROM summaries ORDER BY accessed DESC LIMIT -1 OFFSET ?
+            )
+        """, [self.max_disk]).rowcount
+        self._count("evictions", max(deleted, 0))
+
+_cache = None
+_cache_lock = threading.Lock()
+
+def get_cache():
+    """
+    Returns the process-wide SummaryCache, creating it on first use.
+    """
+    global _cache
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                _cache = SummaryCache()
+                metrics.register_stats("summary_cache", _cache.stats, counters=COUNTERS)
+    return _cache
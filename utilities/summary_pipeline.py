@@ -0,0 +1,169 @@
+# utilities/summary_pipeline.py
+"""
+Batch summarization of every active Grants.gov opportunity.
+
+Runs on a store while it is being built (see grants_store.build_store) or
+on an existing store file that no page has open:
+
+    python -m utilities.summary_pipeline --store funddb/grants_store/grants_20250301.duckdb
+
+Summaries are written to the 'grant_summaries' table next to 'grants',
+keyed by OpportunityID and an md5 of the Description they were made from.
+A description that has not changed since the previous store keeps its
+summary, so a daily refresh only summarizes new and edited opportunities.
+The work is spread over a process pool, since Sumy's LSA is CPU-bound.
+"""
+import argparse
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import get_context
+
+import duckdb
+import pandas as pd
+
+from utilities.grant_sumy import DEFAULT_LANGUAGE, DEFAULT_SENTENCES_COUNT, summarize_many
+from utilities.grants_data import GRANT_STATUS_SQL
+
+SUMMARY_TABLE = "grant_summaries"
+BATCH_SIZE = 32
+# Summaries written to the store per INSERT
+WRITE_EVERY = 512
+
+def create_summary_table(conn):
+    conn.execute(f"""
+        CREATE TABLE IF NOT EXISTS {SUMMARY_TABLE} (
+            OpportunityID VARCHAR, ContentHash VARCHAR, Language VARCHAR,
+            SentenceCount INTEGER, Summary VARCHAR, ComputedAt TIMESTAMP
+        )
+    """)
+
+def _pending(conn, language, sentence_count):
+    """
+    Returns (OpportunityID, ContentHash, Description) rows of active grants
+    without an up-to-date summary, and removes summaries of grants that are
+    gone, no longer active or whose description changed.
+    """
+    conn.execute(f"""
+        CREATE OR REPLACE TEMP TABLE summary_sources AS
+        SELECT OpportunityID, md5(Description) AS ContentHash, Description
+        FROM grants
+        WHERE {GRANT_STATUS_SQL} = 'Active' AND trim(coalesce(Description, '')) <> ''
+    """)
+    removed = conn.execute(f"""
+        DELETE FROM {SUMMARY_TABLE}
+        WHERE Language = ? AND SentenceCount = ?
+          AND (OpportunityID, ContentHash) NOT IN (SELECT OpportunityID, ContentHash FROM summary_sources)
+    """, [language, sentence_count]).fetchone()[0]
+    rows = conn.execute(f"""
+        SELECT OpportunityID, ContentHash, Description FROM summary_sources
+        WHERE (OpportunityID, ContentHash) NOT IN (
+            SELECT OpportunityID, ContentHash FROM {SUMMARY_TABLE}
+            WHERE Language = ? AND SentenceCount = ?
+        )
+        ORDER BY OpportunityID
+    """, [language, sentence_count]).fetchall()
+    conn.execute("DROP TABLE summary_sources")
+    return rows, removed
+
+def _summarize_batch(batch, language, sentence_count):
+    # The results go to grant_summaries: keep them out of the shared summary
+    # cache, which they would flood (evicting the pages' summaries) from every worker
+    summaries = summarize_many([description for _, _, description in batch], language, sentence_count,
+                               cache=False)
+    return [(opp_id, content_hash, summary) for (opp_id, content_hash, _), summary in zip(batch, summaries)]
+
+def _write(conn, results, language, sentence_count):
+    df = pd.DataFrame(results, columns=["OpportunityID", "ContentHash", "Summary"], dtype=object)
+    conn.register("summary_batch", df)
+    try:
+        conn.execute(f"""
+            INSERT INTO {SUMMARY_TABLE}
+            SELECT OpportunityID, ContentHash, ?, ?, Summary, current_timestamp FROM summary_batch
+        """, [language, sentence_count])
+    finally:
+        conn.unregister("summary_batch")
+
+def precompute_summaries(conn, workers=None, language=DEFAULT_LANGUAGE,
+                         sentence_count=DEFAULT_SENTENCES_COUNT, batch_size=BATCH_SIZE):
+    """
+    Brings the 'grant_summaries' table of conn (a writable connection with a
+    'grants' table) up to date for every active opportunity, summarizing in
+    `workers` processes (all CPUs if None; 0 means in this process).
+    Returns a dict with summarized/removed/seconds/docs_per_sec.
+    """
+    start = time.perf_counter()
+    create_summary_table(conn)
+    rows, removed = _pending(conn, language, sentence_count)
+    batches = [rows[i:i + batch_size] for i in range(0, len(rows), batch_size)]
+
+    done = 0
+    pending = []
+    if workers == 0 or len(batches) <= 1:
+        results = (_summarize_batch(batch, language, sentence_count) for batch in batches)
+        executor = None
+    else:
+        # spawn: the caller may be a threaded process (e.g. Streamlit), where fork is unsafe
+        executor = ProcessPoolExecutor(max_workers=workers or os.cpu_count(), mp_context=get_context("spawn"))
+        results = executor.map(_summarize_batch, batches,
+                               [language] * len(batches), [sentence_count] * len(batches))
+    try:
+        for result in results:
+            pending.extend(result)
+            if len(pending) >= WRITE_EVERY:
+                _write(conn, pending, language, sentence_count)
+                done += len(pending)
+                pending = []
+        if pending:
+            _write(conn, pending, language, sentence_count)
+            done += len(pending)
+    finally:
+        if executor is not None:
+            executor.shutdown()
+
+    seconds = time.perf_counter() - start
+    return {
+        "summarized": done,
+        "removed": removed,
+        "seconds": seconds,
+        "docs_per_sec": done / seconds if seconds else 0.0,
+    }
+
+def get_precomputed_summary(conn, opportunity_id, description,
+                            language=DEFAULT_LANGUAGE, sentence_count=DEFAULT_SENTENCES_COUNT):
+    """
+    Returns the stored summary of an opportunity if it was made from this
+    exact description, or None (also when there is no summary table).
+    """
+    try:
+        row = conn.execute(f"""
+            SELECT Summary FROM {SUMMARY_TABLE}
+            WHERE OpportunityID = ? AND ContentHash = md5(?) AND Language = ? AND SentenceCount = ?
+        """, [opportunity_id, description, language, sentence_count]).fetchone()
+    except duckdb.CatalogException:
+        return None
+    return row[0] if row else None
+
+def main():
+    parser = argparse.ArgumentParser(description="Summarize every active opportunity of a Grants.gov store.")
+    parser.add_argument("--store", help="Store file to update (default: the latest one)")
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes (default: all CPUs)")
+    parser.add_argument("--sentences", type=int, default=DEFAULT_SENTENCES_COUNT)
+    args = parser.parse_args()
+
+    from utilities.grants_store import latest_store_path
+
+    path = args.store or latest_store_path()
+    if not path:
+        parser.error("No Grants.gov store found; build one with python -m utilities.grants_store")
+    conn = duckdb.connect(database=path)
+    try:
+        stats = precompute_summaries(conn, workers=args.workers, sentence_count=args.sentences)
+        conn.execute("CHECKPOINT")
+    finally:
+        conn.close()
+    print(f"{path}: {stats['summarized']} summarized, {stats['removed']} removed "
+          f"in {stats['seconds']:.1f} s ({stats['docs_per_sec']:.1f} docs/sec)")
+
+if __name__ == "__main__":
+    main()